@@ -0,0 +1,114 @@
+"""
+Benchmark chapter detection on a 1M-word manuscript
+
+Compares the previous per-line, four-regex detect_chapters with ChapterDetector
+over plain text and over a paragraph stream.
+
+Usage:
+    python benchmarks/bench_chapter_detection.py [--words 1000000] [--chapters 120]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.chapter_detection import ChapterDetector  # noqa: E402
+from core.document_reader import Paragraph  # noqa: E402
+
+WORDS = ("the and of to a in was he she it that her his with as for had on at by "
+         "lantern river harbor stone winter captain letter silence morning distant "
+         "Mara Theo Ilse whispered carried remembered beneath across").split()
+
+LEGACY_PATTERNS = [
+    r'^\s*chapter\s+(\d+)\s*:?\s*(.*)$',
+    r'^\s*chapter\s+(\w+)\s*:?\s*(.*)$',
+    r'^\s*(\d+)\.\s*(.*)$',
+    r'^\s*part\s+(\d+)\s*:?\s*(.*)$',
+]
+
+
+def legacy_detect_chapters(text):
+    """The previous DocumentParser.detect_chapters"""
+    chapters = []
+    current_chapter = None
+    chapter_number = 1
+    current_content = []
+    for line in text.split('\n'):
+        line_stripped = line.strip()
+        if not line_stripped:
+            continue
+        is_chapter_header = False
+        for pattern in LEGACY_PATTERNS:
+            match = re.match(pattern, line_stripped, re.IGNORECASE)
+            if match:
+                if current_chapter is not None:
+                    current_chapter['content'] = '\n\n'.join(current_content).strip()
+                    chapters.append(current_chapter)
+                chapter_title = match.group(2).strip() or f"Chapter {chapter_number}"
+                current_chapter = {'chapter_number': chapter_number, 'title': chapter_title, 'content': ''}
+                current_content = []
+                chapter_number += 1
+                is_chapter_header = True
+                break
+        if not is_chapter_header:
+            current_content.append(line_stripped)
+    if current_chapter is not None:
+        current_chapter['content'] = '\n\n'.join(current_content).strip()
+        chapters.append(current_chapter)
+    return chapters or [{'chapter_number': 1, 'title': 'Chapter 1', 'content': text.strip()}]
+
+
+def make_manuscript(words: int, chapters: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    per_chapter = words // chapters
+    headers = ["Chapter {n}", "CHAPTER {n}: The Harbor", "{roman}", "Chapter {n}"]
+    romans = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X']
+    out = ["The Lantern Harbor", "by Ana Novak", "", "Prologue", ""]
+    for n in range(1, chapters + 1):
+        out.append(headers[n % len(headers)].format(n=n, roman=romans[n % len(romans)]))
+        out.append("")
+        written = 0
+        while written < per_chapter:
+            if rng.random() < 0.02:
+                out.append("* * *")
+            paragraph_words = rng.randint(20, 120)
+            out.append(' '.join(rng.choice(WORDS) for _ in range(paragraph_words)) + '.')
+            out.append("")
+            written += paragraph_words
+    return '\n'.join(out)
+
+
+def bench(name, fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chapters = fn()
+        timings.append(time.perf_counter() - start)
+    print(f"{name:>22}: best {min(timings) * 1000:7.1f} ms, {len(chapters)} chapters")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=1000000)
+    parser.add_argument("--chapters", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = make_manuscript(args.words, args.chapters)
+    paragraphs = [Paragraph(line) for line in text.split('\n') if line.strip()]
+    print(f"Manuscript: {len(text.split()):,} words, {len(paragraphs):,} paragraphs")
+
+    detector = ChapterDetector()
+    bench("legacy detect_chapters", lambda: legacy_detect_chapters(text), args.repeat)
+    bench("detector (text)", lambda: detector.detect_text(text), args.repeat)
+    bench("detector (paragraphs)", lambda: detector.detect(paragraphs), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark DOCX import: python-docx + detect_chapters vs the streaming reader
+
+Generates a synthetic manuscript (headings, tracked insertions and deletions)
+and runs each parser in a fresh process so peak RSS is comparable.
+
+The legacy run needs python-docx, which is no longer a runtime dependency:
+    pip install -r requirements-bench.txt
+
+Usage:
+    python benchmarks/bench_docx_import.py [--words 300000] [--chapters 60]
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+CONTENT_TYPES = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+</Types>'''
+
+RELS = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>'''
+
+DOC_RELS = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>'''
+
+STYLES = f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="{W_NS}">
+<w:style w:type="paragraph" w:styleId="Normal"><w:name w:val="Normal"/></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:pPr><w:outlineLvl w:val="0"/></w:pPr></w:style>
+</w:styles>'''
+
+WORDS = ("the and of to a in was he she it that her his with as for had on at by "
+         "lantern river harbor stone winter captain letter silence morning distant "
+         "Mara Theo Ilse whispered carried remembered beneath across").split()
+
+
+def make_docx(path: str, words: int, chapters: int, seed: int = 7):
+    """Write a manuscript of roughly `words` words with tracked changes in every paragraph"""
+    rng = random.Random(seed)
+    words_per_chapter = words // chapters
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', RELS)
+        archive.writestr('word/_rels/document.xml.rels', DOC_RELS)
+        archive.writestr('word/styles.xml', STYLES)
+        with archive.open('word/document.xml', 'w') as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                    f'<w:document xmlns:w="{W_NS}"><w:body>'.encode())
+            for chapter in range(1, chapters + 1):
+                f.write(f'<w:p><w:pPr><w:pStyle w:val="Heading1"/></w:pPr>'
+                        f'<w:r><w:t>Chapter {chapter}</w:t></w:r></w:p>'.encode())
+                written = 0
+                while written < words_per_chapter:
+                    sentence = ' '.join(rng.choice(WORDS) for _ in range(80))
+                    kept = escape(sentence)
+                    f.write(f'<w:p><w:r><w:t xml:space="preserve">{kept} </w:t></w:r>'
+                            f'<w:ins w:id="1" w:author="ed"><w:r><w:t xml:space="preserve">added words </w:t></w:r></w:ins>'
+                            f'<w:del w:id="2" w:author="ed"><w:r><w:delText>removed words</w:delText></w:r></w:del>'
+                            f'</w:p>'.encode())
+                    written += 82
+            f.write(b'<w:sectPr/></w:body></w:document>')
+
+
+def run_legacy(path: str):
+    # The previous implementation: python-docx DOM, joined text, then a second split
+    from docx import Document
+    from core.import_utils import DocumentParser
+    doc = Document(path)
+    full_text = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+    text = '\n\n'.join(full_text)
+    return DocumentParser.detect_chapters(text)
+
+
+def run_streaming(path: str):
+    from core.import_utils import DocumentParser
+    return DocumentParser.parse_docx_chapters(path).chapters
+
+
+def child(method: str, path: str):
+    start = time.perf_counter()
+    chapters = run_legacy(path) if method == "legacy" else run_streaming(path)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "method": method,
+        "seconds": round(elapsed, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "chapters": len(chapters),
+        "words": sum(len(ch['content'].split()) for ch in chapters),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=300000)
+    parser.add_argument("--chapters", type=int, default=60)
+    parser.add_argument("--child", nargs=2, metavar=("METHOD", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "manuscript.docx")
+        make_docx(path, args.words, args.chapters)
+        print(f"Manuscript: {args.words:,} words, {os.path.getsize(path) / 1e6:.1f} MB docx")
+
+        for method in ("legacy", "streaming"):
+            result = subprocess.run(
+                [sys.executable, __file__, "--child", method, path],
+                capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                print(f"{method:>10}: failed ({result.stderr.strip().splitlines()[-1]})")
+                continue
+            r = json.loads(result.stdout.strip().splitlines()[-1])
+            print(f"{method:>10}: {r['seconds']:.2f}s, peak RSS {r['peak_rss_mb']:.0f} MB, "
+                  f"{r['chapters']} chapters, {r['words']:,} words")
+
+
+if __name__ == "__main__":
+    main()
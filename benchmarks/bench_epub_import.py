@@ -0,0 +1,146 @@
+"""
+Benchmark EPUB import: ebooklib + BeautifulSoup vs the single-pass spine reader
+
+The legacy path is what import used to do: parse_epub and extract_epub_metadata
+each load the book with ebooklib, then detect_chapters splits the joined text.
+With --workers, document extraction is also timed across process pools of
+each size (use an omnibus-sized book, e.g. --chapters 300 --size-mb 30).
+
+The legacy run needs ebooklib and beautifulsoup4, which are no longer runtime
+dependencies:
+    pip install -r requirements-bench.txt
+
+Usage:
+    python benchmarks/bench_epub_import.py [--chapters 40] [--size-mb 1] [--repeat 5] [--workers 1,2,4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CONTAINER = '''<?xml version="1.0"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+<rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>
+</container>'''
+
+WORDS = ("the and of to a in was he she it that her his with as for had on at by "
+         "lantern river harbor stone winter captain letter silence morning distant "
+         "Mara Theo Ilse whispered carried remembered beneath across").split()
+
+
+def make_epub(path: str, chapters: int, size_mb: float, seed: int = 7):
+    """Write an EPUB of roughly size_mb of XHTML, with a title page and one file per chapter"""
+    rng = random.Random(seed)
+    per_chapter = int(size_mb * 1024 * 1024 / chapters)
+    items, spine = [], []
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+        archive.writestr('META-INF/container.xml', CONTAINER)
+
+        docs = [('title', '<h1>The Lantern Harbor</h1><p>by Ana Novak</p>')]
+        for n in range(1, chapters + 1):
+            body = [f'<h2>Chapter {n}</h2>']
+            size = 0
+            while size < per_chapter:
+                paragraph = f'<p>{escape(" ".join(rng.choice(WORDS) for _ in range(70)))}</p>\n'
+                body.append(paragraph)
+                size += len(paragraph)
+            docs.append((f'ch{n:03d}', ''.join(body)))
+
+        # Manifest order deliberately differs from reading order
+        for doc_id, body in reversed(docs):
+            archive.writestr(f'OEBPS/{doc_id}.xhtml',
+                             f'<?xml version="1.0" encoding="utf-8"?>\n<html xmlns="http://www.w3.org/1999/xhtml">'
+                             f'<head><title>{doc_id}</title></head><body>{body}</body></html>')
+            items.append(f'<item id="{doc_id}" href="{doc_id}.xhtml" media-type="application/xhtml+xml"/>')
+        spine = [f'<itemref idref="{doc_id}"/>' for doc_id, _ in docs]
+
+        archive.writestr('OEBPS/content.opf', f'''<?xml version="1.0" encoding="utf-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="id">
+<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+<dc:identifier id="id">bench</dc:identifier><dc:title>The Lantern Harbor</dc:title>
+<dc:creator>Ana Novak</dc:creator><dc:language>en</dc:language>
+</metadata>
+<manifest>{''.join(items)}</manifest>
+<spine>{''.join(spine)}</spine>
+</package>''')
+
+
+def run_legacy(path: str):
+    import ebooklib
+    from ebooklib import epub
+    from bs4 import BeautifulSoup
+    from core.import_utils import DocumentParser
+
+    book = epub.read_epub(path)
+    texts = []
+    for item in book.get_items():
+        if item.get_type() == ebooklib.ITEM_DOCUMENT:
+            soup = BeautifulSoup(item.get_content(), 'html.parser')
+            texts.append(soup.get_text(separator='\n\n', strip=True))
+    text = '\n\n'.join(texts)
+
+    book = epub.read_epub(path)
+    title = book.get_metadata('DC', 'title')[0][0]
+    return DocumentParser.detect_chapters(text), title
+
+
+def run_single_pass(path: str):
+    from core.import_utils import DocumentParser
+    parsed = DocumentParser.parse_epub_document(path)
+    return parsed.chapters, parsed.title
+
+
+def run_workers(path: str, workers: int):
+    from core.document_reader import read_epub
+    from core.chapter_detection import ChapterDetector
+    book = read_epub(path, workers=workers)
+    return ChapterDetector().detect_documents(book.documents), book.title
+
+
+def bench(name: str, fn, path: str, repeat: int):
+    try:
+        fn(path)
+    except ImportError as e:
+        print(f"{name:>12}: skipped ({e})")
+        return
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chapters, title = fn(path)
+        timings.append(time.perf_counter() - start)
+    print(f"{name:>12}: best {min(timings) * 1000:.1f} ms, {len(chapters)} chapters, "
+          f"first '{chapters[0]['title']}', title '{title}'")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chapters", type=int, default=40)
+    parser.add_argument("--size-mb", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", default="", help="Comma-separated process pool sizes to compare")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "book.epub")
+        make_epub(path, args.chapters, args.size_mb)
+        print(f"EPUB: {args.chapters} chapters, {args.size_mb} MB of XHTML, "
+              f"{os.path.getsize(path) / 1e6:.2f} MB compressed")
+        bench("legacy", run_legacy, path, args.repeat)
+        bench("single-pass", run_single_pass, path, args.repeat)
+        if args.workers:
+            print(f"CPU cores: {os.cpu_count()}")
+        for workers in [int(w) for w in args.workers.split(',') if w]:
+            bench(f"{workers} workers", lambda p, w=workers: run_workers(p, w), path, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
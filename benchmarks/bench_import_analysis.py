@@ -0,0 +1,103 @@
+"""
+Benchmark ImportAnalyzer: sequential vs concurrent AI extraction
+
+Uses a fake model that sleeps per agent instead of calling Gemini, so wall
+time should approach the slowest extraction rather than the sum of all three.
+
+Usage:
+    python benchmarks/bench_import_analysis.py [--characters 1.0] [--world 1.5] [--outline 2.0]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class FakeAgents:
+    """Stands in for BookAgents; latency depends on which prompt it is given"""
+
+    def __init__(self, latencies, failing=()):
+        self.latencies = latencies
+        self.failing = failing
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, agent_name, prompt):
+        if "MAIN CHARACTERS" in prompt:
+            kind = 'characters'
+        elif "RULES OF THE WORLD" in prompt:
+            kind = 'world'
+        else:
+            kind = 'outline'
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latencies[kind])
+        if kind in self.failing:
+            raise RuntimeError(f"{kind} model unavailable")
+        return f"{kind} from {agent_name}"
+
+
+def sample_chapters(count=12):
+    paragraph = "Mara carried the lantern down to the harbor while Theo watched from the stone wall. " * 40
+    return [{'chapter_number': n, 'title': f"Chapter {n}", 'content': paragraph} for n in range(1, count + 1)]
+
+
+def run_sequential(analyzer, chapters):
+    # The previous implementation: one extraction after another
+    full_text = '\n\n'.join(ch['content'] for ch in chapters)
+    for extract in (lambda: analyzer._extract_ai_characters(full_text, "Bench"),
+                    lambda: analyzer._extract_ai_world(full_text, "Bench"),
+                    lambda: analyzer._extract_ai_outline(chapters, "Bench", len(chapters))):
+        try:
+            extract()
+        except Exception as e:
+            print(f"sequential extraction failed: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--characters", type=float, default=1.0)
+    parser.add_argument("--world", type=float, default=1.5)
+    parser.add_argument("--outline", type=float, default=2.0)
+    args = parser.parse_args()
+
+    from core.import_utils import ImportAnalyzer
+
+    latencies = {'characters': args.characters, 'world': args.world, 'outline': args.outline}
+    chapters = sample_chapters()
+    config = {'config_list': [{}]}
+
+    start = time.perf_counter()
+    run_sequential(ImportAnalyzer(config, agents=FakeAgents(latencies)), chapters)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analysis = ImportAnalyzer(config, agents=FakeAgents(latencies)).analyze_for_import(chapters, "Bench")
+    concurrent = time.perf_counter() - start
+
+    # One extraction exceeding its timeout still yields the other two
+    timeouts = {'outline': args.outline / 2}
+    partial = ImportAnalyzer(config, agents=FakeAgents(latencies), timeouts=timeouts).analyze_for_import(chapters, "Bench")
+
+    # A model error is recorded and replaced by the basic analysis, like a timeout
+    events = []
+    failed = ImportAnalyzer(config, agents=FakeAgents(latencies, failing={'world'}),
+                            progress=lambda event, **fields: events.append((event, fields))
+                            ).analyze_for_import(chapters, "Bench")
+    finished = {fields['name']: fields['ok'] for event, fields in events if event == 'extraction_finished'}
+
+    print(f"Fake latencies: {latencies} (sum {sum(latencies.values()):.1f}s, max {max(latencies.values()):.1f}s)")
+    print(f"{'sequential':>10}: {sequential:.2f}s")
+    print(f"{'concurrent':>10}: {concurrent:.2f}s, errors={analysis.get('extraction_errors')}")
+    print(f"{'timeout':>10}: errors={partial.get('extraction_errors')}, characters={partial['suggested_characters']!r}")
+    print(f"{'error':>10}: errors={failed.get('extraction_errors')}, finished={finished}, "
+          f"world={failed['suggested_world'].splitlines()[0]!r}")
+
+
+if __name__ == "__main__":
+    main()
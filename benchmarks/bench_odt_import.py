@@ -0,0 +1,141 @@
+"""
+Benchmark ODT import: odfpy DOM + two getElementsByType passes vs the streaming reader
+
+Generates a synthetic manuscript (text:h chapter headings, list items, footnotes)
+and runs each parser in a fresh process so peak RSS is comparable.
+
+The legacy run needs odfpy, which is no longer a runtime dependency:
+    pip install -r requirements-bench.txt
+
+Usage:
+    python benchmarks/bench_odt_import.py [--words 300000] [--chapters 60]
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+NAMESPACES = (
+    'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+    'xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0" '
+    'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+    'xmlns:fo="urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0"'
+)
+
+MANIFEST = '''<?xml version="1.0" encoding="UTF-8"?>
+<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.2">
+<manifest:file-entry manifest:full-path="/" manifest:media-type="application/vnd.oasis.opendocument.text"/>
+<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>
+<manifest:file-entry manifest:full-path="styles.xml" manifest:media-type="text/xml"/>
+</manifest:manifest>'''
+
+STYLES = f'''<?xml version="1.0" encoding="UTF-8"?>
+<office:document-styles {NAMESPACES} office:version="1.2"><office:styles>
+<style:style style:name="Standard" style:family="paragraph"/>
+<style:style style:name="Heading_20_1" style:display-name="Heading 1" style:family="paragraph" style:default-outline-level="1"/>
+</office:styles></office:document-styles>'''
+
+WORDS = ("the and of to a in was he she it that her his with as for had on at by "
+         "lantern river harbor stone winter captain letter silence morning distant "
+         "Mara Theo Ilse whispered carried remembered beneath across").split()
+
+
+def make_odt(path: str, words: int, chapters: int, seed: int = 7):
+    """Write a manuscript of roughly `words` words"""
+    rng = random.Random(seed)
+    words_per_chapter = words // chapters
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(zipfile.ZipInfo('mimetype'), 'application/vnd.oasis.opendocument.text')
+        archive.writestr('META-INF/manifest.xml', MANIFEST)
+        archive.writestr('styles.xml', STYLES)
+        with archive.open('content.xml', 'w') as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?><office:document-content {NAMESPACES} office:version="1.2">'
+                    f'<office:automatic-styles><style:style style:name="P1" style:family="paragraph" '
+                    f'style:parent-style-name="Standard"><style:paragraph-properties fo:break-before="page"/>'
+                    f'</style:style></office:automatic-styles><office:body><office:text>'.encode())
+            for chapter in range(1, chapters + 1):
+                f.write(f'<text:h text:style-name="Heading_20_1" text:outline-level="1">Chapter {chapter}</text:h>'.encode())
+                written = 0
+                while written < words_per_chapter:
+                    sentence = escape(' '.join(rng.choice(WORDS) for _ in range(80)))
+                    f.write(f'<text:p text:style-name="Standard">{sentence}<text:s text:c="2"/>'
+                            f'<text:span>spanned words</text:span><text:note text:note-class="footnote">'
+                            f'<text:note-citation>1</text:note-citation><text:note-body><text:p>a note</text:p>'
+                            f'</text:note-body></text:note></text:p>'.encode())
+                    if written % 2000 < 82:
+                        f.write(b'<text:list><text:list-item><text:p>a list item</text:p></text:list-item></text:list>')
+                    written += 82
+            f.write(b'</office:text></office:body></office:document-content>')
+
+
+def run_legacy(path: str):
+    # The previous implementation: odfpy DOM, paragraphs then headings, then a second split
+    from odf import text, teletype
+    from odf.opendocument import load
+    from core.import_utils import DocumentParser
+    doc = load(path)
+    full_text = [teletype.extractText(p).strip() for p in doc.getElementsByType(text.P)]
+    full_text += [teletype.extractText(h).strip() for h in doc.getElementsByType(text.H)]
+    return DocumentParser.detect_chapters('\n\n'.join(t for t in full_text if t))
+
+
+def run_streaming(path: str):
+    from core.import_utils import DocumentParser
+    return list(DocumentParser.stream_odt(path).chapters)
+
+
+def child(method: str, path: str):
+    start = time.perf_counter()
+    chapters = run_legacy(path) if method == "legacy" else run_streaming(path)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "method": method,
+        "seconds": round(elapsed, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "chapters": len(chapters),
+        "words": sum(len(ch['content'].split()) for ch in chapters),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=300000)
+    parser.add_argument("--chapters", type=int, default=60)
+    parser.add_argument("--child", nargs=2, metavar=("METHOD", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "manuscript.odt")
+        make_odt(path, args.words, args.chapters)
+        print(f"Manuscript: {args.words:,} words, {os.path.getsize(path) / 1e6:.1f} MB odt")
+
+        for method in ("legacy", "streaming"):
+            result = subprocess.run(
+                [sys.executable, __file__, "--child", method, path],
+                capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                print(f"{method:>10}: failed ({result.stderr.strip().splitlines()[-1]})")
+                continue
+            r = json.loads(result.stdout.strip().splitlines()[-1])
+            print(f"{method:>10}: {r['seconds']:.2f}s, peak RSS {r['peak_rss_mb']:.0f} MB, "
+                  f"{r['chapters']} chapters, {r['words']:,} words")
+
+
+if __name__ == "__main__":
+    main()
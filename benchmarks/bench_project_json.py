@@ -0,0 +1,133 @@
+"""
+Benchmark project JSON read/write and the project list response
+
+Compares the previous json.dump(indent=2)/json.load with core.serialization
+(orjson when installed) and the compact world/characters/outline layout where
+the AI text lives in a .txt file instead of raw_content. Run it once with and
+once without orjson installed to see both backends.
+
+Usage:
+    python benchmarks/bench_project_json.py [--characters 40] [--projects 500] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from core import serialization  # noqa: E402
+from core.json_schemas import Character, CharactersData  # noqa: E402
+from core.project_manager import ProjectManager, clear_caches  # noqa: E402
+from core.pydantic_models import ProjectMetadata  # noqa: E402
+
+WORDS = ("the and of to a in was he she it that her his with as for had on at by "
+         "lantern river harbor stone winter captain letter silence morning distant "
+         "Mara Theo Ilse whispered carried remembered beneath across stubborn loyal").split()
+
+
+def make_characters(count: int, seed: int = 7) -> CharactersData:
+    rng = random.Random(seed)
+
+    def text(words):
+        return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+    characters = [Character(name=f"Person {i}", role="supporting", importance="secondary",
+                            physical_description=text(60), background=text(150),
+                            personality=[text(3) for _ in range(5)], goals=[text(6) for _ in range(3)],
+                            character_arc=text(80))
+                  for i in range(count)]
+    raw = '\n\n'.join(f"**Character Profile {i}:**\n{text(400)}" for i in range(count))
+    return CharactersData(characters=characters, generated_date=datetime.now().isoformat(), raw_content=raw)
+
+
+def make_index(count: int):
+    now = datetime.now().isoformat()
+    return {f"{i:08d}-0000-0000-0000-000000000000": ProjectMetadata(
+        id=f"{i:08d}-0000-0000-0000-000000000000", title=f"Book {i}", author="A. Writer", genre="Fantasy",
+        created_date=now, last_modified=f"2026-01-{i % 28 + 1:02d}T10:00:00", chapter_count=30,
+        word_count=90000).model_dump() for i in range(count)}
+
+
+def best_of(repeat, func):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--characters", type=int, default=40)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Backend: {'orjson ' + serialization.orjson.__version__ if serialization.orjson else 'json (stdlib)'}")
+    document = make_characters(args.characters)
+    index = make_index(args.projects)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pm = ProjectManager(os.path.join(tmp, "library"))
+        project_dir = pm.base_path / "project"
+        project_dir.mkdir()
+        legacy_file = project_dir / "legacy_characters.json"
+
+        def legacy_write():
+            with open(legacy_file, 'w', encoding='utf-8') as f:
+                json.dump(document.model_dump(), f, indent=2, ensure_ascii=False)
+
+        def legacy_read():
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                json.load(f)
+
+        def new_read():
+            serialization.read_file(project_dir / "characters.json")
+            pm.read_document_text(project_dir, "characters")
+
+        results = [
+            ("characters write", best_of(args.repeat, legacy_write),
+             best_of(args.repeat, lambda: pm.write_document(project_dir, "characters", document))),
+            ("characters read", best_of(args.repeat, legacy_read), best_of(args.repeat, new_read)),
+        ]
+        legacy_size = os.path.getsize(legacy_file)
+        new_size = os.path.getsize(project_dir / "characters.json")
+        text_size = os.path.getsize(project_dir / "characters.txt")
+
+        # Project list: validate + model_dump() + jsonable_encoder + JSONResponse rendering,
+        # against the cached listing rendered by serialization
+        pm.write_json(pm.projects_file, index)
+
+        def legacy_list():
+            projects = [ProjectMetadata(**data) for data in pm.read_json(pm.projects_file).values()]
+            projects.sort(key=lambda p: p.last_modified, reverse=True)
+            json.dumps(jsonable_encoder([project.model_dump() for project in projects]), ensure_ascii=False,
+                       allow_nan=False, indent=None, separators=(",", ":")).encode('utf-8')
+
+        def new_list_cold():
+            # projects.json changed since the last request: re-read and re-validate
+            clear_caches()
+            serialization.dumps(pm.list_project_dicts())
+
+        results.append(("project list (changed)", best_of(args.repeat, legacy_list), best_of(args.repeat, new_list_cold)))
+        results.append(("project list (unchanged)", best_of(args.repeat, legacy_list),
+                        best_of(args.repeat, lambda: serialization.dumps(pm.list_project_dicts()))))
+
+    print(f"characters.json: {legacy_size / 1024:.0f} KB pretty with raw_content -> "
+          f"{new_size / 1024:.0f} KB compact + {text_size / 1024:.0f} KB characters.txt")
+    for name, before, after in results:
+        print(f"{name:24s} before {before:8.2f} ms   after {after:8.2f} ms   ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
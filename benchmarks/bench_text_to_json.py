@@ -0,0 +1,150 @@
+"""
+Benchmark text_to_json on a 200 KB AI character document
+
+Compares the previous per-call keyword scans and DOTALL section regexes with
+the rule tables, KeywordMatcher and single-pass bullet extraction, and checks
+that roles, importance and genre/period/theme classification agree.
+
+Usage:
+    python benchmarks/bench_text_to_json.py [--kb 200] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.json_schemas import Character  # noqa: E402
+from core.text_to_json import (  # noqa: E402
+    _extract_character_from_section, parse_characters_text_to_json, parse_world_text_to_json,
+)
+
+WORDS = ("the and of to a in was he she it that her his with as for had on at by "
+         "lantern river harbor stone winter captain letter silence morning distant "
+         "Mara Theo Ilse whispered carried remembered beneath across power loss "
+         "villain minor magic future ruins").split()
+ROLES = ("the protagonist of the story", "the main antagonist", "a minor background figure",
+         "a loyal ally", "a hero of the old war")
+TRAITS = ("Stubborn", "Curious", "Loyal", "Reckless", "Patient", "Secretive", "Kind", "Proud")
+
+
+def make_document(kb: int, seed: int = 7) -> str:
+    """Character profiles of ~1.5 KB each until the document reaches kb kilobytes"""
+    rng = random.Random(seed)
+    parts = ["# Character Profiles\n\nThe cast of a story about survival and sacrifice in a dystopian wasteland.\n"]
+    size, number = len(parts[0]), 1
+    while size < kb * 1024:
+        prose = ' '.join(rng.choice(WORDS) for _ in range(180))
+        traits = '\n'.join(f"- **{trait}**: {' '.join(rng.choice(WORDS) for _ in range(10))}"
+                           for trait in rng.sample(TRAITS, 3))
+        profile = (f"**Character Profile {number}:**\n**Name: Person {number}**\n"
+                   f"Role: {rng.choice(ROLES)}\n\n{prose}\n\n**Personality:**\n{traits}\n\n"
+                   f"**Goals:**\n- **Find the {rng.choice(WORDS)}**\n- **Protect {rng.choice(WORDS)}**\n\n")
+        parts.append(profile)
+        size += len(profile)
+        number += 1
+    return ''.join(parts)
+
+
+def legacy_character(section):
+    """The previous _extract_character_from_section, minus the name lookup"""
+    role_text = section.lower()
+    role = "supporting"
+    if any(word in role_text for word in ['protagonist', 'main character', 'hero']):
+        role = "protagonist"
+    elif any(word in role_text for word in ['antagonist', 'villain', 'enemy']):
+        role = "antagonist"
+    importance = "secondary"
+    if 'main character' in role_text or 'protagonist' in role_text:
+        importance = "main"
+    elif any(word in role_text for word in ['minor', 'background', 'brief']):
+        importance = "minor"
+    personality = []
+    if 'personality' in role_text:
+        match = re.search(r'personality.*?(?=\*|$)', section, re.IGNORECASE | re.DOTALL)
+        if match:
+            personality = [t.strip() for t in re.findall(r'[*-]\s*\*\*([^*]+)\*\*', match.group(0))]
+    goals = []
+    if 'goal' in role_text:
+        match = re.search(r'goal.*?(?=\*|$)', section, re.IGNORECASE | re.DOTALL)
+        if match:
+            goals = [g.strip() for g in re.findall(r'[*-]\s*\*\*([^*]+)\*\*', match.group(0))]
+    return Character(name="", role=role, importance=importance, personality=personality, goals=goals)
+
+
+def legacy_world(content):
+    """The previous parse_world_text_to_json keyword scans"""
+    content_lower = content.lower()
+    genre = period = None
+    if any(word in content_lower for word in ['dystopian', 'post-apocalyptic', 'wasteland']):
+        genre = "Dystopian/Post-Apocalyptic"
+    elif any(word in content_lower for word in ['fantasy', 'magic', 'wizard', 'spell']):
+        genre = "Fantasy"
+    elif any(word in content_lower for word in ['sci-fi', 'science fiction', 'space', 'future', 'technology']):
+        genre = "Science Fiction"
+    elif any(word in content_lower for word in ['horror', 'terror', 'nightmare', 'fear']):
+        genre = "Horror"
+    if any(word in content_lower for word in ['medieval', 'middle ages', 'knights', 'castles']):
+        period = "Medieval"
+    elif any(word in content_lower for word in ['modern', 'contemporary', 'present day']):
+        period = "Modern"
+    elif any(word in content_lower for word in ['future', 'futuristic', 'advanced', 'space age']):
+        period = "Future"
+    elif any(word in content_lower for word in ['post-apocalyptic', 'after the', 'ruins', 'wasteland']):
+        period = "Post-Apocalyptic"
+    themes = []
+    if 'survival' in content_lower:
+        themes.append("Survival")
+    if any(word in content_lower for word in ['power', 'corruption', 'authority']):
+        themes.append("Power and Corruption")
+    if any(word in content_lower for word in ['good', 'evil', 'moral', 'ethics']):
+        themes.append("Good vs Evil")
+    if any(word in content_lower for word in ['sacrifice', 'loss', 'death']):
+        themes.append("Sacrifice and Loss")
+    if any(word in content_lower for word in ['technology', 'progress', 'advancement']):
+        themes.append("Technology and Progress")
+    return genre, period, themes
+
+
+def best_of(repeat, func, *args):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kb", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    document = make_document(args.kb)
+    sections = re.split(r'\*\*Character Profile \d+:', document)[1:]
+    print(f"Document: {len(document) / 1024:.0f} KB, {len(sections)} character profiles")
+
+    legacy_time, legacy = best_of(args.repeat, lambda: [legacy_character(s) for s in sections])
+    new_time, new = best_of(args.repeat, lambda: [_extract_character_from_section(s) for s in sections])
+    assert [(c.role, c.importance) for c in legacy] == [(c.role, c.importance) for c in new]
+    print(f"Characters  legacy {legacy_time * 1000:7.1f} ms  matcher {new_time * 1000:7.1f} ms  "
+          f"(personality traits found: legacy {sum(len(c.personality) for c in legacy)}, "
+          f"now {sum(len(c.personality) for c in new)})")
+
+    legacy_time, legacy = best_of(args.repeat, legacy_world, document)
+    new_time, world = best_of(args.repeat, parse_world_text_to_json, "Benchmark", document)
+    assert legacy == (world.genre, world.time_period, world.themes), (legacy, world)
+    print(f"World       legacy {legacy_time * 1000:7.1f} ms  matcher {new_time * 1000:7.1f} ms")
+
+    full_time, characters = best_of(args.repeat, parse_characters_text_to_json, document)
+    print(f"parse_characters_text_to_json: {full_time * 1000:.1f} ms for {len(characters.characters)} characters")
+
+
+if __name__ == "__main__":
+    main()
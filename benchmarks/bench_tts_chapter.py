@@ -0,0 +1,133 @@
+"""
+Benchmark chapter TTS: one request for the whole chapter vs the segment pipeline
+
+Uses the stand-in Kokoro server from tests/kokoro_stand_in.py, with synthesis time
+proportional to the text (--ms-per-kchar). The single-request path is what
+/api/tts/chapter used to do. The pipeline is timed with each --workers count,
+and with the stream endpoint's short first segment for its time to first
+audio, and through the paragraph audio cache: cold, unchanged and after a
+one-word edit. It is then run once against a server whose first answer is a 500, to
+check that only that segment is sent again. The stand-in synthesizes requests in parallel, so
+the speedup is an upper bound for a Kokoro server on one GPU.
+
+Usage:
+    python benchmarks/bench_tts_chapter.py [--words 5000] [--ms-per-kchar 40] [--workers 1,2,4,8]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import wave
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.tts_cache import AudioCache  # noqa: E402
+from core.tts_client import KokoroClient  # noqa: E402
+from core.tts_pipeline import (  # noqa: E402
+    FIRST_SEGMENT_CHARS, plan_segments, synthesize_segments, synthesize_to_file,
+)
+from tests.kokoro_stand_in import StandInKokoro  # noqa: E402
+
+WORDS = ("the and of to a in was he she it that her his with as for had on at by "
+         "lantern river harbor stone winter captain letter silence morning distant "
+         "Mara Theo Ilse whispered carried remembered beneath across").split()
+
+
+def make_chapter(words: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    paragraphs, count = [], 0
+    while count < words:
+        sentences = []
+        for _ in range(rng.randint(2, 8)):
+            length = rng.randint(5, 30)
+            sentences.append(' '.join(rng.choice(WORDS) for _ in range(length)).capitalize() + rng.choice('..!?'))
+            count += length
+        paragraphs.append(' '.join(sentences))
+    return '\n\n'.join(paragraphs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--ms-per-kchar", type=float, default=40)
+    parser.add_argument("--workers", default="1,2,4,8")
+    args = parser.parse_args()
+
+    text = make_chapter(args.words)
+    segments, _ = plan_segments(text, "mp3")
+    print(f"{args.words} words, {len(text)} chars -> {len(segments)} segments "
+          f"(largest {max(map(len, segments))} chars)")
+
+    async def run():
+        server = StandInKokoro(0.0, delay_per_kchar=args.ms_per_kchar / 1000)
+        client = KokoroClient(server.base_url)
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                start = time.perf_counter()
+                response = await client.speech(text, "bf_emma", "mp3")
+                with open(os.path.join(tmp, "legacy.mp3"), "wb") as f:
+                    f.write(response.content)
+                legacy = time.perf_counter() - start
+                print(f"{'single request':18s}{legacy * 1000:8.0f} ms   whole chapter buffered in memory")
+
+                for workers in [int(w) for w in args.workers.split(',')]:
+                    start = time.perf_counter()
+                    result = await synthesize_to_file(client, text, "bf_emma", "mp3",
+                                                      os.path.join(tmp, f"w{workers}.mp3"), workers=workers)
+                    elapsed = time.perf_counter() - start
+                    print(f"{f'pipeline x{workers}':18s}{elapsed * 1000:8.0f} ms   ({legacy / elapsed:.1f}x)"
+                          f"   {result['size'] / 1024:.0f} KB")
+
+                # What the stream endpoint does: a short first segment, then the rest
+                stream_segments, segment_format = plan_segments(text, "mp3", first_chars=FIRST_SEGMENT_CHARS)
+                start = time.perf_counter()
+                first = None
+                async for _ in synthesize_segments(client, stream_segments, "bf_emma", segment_format):
+                    first = first or time.perf_counter() - start
+                print(f"{'stream x4':18s}{(time.perf_counter() - start) * 1000:8.0f} ms   "
+                      f"first audio after {first * 1000:.0f} ms (file path: whole chapter first)")
+
+                # Paragraph audio cache: first render, unchanged re-render, one typo fixed
+                edited = text.split('\n\n')
+                edited[len(edited) // 2] = edited[len(edited) // 2].replace(' the ', ' teh ', 1)
+                for label, version in (("cache cold", text), ("cache warm", text), ("one typo", '\n\n'.join(edited))):
+                    calls = server.speech_calls
+                    start = time.perf_counter()
+                    result = await synthesize_to_file(client, version, "bf_emma", "mp3", os.path.join(tmp, "c.mp3"),
+                                                      cache=AudioCache(tmp))
+                    print(f"{label:18s}{(time.perf_counter() - start) * 1000:8.0f} ms   "
+                          f"{result['cached_segments']}/{result['segments']} segments cached, "
+                          f"{server.speech_calls - calls} synthesized")
+
+                path = os.path.join(tmp, "chapter.wav")
+                await synthesize_to_file(client, text, "bf_emma", "wav", path, workers=4)
+                with wave.open(path) as audio:
+                    assert audio.getframerate() == 24000 and audio.getnframes() * 2 == os.path.getsize(path) - 44
+                print("wav: PCM segments under one valid header")
+        finally:
+            await client.aclose()
+            server.shutdown()
+            server.server_close()
+
+        server = StandInKokoro(0.0, fail_first=1, fail_status=500)
+        client = KokoroClient(server.base_url)
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                result = await synthesize_to_file(client, text, "bf_emma", "mp3", os.path.join(tmp, "retry.mp3"))
+            assert server.speech_calls == result['segments'] + 1, server.speech_calls
+            print(f"retry: one 500 -> {server.speech_calls} calls for {result['segments']} segments")
+        finally:
+            await client.aclose()
+            server.shutdown()
+            server.server_close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark TTS calls: blocking requests inside async routes vs the pooled KokoroClient
+
+Runs a stand-in Kokoro-FastAPI server on localhost (each /audio/speech call
+takes --delay seconds) and fires --calls synthesis requests at once, the way
+several browser tabs would. Reports wall time, the longest event loop stall
+(how long every other request to the app would have waited) and how many TCP
+connections the server accepted. The blocking comparison needs requests, from
+requirements-bench.txt; the client's retries and errors are covered by
+tests/test_tts_client.py.
+
+Usage:
+    pip install -r requirements-bench.txt
+    python benchmarks/bench_tts_client.py [--calls 8] [--delay 0.2] [--text-kb 20]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+try:
+    import requests
+except ImportError:
+    # Only the legacy comparison needs it: pip install -r requirements-bench.txt
+    requests = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.tts_client import KokoroClient  # noqa: E402
+from tests.kokoro_stand_in import StandInKokoro  # noqa: E402
+
+
+async def run_with_stall_probe(calls):
+    """Run the coroutines together; returns (seconds, longest event loop stall in ms)"""
+    stall = 0.0
+    running = True
+
+    async def probe():
+        nonlocal stall
+        while running:
+            before = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stall = max(stall, time.perf_counter() - before - 0.005)
+
+    probe_task = asyncio.ensure_future(probe())
+    start = time.perf_counter()
+    results = await asyncio.gather(*calls)
+    elapsed = time.perf_counter() - start
+    running = False
+    await probe_task
+    return results, elapsed, stall * 1000
+
+
+async def legacy_route(base_url: str, text: str) -> int:
+    # What the routes used to do: a blocking call, new connection each time
+    response = requests.post(f"{base_url}/audio/speech", json={
+        "model": "kokoro", "voice": "bf_emma", "input": text, "response_format": "mp3"},
+        headers={"Content-Type": "application/json"})
+    return len(response.content)
+
+
+async def pooled_route(client: KokoroClient, text: str) -> int:
+    response = await client.speech(text, "bf_emma", "mp3")
+    assert response.status_code == 200, response.status_code
+    return len(response.content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--text-kb", type=int, default=20)
+    args = parser.parse_args()
+
+    text = ("The lantern swung above the harbor while Mara counted the boats. " * 400)[:args.text_kb * 1024]
+
+    async def run():
+        server = StandInKokoro(args.delay)
+        try:
+            if requests is not None:
+                _, legacy_time, legacy_stall = await run_with_stall_probe(
+                    [legacy_route(server.base_url, text) for _ in range(args.calls)])
+                legacy_connections, server.connections = server.connections, 0
+
+            client = KokoroClient(server.base_url)
+            try:
+                # Two rounds, so the second one shows keep-alive reuse
+                await run_with_stall_probe([pooled_route(client, text) for _ in range(args.calls)])
+                _, pooled_time, pooled_stall = await run_with_stall_probe(
+                    [pooled_route(client, text) for _ in range(args.calls)])
+            finally:
+                await client.aclose()
+            pooled_connections = server.connections
+        finally:
+            server.stop()
+
+        print(f"{args.calls} concurrent calls, {args.delay * 1000:.0f} ms synthesis each, {args.text_kb} KB text")
+        print(f"{'':26s}{'wall':>10s}{'loop stall':>14s}{'connections':>14s}")
+        if requests is not None:
+            print(f"{'requests in async def':26s}{legacy_time * 1000:8.0f} ms{legacy_stall:11.0f} ms"
+                  f"{legacy_connections:14d}")
+        else:
+            print(f"{'requests in async def':26s}  skipped (requests is not installed)")
+        print(f"{'KokoroClient (2 rounds)':26s}{pooled_time * 1000:8.0f} ms{pooled_stall:11.0f} ms"
+              f"{pooled_connections:14d}")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
 """Define the API client for book generation system using Google Gemini"""
 
 import google.generativeai as genai
-from typing import Dict, List, Optional, Iterable
+from typing import Dict, List, Optional, Iterable, Type
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
+from pydantic import BaseModel
+
+from .json_schemas import WorldData, CharactersData, OutlineData
+from .structured_output import response_schema
+
+STRUCTURED_INSTRUCTION = "Respond with a JSON document following the response schema. Fill in every field with specific details from our conversation; do not leave descriptions or lists empty."
 
 class BookAgents:
     def __init__(self, agent_config: Dict, outline: Optional[List[Dict]] = None):
@@ -149,6 +155,19 @@ class BookAgents:
 
         return gemini_messages
 
+    def _generation_config(self, temperature: float, schema_model: Optional[Type[BaseModel]] = None):
+        """Generation config; with schema_model the response is JSON constrained to that model's schema"""
+        if schema_model is None:
+            return genai.types.GenerationConfig(
+                temperature=temperature, max_output_tokens=self.max_output_tokens
+            )
+        return genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=self.max_output_tokens,
+            response_mime_type="application/json",
+            response_schema=response_schema(schema_model),
+        )
+
     def generate_content(self, agent_name: str, prompt: str) -> str:
         """Generate content using the Google Gemini API with the specified agent system prompt"""
         if agent_name not in self.system_prompts:
@@ -460,11 +479,16 @@ class BookAgents:
             print(f"ERROR: Gemini final world generation failed: {e}")
             return f"[ERROR: Could not generate final world - {e}]"
 
-    def generate_final_world_stream(self, chat_history, topic) -> Iterable:
-        """Generate the final world setting based on the chat history using streaming Gemini."""
+    def generate_final_world_stream(self, chat_history, topic, structured: bool = False) -> Iterable:
+        """Generate the final world setting based on the chat history using streaming Gemini.
+
+        With structured=True the stream is a JSON WorldData document (see core.structured_output).
+        """
         # Use the world_builder system prompt (or a dedicated finalization prompt)
         agent_name = "world_builder"  # Or reuse the specific final prompt from above
         final_instruction = f"Based on our conversation about '{topic}', please create a comprehensive and detailed world setting. Format it with clear sections for different aspects of the world (geography, magic/technology, culture, etc.). This will be the final world setting for the book."
+        if structured:
+            final_instruction += f" {STRUCTURED_INSTRUCTION}"
 
         # Prepare messages
         messages = self._prepare_gemini_messages(
@@ -479,10 +503,7 @@ class BookAgents:
             return empty_generator()
 
         # Define generation config
-        generation_config = genai.types.GenerationConfig(
-            temperature=0.7,  # Adjust as needed
-            max_output_tokens=self.max_output_tokens,
-        )
+        generation_config = self._generation_config(0.7, WorldData if structured else None)
 
         try:
             # Call the API with streaming enabled
@@ -589,11 +610,16 @@ class BookAgents:
 
     # === REVISED: Final character generation (stream) ===
     def generate_final_characters_stream(
-        self, chat_history, world_theme, num_characters=3
+        self, chat_history, world_theme, num_characters=3, structured: bool = False
     ) -> Iterable:
-        """Generate the final character profiles based on chat history using streaming Gemini."""
+        """Generate the final character profiles based on chat history using streaming Gemini.
+
+        With structured=True the stream is a JSON CharactersData document.
+        """
         agent_name = "character_generator"
         final_instruction = f"Based on our conversation, please create {num_characters} detailed character profiles for the book. Format each character with Name, Role, Physical Description, Background, Personality, and Goals/Motivations, following the format specified in your initial instructions. This will be the final character list for the book."
+        if structured:
+            final_instruction += f" {STRUCTURED_INSTRUCTION}"
 
         # Inject world theme context into system prompt
         base_system_prompt = self.system_prompts.get(agent_name, "")
@@ -617,9 +643,7 @@ class BookAgents:
                 yield "[No input for final characters stream]"
                 return empty_generator()
 
-        generation_config = genai.types.GenerationConfig(
-            temperature=0.7, max_output_tokens=self.max_output_tokens
-        )
+        generation_config = self._generation_config(0.7, CharactersData if structured else None)
 
         try:
             stream = self.gemini_model.generate_content(
@@ -685,9 +709,12 @@ class BookAgents:
 
     # === REVISED: Final outline generation (stream) ===
     def generate_final_outline_stream(
-        self, chat_history, world_theme, characters, num_chapters=10
+        self, chat_history, world_theme, characters, num_chapters=10, structured: bool = False
     ) -> Iterable:
-        """Generate the final outline based on chat history using streaming Gemini."""
+        """Generate the final outline based on chat history using streaming Gemini.
+
+        With structured=True the stream is a JSON OutlineData document.
+        """
         agent_name = "outline_creator"  # Use the final outline generator prompt
         final_instruction = f"""Based on our conversation, please create a detailed {num_chapters}-chapter outline for the book.
 
@@ -699,6 +726,8 @@ CRITICAL REQUIREMENTS:
 5. Maintain a coherent story from beginning to end
 
 Format it as a properly structured outline with clear chapter sections and events. This will be the final outline for the book."""
+        if structured:
+            final_instruction += f" {STRUCTURED_INSTRUCTION} Every chapter needs a summary and at least 3 plot_points."
 
         # Inject world and character context into system prompt
         base_system_prompt = self.system_prompts.get(agent_name, "").format(
@@ -725,9 +754,7 @@ Format it as a properly structured outline with clear chapter sections and event
                 return empty_generator()
 
         # Slightly lower temperature for more structured output might be good here
-        generation_config = genai.types.GenerationConfig(
-            temperature=0.6, max_output_tokens=self.max_output_tokens
-        )
+        generation_config = self._generation_config(0.6, OutlineData if structured else None)
 
         try:
             stream = self.gemini_model.generate_content(
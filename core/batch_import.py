@@ -0,0 +1,130 @@
+"""
+Batch import for hypeWriter
+Parses and detects chapters for many manuscripts across a process pool, then
+registers every imported project with a single projects.json write.
+
+Usage:
+    python -m core.batch_import PATH [PATH ...] [--library PATH] [--workers N] [--genre GENRE]
+"""
+
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from .import_utils import DocumentParser
+from .parse_cache import ParseCache
+from .project_manager import ProjectManager
+from .pydantic_models import ProjectMetadata
+
+
+SUPPORTED_EXTENSIONS = {'.docx', '.odt', '.epub', '.txt', '.md', '.markdown'}
+
+
+class ParsedManuscript(NamedTuple):
+    file_path: str
+    title: str
+    author: str
+    chapter_count: int
+
+
+def collect_manuscripts(paths: Iterable[str]) -> List[str]:
+    """Expand directories (recursively) into supported files; explicit files are kept as given"""
+    found = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            found.extend(str(p) for p in sorted(path.rglob('*'))
+                         if p.is_file() and p.suffix.lower() in SUPPORTED_EXTENSIONS and not p.name.startswith('.'))
+        else:
+            found.append(str(path))
+    # The same file listed twice is imported once
+    return list(dict.fromkeys(found))
+
+
+def _parse_into_cache(library: str, file_path: str) -> ParsedManuscript:
+    """Parse one manuscript in a worker process
+
+    Chapters go to the parse cache rather than back over the pipe; the parent
+    streams them from there while writing the project.
+    """
+    document = ParseCache(library).open(file_path)
+    chapter_count = sum(1 for _ in document.chapters)
+    title, author = DocumentParser.document_title_and_author(document, file_path)
+    return ParsedManuscript(file_path, title, author, chapter_count)
+
+
+def import_batch(pm: ProjectManager, paths: Iterable[str], workers: Optional[int] = None, genre: str = "",
+                 auto_generate_metadata: bool = False, agent_config: Optional[Dict] = None,
+                 progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """Import many manuscripts; returns {"imported": [...], "failed": [...]}
+
+    progress is called with one event per file as it finishes, in completion order.
+    """
+    files = collect_manuscripts(paths)
+    library = str(pm.base_path)
+    projects: List[ProjectMetadata] = []
+    imported, failed = [], []
+
+    def report(event: Dict):
+        event.update(done=len(imported) + len(failed), total=len(files))
+        if progress:
+            progress(event)
+
+    try:
+        # Spawned, not forked: the server's threads may hold locks a forked child would inherit
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {executor.submit(_parse_into_cache, library, file_path): file_path for file_path in files}
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    parsed = future.result()
+                    project = _write_project(pm, parsed, genre, auto_generate_metadata, agent_config)
+                except Exception as e:
+                    failed.append({'file': file_path, 'error': str(e)})
+                    report({'file': file_path, 'status': 'failed', 'error': str(e)})
+                    continue
+                projects.append(project)
+                imported.append({'file': file_path, 'project_id': project.id, 'title': project.title,
+                                 'chapter_count': project.chapter_count, 'word_count': project.word_count})
+                report({'file': file_path, 'status': 'imported', 'project_id': project.id, 'title': project.title})
+    finally:
+        # Whatever finished is registered, even if the batch was interrupted
+        pm.register_projects(projects)
+
+    return {'imported': imported, 'failed': failed}
+
+
+def _write_project(pm: ProjectManager, parsed: ParsedManuscript, genre: str,
+                   auto_generate_metadata: bool, agent_config: Optional[Dict]) -> ProjectMetadata:
+    document = ParseCache(str(pm.base_path)).open(parsed.file_path)
+    return pm.import_document(document, parsed.title, parsed.author, genre, auto_generate_metadata, agent_config,
+                              register=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import a directory or list of manuscripts as new projects")
+    parser.add_argument("paths", nargs="+", help="Manuscript files or directories to scan")
+    parser.add_argument("--library", default="library", help="Library folder (default: library)")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--genre", default="", help="Genre for every imported project")
+    args = parser.parse_args(argv)
+
+    def progress(event):
+        line = f"[{event['done']}/{event['total']}] {event['file']}: "
+        if event['status'] == 'imported':
+            line += f"imported as {event['title']} ({event['project_id'][:8]})"
+        else:
+            line += f"FAILED ({event['error']})"
+        print(line, flush=True)
+
+    result = import_batch(ProjectManager(args.library), args.paths, workers=args.workers,
+                          genre=args.genre, progress=progress)
+    print(f"Imported {len(result['imported'])}, failed {len(result['failed'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+Chapter detection for hypeWriter imports
+One precompiled header pattern with named groups, interpreted by pluggable heuristics
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .document_reader import Paragraph
+
+
+# Longer lines are prose, never headers
+MAX_HEADER_CHARS = 100
+
+# How a scene break is written into chapter content
+SCENE_BREAK = "* * *"
+
+NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8,
+    'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14,
+    'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50, 'sixty': 60, 'seventy': 70,
+    'eighty': 80, 'ninety': 90, 'hundred': 100,
+}
+ROMAN_VALUES = {'i': 1, 'v': 5, 'x': 10, 'l': 50, 'c': 100, 'd': 500, 'm': 1000}
+
+_WORD = '|'.join(sorted(NUMBER_WORDS, key=len, reverse=True))
+_NUMBER_WORD = rf'(?:{_WORD})(?:[- ](?:{_WORD}))?'
+_ROMAN = r'(?=[MDCLXVI])M{0,4}(?:CM|CD|D?C{0,3})(?:XC|XL|L?X{0,3})(?:IX|IV|V?I{0,3})'
+_NUMBER = rf'(?:\d+|{_ROMAN}|{_NUMBER_WORD})'
+_PUNCT_SEP = r'[ \t]*[:.\-–—][ \t]*'
+_SEP = rf'(?:{_PUNCT_SEP}|[ \t]+)'
+_TITLE = r'(?:{sep}(?P<{name}>.*?))?'
+# Part/book and named headers take a title after punctuation, or after a plain
+# space only when the line reads as a title (checked by _is_title)
+_GUARDED_TITLE = r'(?:{punct}(?P<{name}>.*?)|[ \t]+(?P<{name}_plain>.*?))?'
+
+HEADER_ALTERNATIVES = [
+    rf'(?P<chapter>chapter)[ \t]+(?P<chapter_number>{_NUMBER})\b' + _TITLE.format(sep=_SEP, name='chapter_title'),
+    rf'(?P<part>part|book)[ \t]+(?P<part_number>{_NUMBER})\b'
+    + _GUARDED_TITLE.format(punct=_PUNCT_SEP, name='part_title'),
+    r'(?P<named>prologue|epilogue|interlude|preface|foreword|introduction|afterword)\b'
+    + _GUARDED_TITLE.format(punct=_PUNCT_SEP, name='named_title'),
+    r'(?P<numbered>\d+)\.[ \t]*(?P<numbered_title>.*?)',
+    r'(?P<bare_number>\d{1,3})',
+    rf'(?-i:(?P<roman>{_ROMAN}))\.?',
+    r'(?P<scene_break>(?:[*#~•⁂][ \t]*)+|-{3,}|_{3,})',
+]
+
+# Case-insensitive except for standalone roman numerals, which must be uppercase
+HEADER_RE = re.compile(
+    r'[ \t]*(?:' + '|'.join(HEADER_ALTERNATIVES) + r')[ \t]*',
+    re.IGNORECASE
+)
+
+
+class Header(NamedTuple):
+    kind: str                     # "chapter", "part", "named", "numbered", "heading" or "scene_break"
+    title: str = ""               # empty means "Chapter N"
+    number: Optional[int] = None  # number as written in the header, when there is one
+    # A lone roman numeral or number: only a header once the next one continues the run
+    needs_run: bool = False
+
+
+# Words left lowercase in title case
+_SMALL_WORDS = {'a', 'an', 'and', 'as', 'at', 'but', 'by', 'for', 'from', 'in', 'nor', 'of', 'on', 'or',
+                'the', 'to', 'with'}
+
+
+def _is_title(text: str) -> bool:
+    """Title-cased and not a sentence: "The Long Road", not "was never his strong suit." """
+    text = text.strip()
+    if not text or text.endswith('.'):
+        return False
+    return all(word[0].isupper() or word.lower() in _SMALL_WORDS or not word[0].isalpha()
+               for word in text.split())
+
+
+def parse_number(token: str) -> Optional[int]:
+    """Value of "12", "XII" or "twenty-one"; None when it is none of those"""
+    token = token.strip().lower()
+    if token.isdigit():
+        return int(token)
+    if token and all(c in ROMAN_VALUES for c in token):
+        total = 0
+        for i, c in enumerate(token):
+            value = ROMAN_VALUES[c]
+            total += -value if i + 1 < len(token) and ROMAN_VALUES[token[i + 1]] > value else value
+        return total
+    parts = re.split(r'[- ]', token)
+    if all(p in NUMBER_WORDS for p in parts):
+        return sum(NUMBER_WORDS[p] for p in parts)
+    return None
+
+
+class Heuristic:
+    """A detection rule: may claim a paragraph as a header and may post-process chapters"""
+
+    def header(self, paragraph: Paragraph, match: Optional[re.Match]) -> Optional[Header]:
+        return None
+
+    def finish(self, chapters: Iterator[Dict]) -> Iterator[Dict]:
+        """Transform the chapter stream; must stay lazy so imports can write as they go"""
+        return chapters
+
+
+class NumberedHeadings(Heuristic):
+    """Numbered and named headers: Chapter 7: Title, Part Two, Prologue, 12., XII"""
+
+    def header(self, paragraph, match):
+        if match is None:
+            return None
+        group = match.group
+        if group('chapter'):
+            return Header('chapter', (group('chapter_title') or '').strip(), parse_number(group('chapter_number')))
+        if group('part'):
+            plain = group('part_title_plain')
+            if plain is not None and not _is_title(plain):
+                return None
+            title = group('part_title') if plain is None else plain
+            return Header('part', (title or '').strip() or paragraph.text.strip(),
+                          parse_number(group('part_number')))
+        if group('named'):
+            plain = group('named_title_plain')
+            if plain is not None and not _is_title(plain):
+                return None
+            return Header('named', paragraph.text.strip())
+        if group('numbered'):
+            return Header('numbered', (group('numbered_title') or '').strip(), int(group('numbered')))
+        if group('bare_number'):
+            return Header('numbered', '', int(group('bare_number')), needs_run=True)
+        if group('roman'):
+            return Header('numbered', '', parse_number(group('roman')), needs_run=True)
+        return None
+
+
+class StyledHeadings(Heuristic):
+    """Top-level heading styles from DOCX, ODT and EPUB"""
+
+    def __init__(self, max_level: int = 1):
+        self.max_level = max_level
+
+    def header(self, paragraph, match):
+        if 0 < paragraph.level <= self.max_level:
+            return Header('heading', paragraph.text.strip())
+        return None
+
+
+class SceneBreaks(Heuristic):
+    """Separators such as * * *, ### and ---; they split scenes, not chapters"""
+
+    def header(self, paragraph, match):
+        if match is not None and match.group('scene_break'):
+            return Header('scene_break')
+        return None
+
+
+class MinimumLength(Heuristic):
+    """Fold chapters shorter than min_words into the next one (tables of contents, stray headers)"""
+
+    def __init__(self, min_words: int = 1):
+        self.min_words = min_words
+
+    def _too_short(self, content: str) -> bool:
+        if self.min_words <= 1:
+            return not content.strip()
+        return len(content.split()) < self.min_words
+
+    def finish(self, chapters):
+        first = None
+        previous = None
+        carry = []
+        for chapter in chapters:
+            if first is None:
+                first = chapter
+            if carry:
+                chapter = {**chapter, 'content': '\n\n'.join(carry + [chapter['content']]).strip()}
+                carry = []
+            if self._too_short(chapter['content']):
+                if chapter['content'].strip():
+                    carry.append(chapter['content'])
+                continue
+            if previous is not None:
+                yield previous
+            previous = chapter
+
+        if previous is None:
+            # Nothing long enough: keep a single chapter rather than none
+            if first is not None:
+                yield {**first, 'content': '\n\n'.join(carry).strip() or first['content']}
+            return
+        if carry:
+            previous = {**previous, 'content': '\n\n'.join([previous['content']] + carry)}
+        yield previous
+
+
+def default_heuristics() -> List[Heuristic]:
+    return [NumberedHeadings(), StyledHeadings(), SceneBreaks(), MinimumLength()]
+
+
+class ChapterDetector:
+    """Split manuscripts into chapters with a single header pattern and a list of heuristics"""
+
+    def __init__(self, heuristics: Optional[Sequence[Heuristic]] = None):
+        self.heuristics = list(heuristics) if heuristics is not None else default_heuristics()
+
+    def classify(self, paragraph: Paragraph) -> Optional[Header]:
+        """Ask each heuristic in turn whether a paragraph is a header"""
+        text = paragraph.text
+        match = HEADER_RE.fullmatch(text) if len(text) <= MAX_HEADER_CHARS and '\n' not in text else None
+        for heuristic in self.heuristics:
+            header = heuristic.header(paragraph, match)
+            if header is not None:
+                return header
+        return None
+
+    def detect(self, paragraphs: Iterable[Paragraph], first_number: int = 1) -> List[Dict]:
+        """Chapters from a paragraph stream (DOCX, ODT, EPUB readers)"""
+        return list(self.iter_chapters(paragraphs, first_number))
+
+    def iter_chapters(self, paragraphs: Iterable[Paragraph], first_number: int = 1) -> Iterator[Dict]:
+        """Yield chapters as soon as the header of the next one is seen"""
+        return self._finish(self._build((p, self.classify(p)) for p in paragraphs), first_number)
+
+    def detect_text(self, text: str, first_number: int = 1) -> List[Dict]:
+        """Chapters from plain text; every non-empty line is a paragraph"""
+        return list(self.iter_text_chapters(text, first_number))
+
+    def iter_text_chapters(self, text: str, first_number: int = 1) -> Iterator[Dict]:
+        return self._finish(self._build(self._text_items(text)), first_number)
+
+    def detect_documents(self, documents: List[List[Paragraph]]) -> List[Dict]:
+        return list(self.iter_document_chapters(documents))
+
+    def iter_document_chapters(self, documents: List[List[Paragraph]]) -> Iterator[Dict]:
+        """Chapters from EPUB spine documents
+
+        Every document boundary is a chapter boundary, and chapter headers inside
+        a document split it further. Front matter documents before the first one
+        with a numbered or named header (or failing that, any heading) are dropped.
+        """
+        documents = [_promote_opening_heading(document) for document in documents if document]
+        classified = [[(p, self.classify(p)) for p in document] for document in documents]
+
+        def has(kinds_excluded):
+            return [any(h is not None and h.kind not in kinds_excluded for _, h in items) for items in classified]
+
+        has_header = has(('heading', 'scene_break'))
+        if not any(has_header):
+            has_header = has(('scene_break',))
+        if any(has_header):
+            classified = classified[has_header.index(True):]
+
+        chapters = (chapter for items in classified for chapter in self._build(items))
+        return self._finish(chapters, 1)
+
+    def _text_items(self, text: str) -> Iterator[Tuple[Paragraph, Optional[Header]]]:
+        for line in text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            paragraph = Paragraph(line)
+            # Only short lines can be headers; prose skips the pattern entirely
+            yield paragraph, self.classify(paragraph) if len(line) <= MAX_HEADER_CHARS else None
+
+    def _build(self, items: Iterable[Tuple[Paragraph, Optional[Header]]]) -> Iterator[Dict]:
+        """Group classified paragraphs into chapters; numbering is done by _finish
+
+        A lone roman numeral or number (needs_run) is kept as text until the
+        next one continues it (I then II, 7 then 8); then the first is split
+        out after the fact. So "I" or "C" alone in prose never starts a chapter.
+        """
+        title = None
+        content: List[str] = []
+        # Last number of a confirmed run, and an unconfirmed header: (content index, header)
+        run_number: Optional[int] = None
+        pending: Optional[Tuple[int, Header]] = None
+
+        def chapter(paragraphs):
+            paragraphs = list(paragraphs)
+            while paragraphs and paragraphs[-1] == SCENE_BREAK:
+                paragraphs.pop()
+            return {'chapter_number': 0, 'title': title, 'content': '\n\n'.join(paragraphs).strip()}
+
+        for paragraph, header in items:
+            if header is not None and header.needs_run:
+                if run_number is not None and header.number == run_number + 1:
+                    run_number = header.number
+                elif pending is not None and header.number == pending[1].number + 1:
+                    # The run is confirmed: the pending header started a chapter after all
+                    index, first = pending
+                    if title is not None:
+                        yield chapter(content[:index])
+                    title, content = first.title, content[index + 1:]
+                    pending = None
+                    run_number = header.number
+                else:
+                    pending = (len(content), header)
+                    content.append(paragraph.text)
+                    continue
+
+            if header is None:
+                content.append(paragraph.text)
+                continue
+            if header.kind == 'scene_break':
+                if content and content[-1] != SCENE_BREAK:
+                    content.append(SCENE_BREAK)
+                continue
+            if title is not None and not content and header.kind == 'heading':
+                # A heading right under a "Chapter N" line is that chapter's title
+                title = header.title or title
+                continue
+
+            if title is not None:
+                yield chapter(content)
+            title = header.title
+            content = []
+            pending = None
+
+        if title is not None or content:
+            # Text before the first header is only kept when there are no headers at all
+            yield chapter(content)
+        else:
+            yield {'chapter_number': 0, 'title': '', 'content': ''}
+
+    def _finish(self, chapters: Iterator[Dict], first_number: int) -> Iterator[Dict]:
+        for heuristic in self.heuristics:
+            chapters = heuristic.finish(chapters)
+        # Numbers are always sequential, whatever the headers said
+        for number, chapter in enumerate(chapters, first_number):
+            chapter['chapter_number'] = number
+            chapter['title'] = chapter['title'] or f"Chapter {number}"
+            yield chapter
+
+
+def _promote_opening_heading(document: List[Paragraph]) -> List[Paragraph]:
+    # EPUB chapter files often open with an h2/h3 title; treat it as the chapter heading
+    if document and document[0].level in (2, 3):
+        return [document[0]._replace(level=1)] + document[1:]
+    return document
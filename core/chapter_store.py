@@ -0,0 +1,279 @@
+"""
+Chapter text storage for hypeWriter
+Range reads over chapters/chapter_N.txt backed by a sidecar paragraph index
+"""
+
+import json
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+
+# Chapters at or above this size are read through mmap instead of a full read
+MMAP_THRESHOLD = 1024 * 1024
+
+# Upper bound (in characters) for chapter text kept in the shared LRU
+CACHE_MAX_CHARS = 32 * 1024 * 1024
+
+# Paragraphs are separated by one or more blank lines
+PARAGRAPH_BREAK = re.compile(rb'\n[ \t\r]*\n\s*')
+# The same rule for decoded text; whitespace stays ASCII-only to match the byte index
+PARAGRAPH_BREAK_TEXT = re.compile(r'\n[ \t\r]*\n[ \t\r\n\f\v]*')
+ASCII_WHITESPACE = ' \t\r\n\f\v'
+
+INDEX_DIR_NAME = ".index"
+INDEX_VERSION = 1
+
+
+class _TextCache:
+    """Bounded LRU of decoded chapter text, shared by every ChapterStore"""
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, mtime_ns: int, size: int) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != mtime_ns or entry[1] != size:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def put(self, key: str, mtime_ns: int, size: int, text: str):
+        if len(text) > self.max_chars:
+            return
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (mtime_ns, size, text)
+            self._size += len(text)
+            while self._size > self.max_chars and self._entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[2])
+
+
+_text_cache = _TextCache(CACHE_MAX_CHARS)
+
+
+def invalidate_cached_chapter(path: Union[str, Path]):
+    """Drop a chapter file from the shared text cache"""
+    _text_cache.invalidate(str(Path(path).resolve()))
+
+
+class ChapterStore:
+    """Read and write chapter_N.txt files in a chapters directory"""
+
+    def __init__(self, chapters_dir: Union[str, Path], mmap_threshold: int = MMAP_THRESHOLD):
+        self.chapters_dir = Path(chapters_dir)
+        self.mmap_threshold = mmap_threshold
+
+    def chapter_path(self, chapter_number: int) -> Path:
+        """Get the path of a chapter text file"""
+        return self.chapters_dir / f"chapter_{chapter_number}.txt"
+
+    def index_path(self, chapter_number: int) -> Path:
+        """Get the path of a chapter's sidecar paragraph index"""
+        return self.chapters_dir / INDEX_DIR_NAME / f"chapter_{chapter_number}.json"
+
+    def exists(self, chapter_number: int) -> bool:
+        return self.chapter_path(chapter_number).is_file()
+
+    def read(self, chapter_number: int) -> str:
+        """Read the full text of a chapter, served from the shared LRU when hot"""
+        path = self.chapter_path(chapter_number)
+        stat = path.stat()
+        key = str(path.resolve())
+
+        cached = _text_cache.get(key, stat.st_mtime_ns, stat.st_size)
+        if cached is not None:
+            return cached
+
+        with open(path, 'rb') as f:
+            if stat.st_size >= self.mmap_threshold:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    data = mm[:]
+            else:
+                data = f.read()
+        text = _decode(data)
+
+        _text_cache.put(key, stat.st_mtime_ns, stat.st_size, text)
+        return text
+
+    def write(self, chapter_number: int, content: str):
+        """Write chapter text and rebuild its paragraph index"""
+        self.chapters_dir.mkdir(parents=True, exist_ok=True)
+        path = self.chapter_path(chapter_number)
+        data = content.encode('utf-8')
+
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        stat = path.stat()
+        _text_cache.put(str(path.resolve()), stat.st_mtime_ns, stat.st_size, content)
+        self._save_index(chapter_number, self._build_index(data, stat))
+
+    def delete(self, chapter_number: int):
+        """Remove a chapter and its index"""
+        path = self.chapter_path(chapter_number)
+        invalidate_cached_chapter(path)
+        for p in (path, self.index_path(chapter_number)):
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+
+    def index(self, chapter_number: int) -> Dict:
+        """Get the paragraph byte-offset index, rebuilding it if the text changed"""
+        path = self.chapter_path(chapter_number)
+        stat = path.stat()
+
+        index = self._load_index(chapter_number)
+        if index and index.get('size') == stat.st_size and index.get('mtime_ns') == stat.st_mtime_ns:
+            return index
+
+        with open(path, 'rb') as f:
+            if stat.st_size >= self.mmap_threshold:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    index = self._build_index(mm, stat)
+            else:
+                index = self._build_index(f.read(), stat)
+
+        self._save_index(chapter_number, index)
+        return index
+
+    def paragraph_count(self, chapter_number: int) -> int:
+        return len(self.index(chapter_number)['paragraphs'])
+
+    def paragraphs(self, chapter_number: int, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """Read paragraphs [start, end) without decoding the rest of the chapter"""
+        offsets = self.index(chapter_number)['paragraphs'][start:end]
+        if not offsets:
+            return []
+
+        path = self.chapter_path(chapter_number)
+        first, last = offsets[0][0], offsets[-1][1]
+        with open(path, 'rb') as f:
+            if last - first >= self.mmap_threshold:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return [_decode(mm[s:e]) for s, e in offsets]
+            f.seek(first)
+            span = f.read(last - first)
+        return [_decode(span[s - first:e - first]) for s, e in offsets]
+
+    def tail(self, chapter_number: int, n_chars: int) -> str:
+        """Read the last n_chars characters of a chapter"""
+        if n_chars <= 0:
+            return ""
+
+        path = self.chapter_path(chapter_number)
+        mtime_ns, size = self._stat_key(path)
+        cached = _text_cache.get(str(path.resolve()), mtime_ns, size)
+        if cached is not None:
+            return cached[-n_chars:]
+
+        # UTF-8 needs at most 4 bytes per character
+        start = max(0, size - n_chars * 4)
+        with open(path, 'rb') as f:
+            f.seek(start)
+            data = f.read()
+
+        # Skip continuation bytes of a character cut by the seek
+        skip = 0
+        if start > 0:
+            while skip < len(data) and (data[skip] & 0xC0) == 0x80:
+                skip += 1
+        return _decode(data[skip:])[-n_chars:]
+
+    def _stat_key(self, path: Path) -> Tuple[int, int]:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _build_index(self, data, stat: os.stat_result) -> Dict:
+        """Scan text bytes once for paragraph boundaries"""
+        paragraphs = []
+        pos = 0
+        size = len(data)
+
+        for match in PARAGRAPH_BREAK.finditer(data):
+            end = match.start()
+            if data[pos:end].strip():
+                paragraphs.append(_trim(data, pos, end))
+            pos = match.end()
+        if pos < size and data[pos:size].strip():
+            paragraphs.append(_trim(data, pos, size))
+
+        return {
+            'version': INDEX_VERSION,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'paragraphs': paragraphs,
+        }
+
+    def _load_index(self, chapter_number: int) -> Optional[Dict]:
+        try:
+            with open(self.index_path(chapter_number), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if index.get('version') != INDEX_VERSION:
+            return None
+        return index
+
+    def _save_index(self, chapter_number: int, index: Dict):
+        index_path = self.index_path(chapter_number)
+        try:
+            index_path.parent.mkdir(exist_ok=True)
+            with open(index_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f, separators=(',', ':'))
+        except OSError as e:
+            # The index is only an accelerator; a read-only library still works
+            print(f"Warning: Could not write chapter index {index_path}: {e}")
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Split decoded text into paragraphs numbered the same way as the chapter index"""
+    paragraphs = []
+    for part in PARAGRAPH_BREAK_TEXT.split(text):
+        part = part.strip(ASCII_WHITESPACE)
+        if part:
+            paragraphs.append(part)
+    return paragraphs
+
+
+def _trim(data, start: int, end: int) -> List[int]:
+    """Narrow a byte span to exclude surrounding whitespace"""
+    while start < end and data[start:start + 1].isspace():
+        start += 1
+    while end > start and data[end - 1:end].isspace():
+        end -= 1
+    return [start, end]
+
+
+def _decode(data: bytes) -> str:
+    # Match text-mode reads, which translate Windows line endings
+    return bytes(data).decode('utf-8', errors='replace').replace('\r\n', '\n')
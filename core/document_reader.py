@@ -0,0 +1,664 @@
+"""
+Streaming document readers for hypeWriter imports
+Yield manuscript paragraphs one at a time so peak memory stays flat
+"""
+
+import codecs
+import mmap
+import multiprocessing
+import os
+import posixpath
+import re
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import Counter
+from html.parser import HTMLParser
+from itertools import chain, islice
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+
+class Paragraph(NamedTuple):
+    text: str
+    style: str = ""             # style name as shown in the word processor, e.g. "Heading 1"
+    level: int = 0              # outline level of headings (1 = top), 0 for body text
+    break_before: bool = False  # starts on a new page
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_W = '{%s}' % W_NS
+
+W_P = _W + 'p'
+W_T = _W + 't'
+W_TAB = _W + 'tab'
+W_BR = _W + 'br'
+W_CR = _W + 'cr'
+W_NO_BREAK_HYPHEN = _W + 'noBreakHyphen'
+W_P_STYLE = _W + 'pStyle'
+W_OUTLINE_LVL = _W + 'outlineLvl'
+W_PAGE_BREAK_BEFORE = _W + 'pageBreakBefore'
+W_BODY = _W + 'body'
+W_VAL = _W + 'val'
+W_TYPE = _W + 'type'
+
+# Content that is not part of the current manuscript text
+W_SKIPPED = {_W + 'moveFrom', _W + 'del', _W + 'instrText', _W + 'delInstrText'}
+
+HEADING_STYLE_RE = re.compile(r'^heading\s*(\d)$', re.IGNORECASE)
+
+
+def _outline_level(value: str) -> int:
+    # Word stores levels 0-8; 9 means body text
+    level = int(value)
+    return level + 1 if level < 9 else 0
+
+
+def _docx_styles(archive: zipfile.ZipFile) -> Dict[str, Tuple[str, int]]:
+    """Map style ids to (name, outline level) from word/styles.xml"""
+    styles = {}
+    try:
+        data = archive.read('word/styles.xml')
+    except KeyError:
+        return styles
+
+    root = ET.fromstring(data)
+    for style in root.iter(_W + 'style'):
+        style_id = style.get(_W + 'styleId', '')
+        name_el = style.find(_W + 'name')
+        name = name_el.get(W_VAL, style_id) if name_el is not None else style_id
+        level = 0
+        outline = style.find(f'{_W}pPr/{W_OUTLINE_LVL}')
+        if outline is not None and outline.get(W_VAL, '').isdigit():
+            level = _outline_level(outline.get(W_VAL))
+        else:
+            match = HEADING_STYLE_RE.match(name)
+            if match:
+                level = int(match.group(1))
+        styles[style_id] = (name, level)
+    return styles
+
+
+def iter_docx_paragraphs(file_path: str) -> Iterator[Paragraph]:
+    """Stream non-empty paragraphs from word/document.xml with an incremental parser.
+
+    Deleted and moved-away tracked changes are skipped, inserted text is kept.
+    Parsed elements are discarded as soon as their paragraph is emitted, so
+    memory use does not grow with the length of the manuscript.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        styles = _docx_styles(archive)
+
+        with archive.open('word/document.xml') as xml_file:
+            body = None
+            depth = 0
+            skip_depth = 0
+            # Text boxes can nest paragraphs inside paragraphs
+            stack = []
+
+            for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    depth += 1
+                    if tag in W_SKIPPED:
+                        skip_depth += 1
+                    elif tag == W_P:
+                        stack.append([[], "", 0, False])
+                    elif tag == W_BODY:
+                        body = elem
+                    continue
+
+                depth -= 1
+                if tag in W_SKIPPED:
+                    skip_depth -= 1
+                elif stack and not skip_depth:
+                    current = stack[-1]
+                    if tag == W_T:
+                        if elem.text:
+                            current[0].append(elem.text)
+                    elif tag == W_TAB:
+                        current[0].append('\t')
+                    elif tag == W_BR:
+                        if elem.get(W_TYPE) == 'page':
+                            current[3] = current[3] or not current[0]
+                        else:
+                            current[0].append('\n')
+                    elif tag == W_CR:
+                        current[0].append('\n')
+                    elif tag == W_NO_BREAK_HYPHEN:
+                        current[0].append('-')
+                    elif tag == W_P_STYLE:
+                        current[1], current[2] = styles.get(elem.get(W_VAL, ''), (elem.get(W_VAL, ''), 0))
+                    elif tag == W_OUTLINE_LVL and elem.get(W_VAL, '').isdigit():
+                        current[2] = _outline_level(elem.get(W_VAL))
+                    elif tag == W_PAGE_BREAK_BEFORE and elem.get(W_VAL, 'true') not in ('0', 'false'):
+                        current[3] = True
+
+                if tag == W_P and stack:
+                    parts, style, level, break_before = stack.pop()
+                    text = ''.join(parts).strip()
+                    if text:
+                        yield Paragraph(text, style, level, break_before)
+                    elem.clear()
+
+                # Drop finished top-level blocks so the tree never accumulates
+                if depth == 2 and body is not None:
+                    body.clear()
+
+
+TEXT_NS = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+STYLE_NS = '{urn:oasis:names:tc:opendocument:xmlns:style:1.0}'
+OFFICE_NS = '{urn:oasis:names:tc:opendocument:xmlns:office:1.0}'
+FO_NS = '{urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0}'
+
+ODF_P = TEXT_NS + 'p'
+ODF_H = TEXT_NS + 'h'
+ODF_S = TEXT_NS + 's'
+ODF_TAB = TEXT_NS + 'tab'
+ODF_LINE_BREAK = TEXT_NS + 'line-break'
+ODF_OFFICE_TEXT = OFFICE_NS + 'text'
+ODF_STYLE = STYLE_NS + 'style'
+ODF_PARAGRAPH_PROPERTIES = STYLE_NS + 'paragraph-properties'
+
+# Footnotes, comments and the record of tracked changes are not manuscript text
+ODF_SKIPPED = {TEXT_NS + 'note', OFFICE_NS + 'annotation', TEXT_NS + 'tracked-changes'}
+
+
+class _OdfStyle(NamedTuple):
+    display_name: str
+    parent: str
+    outline_level: int
+    break_before: bool
+
+
+def _odf_style(elem: ET.Element) -> Tuple[str, _OdfStyle]:
+    name = elem.get(STYLE_NS + 'name', '')
+    level = elem.get(STYLE_NS + 'default-outline-level', '')
+    props = elem.find(ODF_PARAGRAPH_PROPERTIES)
+    break_before = props is not None and props.get(FO_NS + 'break-before') == 'page'
+    return name, _OdfStyle(
+        elem.get(STYLE_NS + 'display-name', name.replace('_20_', ' ')),
+        elem.get(STYLE_NS + 'parent-style-name', ''),
+        int(level) if level.isdigit() else 0,
+        break_before,
+    )
+
+
+def _odf_named_styles(archive: zipfile.ZipFile) -> Dict[str, _OdfStyle]:
+    """Paragraph styles from styles.xml (headings, chapter styles, page breaks)"""
+    try:
+        data = archive.read('styles.xml')
+    except KeyError:
+        return {}
+    root = ET.fromstring(data)
+    return dict(_odf_style(elem) for elem in root.iter(ODF_STYLE) if elem.get(STYLE_NS + 'family') == 'paragraph')
+
+
+def _resolve_odf_style(styles: Dict[str, _OdfStyle], name: str) -> Tuple[str, int, bool]:
+    """(display name, outline level, page break before), following parent styles"""
+    display, level, break_before = '', 0, False
+    seen = set()
+    while name and name not in seen and name in styles:
+        seen.add(name)
+        style = styles[name]
+        # Automatic styles ("P1") are anonymous; show the named style they derive from
+        if not display and not name[1:].isdigit():
+            display = style.display_name
+        level = level or style.outline_level
+        break_before = break_before or style.break_before
+        name = style.parent
+    return display, level, break_before
+
+
+def _odf_text(elem: ET.Element, parts: List[str]):
+    if elem.text:
+        parts.append(elem.text)
+    for child in elem:
+        tag = child.tag
+        if tag in ODF_SKIPPED:
+            pass
+        elif tag == ODF_S:
+            count = child.get(TEXT_NS + 'c', '1')
+            parts.append(' ' * (int(count) if count.isdigit() else 1))
+        elif tag == ODF_TAB:
+            parts.append('\t')
+        elif tag == ODF_LINE_BREAK:
+            parts.append('\n')
+        else:
+            _odf_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def iter_odt_paragraphs(file_path: str) -> Iterator[Paragraph]:
+    """Stream non-empty headings and paragraphs from content.xml in document order
+
+    One incremental pass; each paragraph is emitted at its closing tag and the
+    finished top-level blocks are discarded, so memory stays flat.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        styles = _odf_named_styles(archive)
+
+        with archive.open('content.xml') as xml_file:
+            office_text = None
+            depth = 0
+            text_depth = 0
+            # Paragraphs inside paragraphs (text boxes) or skipped content are read with their container
+            inner = 0
+
+            for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    depth += 1
+                    if tag in (ODF_P, ODF_H) or tag in ODF_SKIPPED:
+                        inner += 1
+                    elif tag == ODF_OFFICE_TEXT:
+                        office_text, text_depth = elem, depth
+                    continue
+
+                depth -= 1
+                if tag == ODF_STYLE and office_text is None:
+                    # Automatic styles precede the body and may derive from named ones
+                    if elem.get(STYLE_NS + 'family') == 'paragraph':
+                        name, style = _odf_style(elem)
+                        styles[name] = style
+                    continue
+
+                if tag in (ODF_P, ODF_H) or tag in ODF_SKIPPED:
+                    inner -= 1
+                    if tag in ODF_SKIPPED or inner:
+                        continue
+                    parts: List[str] = []
+                    _odf_text(elem, parts)
+                    text = ''.join(parts).strip()
+                    if text:
+                        style, level, break_before = _resolve_odf_style(styles, elem.get(TEXT_NS + 'style-name', ''))
+                        if tag == ODF_H:
+                            outline = elem.get(TEXT_NS + 'outline-level', '1')
+                            level = int(outline) if outline.isdigit() else 1
+                        yield Paragraph(text, style, level, break_before)
+                    elem.clear()
+
+                # Drop finished top-level blocks so the tree never accumulates
+                if office_text is not None and depth == text_depth:
+                    office_text.clear()
+
+
+OPF_NS = '{http://www.idpf.org/2007/opf}'
+DC_NS = '{http://purl.org/dc/elements/1.1/}'
+CONTAINER_NS = '{urn:oasis:names:tc:opendocument:xmlns:container}'
+
+HTML_MEDIA_TYPES = {'application/xhtml+xml', 'text/html', 'application/x-dtbook+xml'}
+
+BLOCK_TAGS = {
+    'p', 'div', 'li', 'blockquote', 'pre', 'tr', 'td', 'th', 'dt', 'dd', 'ul', 'ol', 'table',
+    'section', 'article', 'header', 'footer', 'aside', 'figure', 'figcaption', 'body', 'hr',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+}
+HEADING_TAGS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+# Never part of the reading text (the nav element is the EPUB 3 table of contents)
+SKIPPED_HTML_TAGS = {'head', 'script', 'style', 'nav'}
+
+# Stands in for <br> until whitespace is collapsed
+_LINE_BREAK = '\x00'
+
+
+class EpubBook(NamedTuple):
+    title: str
+    author: str
+    documents: List[List[Paragraph]]  # one paragraph list per spine document, in reading order
+
+    @property
+    def paragraphs(self) -> Iterator[Paragraph]:
+        for document in self.documents:
+            yield from document
+
+    @property
+    def text(self) -> str:
+        return '\n\n'.join(paragraph.text for paragraph in self.paragraphs)
+
+
+class _BlockCollector:
+    """Parser target that turns HTML block elements into paragraphs.
+
+    Works as an lxml parser target and behind the stdlib HTMLParser fallback.
+    """
+
+    def __init__(self):
+        self.paragraphs: List[Paragraph] = []
+        self._parts: List[str] = []
+        self._level = 0
+        self._skip = 0
+
+    def start(self, tag, attrib=None):
+        tag = _local_name(tag)
+        if tag in SKIPPED_HTML_TAGS:
+            self._skip += 1
+        elif tag == 'br':
+            self._parts.append(_LINE_BREAK)
+        elif tag in BLOCK_TAGS:
+            self._flush()
+            self._level = HEADING_TAGS.get(tag, self._level)
+
+    def end(self, tag):
+        tag = _local_name(tag)
+        if tag in SKIPPED_HTML_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in BLOCK_TAGS:
+            self._flush()
+            if tag in HEADING_TAGS:
+                self._level = 0
+
+    def data(self, data):
+        if not self._skip:
+            self._parts.append(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self) -> List[Paragraph]:
+        self._flush()
+        return self.paragraphs
+
+    def _flush(self):
+        if not self._parts:
+            return
+        lines = (' '.join(line.split()) for line in ''.join(self._parts).split(_LINE_BREAK))
+        text = '\n'.join(line for line in lines if line)
+        self._parts = []
+        if text:
+            self.paragraphs.append(Paragraph(text, "", self._level, not self.paragraphs))
+
+
+class _StdlibHTMLDriver(HTMLParser):
+    """Feed html.parser events into a _BlockCollector when lxml is not installed"""
+
+    def __init__(self, collector: _BlockCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.collector.start(tag)
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+def _local_name(tag) -> str:
+    if not isinstance(tag, str):
+        return ''
+    return tag.rsplit('}', 1)[-1].rsplit(':', 1)[-1].lower()
+
+
+def html_paragraphs(data: bytes) -> List[Paragraph]:
+    """Extract block-level paragraphs (with heading levels) from an XHTML document"""
+    collector = _BlockCollector()
+    if lxml_etree is not None:
+        parser = lxml_etree.HTMLParser(target=collector, encoding='utf-8')
+        try:
+            return lxml_etree.fromstring(data, parser) or []
+        except lxml_etree.XMLSyntaxError:
+            # Nothing parseable (e.g. an empty document)
+            return collector.close()
+
+    driver = _StdlibHTMLDriver(collector)
+    driver.feed(data.decode('utf-8', errors='replace'))
+    driver.close()
+    return collector.close()
+
+
+def _epub_rootfile(archive: zipfile.ZipFile) -> str:
+    """Locate the OPF package document"""
+    try:
+        container = ET.fromstring(archive.read('META-INF/container.xml'))
+        rootfile = container.find(f'.//{CONTAINER_NS}rootfile')
+        if rootfile is not None and rootfile.get('full-path'):
+            return rootfile.get('full-path')
+    except KeyError:
+        pass
+    for name in archive.namelist():
+        if name.endswith('.opf'):
+            return name
+    raise ValueError("No OPF package document found in EPUB")
+
+
+def _first_text(root: ET.Element, path: str) -> str:
+    element = root.find(path)
+    return (element.text or '').strip() if element is not None else ''
+
+
+def read_epub(file_path: str, workers: Optional[int] = None) -> EpubBook:
+    """Open an EPUB once and read metadata plus every spine document in reading order
+
+    Large books have their documents extracted across a process pool (see
+    extract_html_documents); workers=1 forces the sequential path.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        rootfile = _epub_rootfile(archive)
+        package = ET.fromstring(archive.read(rootfile))
+        base = posixpath.dirname(rootfile)
+
+        title = _first_text(package, f'{OPF_NS}metadata/{DC_NS}title')
+        author = _first_text(package, f'{OPF_NS}metadata/{DC_NS}creator')
+
+        manifest = {
+            item.get('id'): (item.get('href', ''), item.get('media-type', ''))
+            for item in package.iterfind(f'{OPF_NS}manifest/{OPF_NS}item')
+        }
+
+        contents = []
+        for itemref in package.iterfind(f'{OPF_NS}spine/{OPF_NS}itemref'):
+            href, media_type = manifest.get(itemref.get('idref'), ('', ''))
+            if not href or media_type not in HTML_MEDIA_TYPES:
+                continue
+            path = posixpath.normpath(posixpath.join(base, unquote(href.split('#', 1)[0])))
+            try:
+                contents.append(archive.read(path))
+            except KeyError:
+                print(f"Warning: EPUB spine item missing from archive: {path}")
+
+    return EpubBook(title, author, extract_html_documents(contents, workers))
+
+
+# Smaller books are extracted on the calling thread; starting workers would cost more
+EPUB_PARALLEL_MIN_BYTES = 2 * 1024 * 1024
+EPUB_PARALLEL_MIN_DOCUMENTS = 8
+
+_html_pool: Optional[ProcessPoolExecutor] = None
+_html_pool_lock = threading.Lock()
+
+
+def _spawn_context():
+    # Forking the threaded server could leave a worker stuck on a lock held by another thread
+    return multiprocessing.get_context("spawn")
+
+
+def _shared_html_pool() -> ProcessPoolExecutor:
+    global _html_pool
+    with _html_pool_lock:
+        if _html_pool is None:
+            _html_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_spawn_context())
+        return _html_pool
+
+
+def _reset_html_pool():
+    global _html_pool
+    with _html_pool_lock:
+        _html_pool = None
+
+
+def extract_html_documents(contents: List[bytes], workers: Optional[int] = None) -> List[List[Paragraph]]:
+    """html_paragraphs for each document, in the given order
+
+    With workers=None a shared process pool is used for large books on
+    multi-core machines, except inside worker processes (e.g. batch import).
+    """
+    if workers is None:
+        parallel = (
+            (os.cpu_count() or 1) > 1
+            and len(contents) >= EPUB_PARALLEL_MIN_DOCUMENTS
+            and sum(len(data) for data in contents) >= EPUB_PARALLEL_MIN_BYTES
+            and multiprocessing.parent_process() is None
+        )
+    else:
+        parallel = workers > 1
+    if not parallel:
+        return [html_paragraphs(data) for data in contents]
+
+    # A few chunks per worker keeps them busy without a round trip per document
+    chunksize = max(1, len(contents) // ((workers or os.cpu_count() or 1) * 4))
+    if workers is not None:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_spawn_context()) as pool:
+            return list(pool.map(html_paragraphs, contents, chunksize=chunksize))
+    try:
+        return list(_shared_html_pool().map(html_paragraphs, contents, chunksize=chunksize))
+    except BrokenProcessPool:
+        print("Warning: EPUB worker pool failed, extracting sequentially")
+        _reset_html_pool()
+        return [html_paragraphs(data) for data in contents]
+
+
+# --- Plain text and Markdown ---
+
+TEXT_READ_BYTES = 1024 * 1024
+TEXT_SNIFF_BYTES = 64 * 1024
+# Lines looked at to decide between one-paragraph-per-line and blank-line-separated text
+TEXT_SNIFF_LINES = 2000
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+MD_ATX_RE = re.compile(r'^(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$')
+_MD_ATX_BYTES_RE = re.compile(rb'^(#{1,6})[ \t]', re.MULTILINE)
+_MD_SETEXT_RE = re.compile(r'^(=+|-+)[ \t]*$')
+
+
+def sniff_encoding(prefix: bytes) -> Tuple[str, int]:
+    """(encoding, BOM length) guessed from the first bytes of a text file"""
+    for bom, encoding in _BOMS:
+        if prefix.startswith(bom):
+            return encoding, len(bom)
+
+    # UTF-16 without a BOM: ASCII text leaves every other byte zero
+    half = len(prefix) // 2
+    if half:
+        even_zeros, odd_zeros = prefix[0::2].count(0), prefix[1::2].count(0)
+        if odd_zeros > half * 0.3 and even_zeros < half * 0.05:
+            return 'utf-16-le', 0
+        if even_zeros > half * 0.3 and odd_zeros < half * 0.05:
+            return 'utf-16-be', 0
+
+    try:
+        # Not final: the prefix may end inside a multi-byte character
+        codecs.getincrementaldecoder('utf-8')().decode(prefix, final=False)
+        return 'utf-8', 0
+    except UnicodeDecodeError:
+        return 'cp1252', 0
+
+
+def iter_text_paragraphs(file_path: str, markdown: bool = False) -> Iterator[Paragraph]:
+    """Stream paragraphs from a .txt or .md file through a memory map
+
+    The file is decoded TEXT_READ_BYTES at a time, so no full-size copy of it is
+    ever made. Text with blank lines between paragraphs is split on them;
+    otherwise every line is a paragraph. Markdown headings become heading
+    paragraphs, with the most common repeated level treated as chapters.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            encoding, start = sniff_encoding(data[:TEXT_SNIFF_BYTES])
+            chapter_level = _markdown_chapter_level(data, encoding) if markdown else 1
+            yield from _text_blocks(_decoded_lines(data, encoding, start), markdown, chapter_level)
+
+
+def _decoded_lines(data, encoding: str, start: int) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    prefix = data[start:start + TEXT_SNIFF_BYTES]
+    # Classic Mac files end lines with a bare CR
+    newline = '\r' if b'\n' not in prefix and b'\r' in prefix and encoding in ('utf-8', 'cp1252') else '\n'
+
+    pending = ''
+    size = len(data)
+    for offset in range(start, size, TEXT_READ_BYTES):
+        end = min(offset + TEXT_READ_BYTES, size)
+        pending += decoder.decode(data[offset:end], final=end == size)
+        lines = pending.split(newline)
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip('\r')
+    if pending:
+        yield pending.rstrip('\r')
+
+
+def _markdown_chapter_level(data, encoding: str) -> int:
+    """Heading level used for chapters: the highest level that occurs more than once"""
+    if encoding not in ('utf-8', 'cp1252'):
+        return 1
+    # Scanning the map directly costs one pass and no decoded copy
+    counts = Counter(len(match.group(1)) for match in _MD_ATX_BYTES_RE.finditer(data))
+    repeated = [level for level, count in counts.items() if count > 1]
+    if repeated:
+        return min(repeated)
+    return min(counts) if counts else 1
+
+
+def _text_blocks(lines: Iterable[str], markdown: bool, chapter_level: int) -> Iterator[Paragraph]:
+    lines = iter(lines)
+    opening = list(islice(lines, TEXT_SNIFF_LINES))
+    blank = sum(1 for line in opening if not line.strip())
+    line_mode = not markdown and blank * 10 < len(opening) - blank
+
+    def heading(text: str, level: int) -> Paragraph:
+        # Levels above the chapter level (a book title) are plain text
+        relative = level - chapter_level + 1
+        return Paragraph(text, f"Heading {level}", relative if relative > 0 else 0)
+
+    block: List[str] = []
+    for line in chain(opening, lines):
+        stripped = line.strip()
+        if line_mode:
+            if stripped:
+                yield Paragraph(stripped)
+            continue
+        if not stripped:
+            if block:
+                yield Paragraph('\n'.join(block))
+                block = []
+            continue
+        if markdown:
+            match = MD_ATX_RE.match(stripped)
+            if match:
+                if block:
+                    yield Paragraph('\n'.join(block))
+                    block = []
+                yield heading(match.group(2), len(match.group(1)))
+                continue
+            setext = _MD_SETEXT_RE.match(stripped)
+            if setext and len(block) == 1:
+                yield heading(block[0].strip(), 1 if setext.group(1)[0] == '=' else 2)
+                block = []
+                continue
+        block.append(line.rstrip())
+    if block:
+        yield Paragraph('\n'.join(block))
@@ -0,0 +1,138 @@
+"""
+Tracked import jobs for hypeWriter
+An import runs on a worker thread and records progress events that clients
+follow over SSE (/api/import/jobs/{job_id}/events), replaying from any point.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from .parse_cache import ParseCache
+
+
+# Imports running at once; further jobs wait in the queue
+MAX_RUNNING_JOBS = 2
+# Finished jobs kept for late subscribers
+MAX_FINISHED_JOBS = 50
+
+TERMINAL_EVENTS = ('done', 'failed')
+
+_executor = ThreadPoolExecutor(max_workers=MAX_RUNNING_JOBS, thread_name_prefix="import-job")
+_jobs: Dict[str, "ImportJob"] = {}
+_jobs_lock = threading.Lock()
+
+
+class ImportJob:
+    """Status and event log of one import; events are numbered from 1"""
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = 'queued'
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.events: List[Dict] = []
+        self._subscribers: List[Callable[[Dict], None]] = []
+        self._lock = threading.Lock()
+
+    def emit(self, event_type: str, **fields):
+        """Record an event and pass it to every subscriber; safe from any thread"""
+        with self._lock:
+            event = {'id': len(self.events) + 1, 'type': event_type, 'time': time.time(), **fields}
+            self.events.append(event)
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(event)
+
+    def subscribe(self, callback: Callable[[Dict], None], after: int = 0) -> Callable[[], None]:
+        """Replay events after the given id, then deliver new ones; returns an unsubscribe function"""
+        with self._lock:
+            backlog = self.events[after:]
+            self._subscribers.append(callback)
+        for event in backlog:
+            callback(event)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            last = self.events[-1] if self.events else None
+            count = len(self.events)
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'created': self.created,
+            'finished': self.finished,
+            'event_count': count,
+            'last_event': last,
+            'result': self.result,
+            'error': self.error,
+        }
+
+
+def get_job(job_id: str) -> Optional[ImportJob]:
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def start_job(kind: str, run: Callable[[ImportJob], Dict]) -> ImportJob:
+    """Queue run(job) on the import workers; its return value becomes the 'done' event's result"""
+    job = ImportJob(kind)
+    with _jobs_lock:
+        _prune_finished()
+        _jobs[job.id] = job
+    job.emit('queued')
+
+    def execute():
+        job.status = 'running'
+        job.emit('started')
+        try:
+            result = run(job)
+        except Exception as e:
+            print(f"Import job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = 'failed'
+            job.finished = time.time()
+            job.emit('failed', error=str(e))
+            return
+        job.result = result
+        job.status = 'done'
+        job.finished = time.time()
+        job.emit('done', result=result)
+
+    _executor.submit(execute)
+    return job
+
+
+def start_novel_import(pm, file_path: str, **import_options) -> ImportJob:
+    """Run ProjectManager.import_novel as a job
+
+    The document is parsed (into the parse cache) before any project is created,
+    so the chapter count is known and each written chapter reports k of N.
+    """
+    def run(job: ImportJob) -> Dict:
+        document = ParseCache(str(pm.base_path)).open(file_path)
+        job.emit('parsed', file=file_path, title=document.title, author=document.author)
+        chapter_total = sum(1 for _ in document.chapters)
+        job.emit('chapters_detected', chapter_count=chapter_total)
+
+        project = pm.import_novel(file_path, progress=job.emit, chapter_total=chapter_total, **import_options)
+        return {'project': project.dict()}
+
+    return start_job('import_novel', run)
+
+
+def _prune_finished():
+    finished = sorted((job for job in _jobs.values() if job.finished), key=lambda job: job.finished)
+    for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        del _jobs[job.id]
@@ -0,0 +1,77 @@
+"""
+Streaming import pipeline for hypeWriter
+parse -> detect -> write chapter file -> update stats, as chained generators,
+so only the chapter in flight (plus a bounded analysis sample) is in memory
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .chapter_store import ChapterStore
+
+
+class ImportedChapter(NamedTuple):
+    chapter_number: int
+    title: str
+    word_count: int
+
+
+class AnalysisSample:
+    """The slice of a book ImportAnalyzer looks at, collected while chapters stream by
+
+    Keeps the first max_chars of text plus the opening outline_chars of the first
+    outline_chapters chapters, which is everything the analysis prompts use.
+    """
+
+    def __init__(self, max_chars: int = 50000, outline_chapters: int = 20, outline_chars: int = 2000):
+        self.max_chars = max_chars
+        self.outline_chapters = outline_chapters
+        self.outline_chars = outline_chars
+        self.chapters: List[Dict] = []
+        self._chars = 0
+
+    def collect(self, chapters: Iterable[Dict]) -> Iterator[Dict]:
+        """Pass chapters through, keeping the sampled part of each"""
+        for chapter in chapters:
+            self.add(chapter)
+            yield chapter
+
+    def add(self, chapter: Dict):
+        remaining = self.max_chars - self._chars
+        if len(self.chapters) < self.outline_chapters:
+            keep = max(remaining, self.outline_chars)
+        elif remaining > 0:
+            keep = remaining
+        else:
+            return
+        content = chapter['content'][:keep]
+        self._chars += len(content) + 2
+        self.chapters.append({**chapter, 'content': content})
+
+
+def write_chapters(chapters: Iterable[Dict], chapter_store: ChapterStore,
+                   search_index=None) -> Iterator[ImportedChapter]:
+    """Write each chapter to disk as it arrives and yield its stats instead of its text"""
+    for chapter in chapters:
+        number = chapter['chapter_number']
+        content = chapter['content']
+        chapter_store.write(number, content)
+        if search_index is not None:
+            search_index.mark_changed(chapter_store.chapter_path(number))
+        yield ImportedChapter(number, chapter['title'], len(content.split()))
+
+
+def run_import(chapters: Iterable[Dict], chapter_store: ChapterStore, search_index=None,
+               sample: Optional[AnalysisSample] = None,
+               on_chapter: Optional[Callable[[ImportedChapter], None]] = None) -> List[ImportedChapter]:
+    """Drive the pipeline to completion; returns per-chapter stats
+
+    on_chapter is called after each chapter file is written.
+    """
+    if sample is not None:
+        chapters = sample.collect(chapters)
+    imported = []
+    for chapter in write_chapters(chapters, chapter_store, search_index):
+        imported.append(chapter)
+        if on_chapter is not None:
+            on_chapter(chapter)
+    return imported
@@ -0,0 +1,241 @@
+"""
+Whole-book summaries for hypeWriter import analysis
+Chapters are summarized in parallel batches (map) and the summaries are condensed
+until they fit one prompt (reduce). Chapter summaries are cached by content hash
+under library/imports/summaries, so re-imports only summarize changed chapters.
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+# Bump when the summary prompt changes, so old summaries are not reused
+SUMMARY_VERSION = 1
+
+SUMMARY_DIR_NAME = "summaries"
+MAX_ENTRIES = 5000
+
+# Characters of chapter text per summarization call
+BATCH_CHARS = 60000
+# Longer chapters are cut to this many characters before summarizing
+CHAPTER_CHARS = 60000
+# Combined summaries above this size are condensed again before analysis
+REDUCE_CHARS = 40000
+
+SUMMARY_AGENT = "memory_keeper"
+
+_CHAPTER_MARKER = re.compile(r'^=== CHAPTER (\d+)\b[^\n]*$', re.MULTILINE)
+
+
+class ChapterSummary(NamedTuple):
+    chapter_number: int
+    title: str
+    summary: str
+
+
+def content_digest(content: str) -> str:
+    """Cache key for a chapter's summary"""
+    return hashlib.sha256(f"{SUMMARY_VERSION}\0{content}".encode('utf-8')).hexdigest()
+
+
+class SummaryCache:
+    """One small JSON file per summarized chapter, named by content hash"""
+
+    def __init__(self, base_path: str = "library", max_entries: int = MAX_ENTRIES):
+        self.cache_dir = Path(base_path) / "imports" / SUMMARY_DIR_NAME
+        self.max_entries = max_entries
+
+    def get(self, digest: str) -> Optional[str]:
+        path = self.cache_dir / f"{digest}.json"
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                summary = json.load(f)['summary']
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Ignoring unreadable summary cache entry {path.name}: {e}")
+            return None
+        # Refresh mtime so pruning keeps recently used entries
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return summary
+
+    def put(self, digest: str, summary: str):
+        path = self.cache_dir / f"{digest}.json"
+        tmp_path = path.with_name(path.name + '.tmp')
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': SUMMARY_VERSION, 'summary': summary}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # The cache only saves model calls; analysis works without it
+            print(f"Warning: Could not write summary cache entry {path.name}: {e}")
+
+    def prune(self):
+        """Keep the most recently used entries"""
+        try:
+            entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.json')]
+        except FileNotFoundError:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in entries[self.max_entries:]:
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+class BookSummarizer:
+    """Map-reduce a whole book into a digest that fits a single analysis prompt
+
+    agents is anything with BookAgents.generate_content; calls run max_workers at a time.
+    """
+
+    def __init__(self, agents, cache: Optional[SummaryCache] = None, max_workers: int = 4,
+                 batch_chars: int = BATCH_CHARS, chapter_chars: int = CHAPTER_CHARS,
+                 reduce_chars: int = REDUCE_CHARS):
+        self.agents = agents
+        self.cache = cache
+        self.max_workers = max_workers
+        self.batch_chars = batch_chars
+        self.chapter_chars = chapter_chars
+        self.reduce_chars = reduce_chars
+
+    def summarize_book(self, chapters: Iterable[Dict], title: str) -> Tuple[str, List[ChapterSummary]]:
+        """Returns (digest, chapter summaries)"""
+        summaries = self.summarize_chapters(chapters, title)
+        return self.reduce(summaries, title), summaries
+
+    def summarize_chapters(self, chapters: Iterable[Dict], title: str) -> List[ChapterSummary]:
+        """Map step: one summary per chapter, from the cache or from batched model calls
+
+        chapters is consumed lazily; only the batches in flight hold chapter text.
+        """
+        results: Dict[int, ChapterSummary] = {}
+        batch: List[Tuple[Dict, str]] = []
+        batch_size = 0
+        pending = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="import-summary") as executor:
+            def submit():
+                nonlocal batch, batch_size
+                if len(pending) >= self.max_workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.discard(future)
+                        results.update((s.chapter_number, s) for s in future.result())
+                pending.add(executor.submit(self._summarize_batch, batch, title))
+                batch, batch_size = [], 0
+
+            for chapter in chapters:
+                content = chapter['content'][:self.chapter_chars]
+                digest = content_digest(content)
+                cached = self.cache.get(digest) if self.cache else None
+                if cached is not None:
+                    results[chapter['chapter_number']] = ChapterSummary(chapter['chapter_number'], chapter['title'], cached)
+                    continue
+                if batch and batch_size + len(content) > self.batch_chars:
+                    submit()
+                batch.append(({**chapter, 'content': content}, digest))
+                batch_size += len(content)
+            if batch:
+                submit()
+
+            for future in pending:
+                results.update((s.chapter_number, s) for s in future.result())
+
+        if self.cache:
+            self.cache.prune()
+        return [results[number] for number in sorted(results)]
+
+    def reduce(self, summaries: List[ChapterSummary], title: str) -> str:
+        """Reduce step: condense groups of summaries until they fit reduce_chars"""
+        # (first chapter, last chapter, text) for each chapter or condensed section
+        units = [(s.chapter_number, s.chapter_number, f"Chapter {s.chapter_number}: {s.title}\n{s.summary}")
+                 for s in summaries]
+        for _ in range(4):
+            if sum(len(unit[2]) + 2 for unit in units) <= self.reduce_chars:
+                break
+            groups = self._group(units, self.reduce_chars)
+            # Each condensed section gets an equal share of the final budget
+            target_words = max(150, self.reduce_chars // len(groups) // 7)
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="import-summary") as executor:
+                units = list(executor.map(lambda group: self._condense(group, title, target_words), groups))
+        return '\n\n'.join(unit[2] for unit in units)[:self.reduce_chars]
+
+    def _summarize_batch(self, batch: List[Tuple[Dict, str]], title: str) -> List[ChapterSummary]:
+        chapters_text = '\n\n'.join(
+            f"=== CHAPTER {chapter['chapter_number']}: {chapter['title']} ===\n{chapter['content']}"
+            for chapter, _ in batch
+        )
+        prompt = f"""Summarize each chapter of the story "{title}" below for a later analysis of the whole book.
+
+For every chapter write 100-200 words covering:
+- The main events, in order
+- Every named character who appears, with their role and notable traits
+- Details of the setting, technology, society and rules of the world
+
+Start each summary with a line "=== CHAPTER <number> ===" using the chapter numbers given, and write nothing else.
+
+{chapters_text}
+"""
+        try:
+            response = self.agents.generate_content(SUMMARY_AGENT, prompt)
+        except Exception as e:
+            print(f"Chapter summarization failed, using excerpts: {e}")
+            response = ""
+
+        sections = _CHAPTER_MARKER.split(response)
+        written = {int(number): text.strip() for number, text in zip(sections[1::2], sections[2::2]) if text.strip()}
+
+        summaries = []
+        for chapter, digest in batch:
+            number = chapter['chapter_number']
+            summary = written.get(number)
+            if summary is not None:
+                if self.cache:
+                    self.cache.put(digest, summary)
+            else:
+                # Missing from the response: an excerpt stands in, and nothing is cached
+                summary = chapter['content'][:1000]
+            summaries.append(ChapterSummary(number, chapter['title'], summary))
+        return summaries
+
+    def _condense(self, units: List[Tuple[int, int, str]], title: str, target_words: int) -> Tuple[int, int, str]:
+        first, last = units[0][0], units[-1][1]
+        summaries_text = '\n\n'.join(unit[2] for unit in units)
+        prompt = f"""Condense these consecutive chapter summaries of the story "{title}" into one summary of at most {target_words} words.
+
+Keep the order of events, every named character with their role, and all setting and world-building details.
+
+{summaries_text}
+"""
+        try:
+            condensed = self.agents.generate_content(SUMMARY_AGENT, prompt).strip()
+        except Exception as e:
+            print(f"Summary condensing failed for chapters {first}-{last}, truncating: {e}")
+            condensed = summaries_text[:target_words * 7]
+        return first, last, f"Chapters {first}-{last}\n{condensed}"
+
+    @staticmethod
+    def _group(units: List[Tuple[int, int, str]], max_chars: int) -> List[List[Tuple[int, int, str]]]:
+        # Consecutive runs of at most max_chars, and at least two units per group
+        # whenever possible so every round shrinks the total
+        groups: List[List[Tuple[int, int, str]]] = []
+        size = 0
+        for unit in units:
+            if groups and (size + len(unit[2]) <= max_chars or len(groups[-1]) < 2):
+                groups[-1].append(unit)
+                size += len(unit[2])
+            else:
+                groups.append([unit])
+                size = len(unit[2])
+        return groups
@@ -5,14 +5,34 @@ Handles parsing of various document formats and chapter detection
 
 import re
 import os
-from typing import List, Dict, Tuple, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, List, Dict, NamedTuple, Tuple, Optional
 from pathlib import Path
-from docx import Document
-from odf import text, teletype
-from odf.opendocument import load
-import ebooklib
-from ebooklib import epub
-from bs4 import BeautifulSoup
+
+from .chapter_detection import ChapterDetector
+from .document_reader import Paragraph, iter_docx_paragraphs, iter_odt_paragraphs, iter_text_paragraphs, read_epub
+
+
+# Lines from the top of a manuscript used for title/author extraction
+HEAD_LINES = 20
+
+
+class ParsedDocument(NamedTuple):
+    chapters: List[Dict]
+    head: str           # opening lines of the manuscript, for extract_title_and_author
+    title: str = ""     # from document metadata, when the format has any
+    author: str = ""
+
+
+class DocumentStream(NamedTuple):
+    """Like ParsedDocument, but chapters are produced lazily while the file is read"""
+    chapters: Iterator[Dict]
+    head: str
+    title: str = ""
+    author: str = ""
 
 
 class DocumentParser:
@@ -22,92 +42,133 @@ class DocumentParser:
     def parse_docx(file_path: str) -> str:
         """Extract text content from DOCX file"""
         try:
-            doc = Document(file_path)
-            full_text = []
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    full_text.append(paragraph.text.strip())
-            
-            return '\n\n'.join(full_text)
+            return '\n\n'.join(paragraph.text for paragraph in iter_docx_paragraphs(file_path))
         except Exception as e:
             raise Exception(f"Failed to parse DOCX file: {str(e)}")
     
+    @staticmethod
+    def parse_docx_chapters(file_path: str) -> ParsedDocument:
+        """Stream a DOCX file straight into chapters"""
+        document = DocumentParser.stream_docx(file_path)
+        return ParsedDocument(list(document.chapters), document.head, document.title, document.author)
+    
+    @staticmethod
+    def stream_docx(file_path: str) -> DocumentStream:
+        """Open a DOCX file; chapters are detected as its paragraphs are read"""
+        def paragraphs():
+            try:
+                yield from iter_docx_paragraphs(file_path)
+            except Exception as e:
+                raise Exception(f"Failed to parse DOCX file: {str(e)}")
+        
+        stream = paragraphs()
+        opening = list(islice(stream, HEAD_LINES))
+        chapters = ChapterDetector().iter_chapters(chain(opening, stream))
+        return DocumentStream(chapters, '\n'.join(p.text for p in opening))
+    
+    @staticmethod
+    def stream_text(file_path: str) -> DocumentStream:
+        """Open a plain text or Markdown file; it is memory-mapped and decoded incrementally"""
+        detector = ChapterDetector()
+        markdown = Path(file_path).suffix.lower() != '.txt'
+        
+        def paragraphs():
+            for paragraph in iter_text_paragraphs(file_path, markdown=markdown):
+                # A header line directly above its text arrives as one block; split it off
+                first, newline, rest = paragraph.text.partition('\n')
+                if newline and detector.classify(Paragraph(first)) is not None:
+                    yield Paragraph(first)
+                    yield Paragraph(rest)
+                else:
+                    yield paragraph
+        
+        stream = paragraphs()
+        opening = list(islice(stream, HEAD_LINES))
+        chapters = detector.iter_chapters(chain(opening, stream))
+        return DocumentStream(chapters, '\n'.join(p.text for p in opening))
+    
+    @staticmethod
+    def stream_document(file_path: str) -> DocumentStream:
+        """Open any supported format; chapters are yielded as they are detected"""
+        extension = Path(file_path).suffix.lower()
+        if extension == '.docx':
+            return DocumentParser.stream_docx(file_path)
+        if extension == '.epub':
+            return DocumentParser.stream_epub(file_path)
+        if extension in ('.txt', '.md', '.markdown'):
+            return DocumentParser.stream_text(file_path)
+        if extension == '.odt':
+            return DocumentParser.stream_odt(file_path)
+        if extension == '.mobi':
+            text = DocumentParser.parse_mobi(file_path)
+        else:
+            raise ValueError(f"Unsupported file format: {file_path}. Supported formats: .docx, .odt, .epub, .txt, .md")
+        head = '\n'.join(text.split('\n', HEAD_LINES)[:HEAD_LINES])
+        return DocumentStream(ChapterDetector().iter_text_chapters(text), head)
+    
+    @staticmethod
+    def document_title_and_author(parsed: ParsedDocument, file_path: str) -> Tuple[str, str]:
+        """Title and author from document metadata, falling back to the opening text"""
+        title, author = parsed.title, parsed.author
+        if not title or not author:
+            content_title, content_author = DocumentParser.extract_title_and_author(parsed.head, file_path)
+            title = title or content_title
+            author = author or content_author
+        return title, author
+    
     @staticmethod
     def parse_odt(file_path: str) -> str:
         """Extract text content from ODT file"""
         try:
-            # Load the ODT document
-            doc = load(file_path)
-            
-            # Extract all text
-            full_text = []
-            
-            # Get all paragraphs from the document
-            paragraphs = doc.getElementsByType(text.P)
-            for paragraph in paragraphs:
-                # Extract text from paragraph
-                text_content = teletype.extractText(paragraph).strip()
-                if text_content:
-                    full_text.append(text_content)
-            
-            # Also get headings
-            headings = doc.getElementsByType(text.H)
-            for heading in headings:
-                text_content = teletype.extractText(heading).strip()
-                if text_content:
-                    full_text.append(text_content)
-            
-            return '\n\n'.join(full_text)
+            return '\n\n'.join(paragraph.text for paragraph in iter_odt_paragraphs(file_path))
         except Exception as e:
             raise Exception(f"Failed to parse ODT file: {str(e)}")
     
+    @staticmethod
+    def stream_odt(file_path: str) -> DocumentStream:
+        """Open an ODT file; chapters are detected as content.xml is read"""
+        def paragraphs():
+            try:
+                yield from iter_odt_paragraphs(file_path)
+            except Exception as e:
+                raise Exception(f"Failed to parse ODT file: {str(e)}")
+        
+        stream = paragraphs()
+        opening = list(islice(stream, HEAD_LINES))
+        chapters = ChapterDetector().iter_chapters(chain(opening, stream))
+        return DocumentStream(chapters, '\n'.join(p.text for p in opening))
+    
     @staticmethod
     def parse_epub(file_path: str) -> str:
         """Extract text content from EPUB file"""
         try:
-            # Load the EPUB book
-            book = epub.read_epub(file_path)
-            
-            # Extract text from all chapters
-            full_text = []
-            
-            # Get all items in the book
-            for item in book.get_items():
-                # Only process XHTML documents (chapters)
-                if item.get_type() == ebooklib.ITEM_DOCUMENT:
-                    # Parse HTML content
-                    soup = BeautifulSoup(item.get_content(), 'html.parser')
-                    
-                    # Extract text, preserving paragraph breaks
-                    text_content = soup.get_text(separator='\n\n', strip=True)
-                    
-                    if text_content:
-                        full_text.append(text_content)
-            
-            return '\n\n'.join(full_text)
+            return read_epub(file_path).text
+        except Exception as e:
+            raise Exception(f"Failed to parse EPUB file: {str(e)}")
+    
+    @staticmethod
+    def parse_epub_document(file_path: str) -> ParsedDocument:
+        """Read an EPUB once: metadata plus chapters split at spine document boundaries"""
+        document = DocumentParser.stream_epub(file_path)
+        return ParsedDocument(list(document.chapters), document.head, document.title, document.author)
+    
+    @staticmethod
+    def stream_epub(file_path: str) -> DocumentStream:
+        try:
+            book = read_epub(file_path)
         except Exception as e:
             raise Exception(f"Failed to parse EPUB file: {str(e)}")
+        
+        head = '\n'.join(p.text for p in islice(book.paragraphs, HEAD_LINES))
+        chapters = ChapterDetector().iter_document_chapters(book.documents)
+        return DocumentStream(chapters, head, book.title, book.author)
     
     @staticmethod
     def extract_epub_metadata(file_path: str) -> Tuple[str, str]:
         """Extract title and author from EPUB metadata"""
         try:
-            book = epub.read_epub(file_path)
-            
-            # Get title from metadata
-            title = ""
-            title_metadata = book.get_metadata('DC', 'title')
-            if title_metadata:
-                title = title_metadata[0][0]  # First title, first element
-            
-            # Get author from metadata  
-            author = ""
-            creator_metadata = book.get_metadata('DC', 'creator')
-            if creator_metadata:
-                author = creator_metadata[0][0]  # First creator, first element
-            
-            return title, author
+            book = read_epub(file_path)
+            return book.title, book.author
         except Exception:
             return "", ""
     
@@ -119,77 +180,13 @@ class DocumentParser:
         raise Exception(
             "MOBI format is not yet supported due to technical complexity. "
             "Please convert your MOBI file to EPUB format using tools like Calibre, "
-            "then import the EPUB version. Supported formats: .docx, .odt, .epub"
+            "then import the EPUB version. Supported formats: .docx, .odt, .epub, .txt, .md"
         )
     
     @staticmethod
     def detect_chapters(text: str) -> List[Dict[str, any]]:
         """Detect chapter breaks in text and return structured chapters"""
-        chapters = []
-        
-        # Common chapter patterns
-        chapter_patterns = [
-            r'^\s*chapter\s+(\d+)\s*:?\s*(.*)$',  # "Chapter 1: Title" or "Chapter 1"
-            r'^\s*chapter\s+(\w+)\s*:?\s*(.*)$',  # "Chapter One: Title"
-            r'^\s*(\d+)\.\s*(.*)$',               # "1. Title"
-            r'^\s*part\s+(\d+)\s*:?\s*(.*)$',     # "Part 1: Title"
-        ]
-        
-        lines = text.split('\n')
-        current_chapter = None
-        chapter_number = 1
-        current_content = []
-        
-        for line in lines:
-            line_stripped = line.strip()
-            if not line_stripped:
-                continue
-                
-            # Check if this line is a chapter header
-            is_chapter_header = False
-            chapter_title = ""
-            
-            for pattern in chapter_patterns:
-                match = re.match(pattern, line_stripped, re.IGNORECASE)
-                if match:
-                    # Save previous chapter if exists
-                    if current_chapter is not None:
-                        current_chapter['content'] = '\n\n'.join(current_content).strip()
-                        chapters.append(current_chapter)
-                    
-                    # Start new chapter
-                    chapter_title = match.group(2).strip() if len(match.groups()) > 1 else ""
-                    if not chapter_title:
-                        chapter_title = f"Chapter {chapter_number}"
-                    
-                    current_chapter = {
-                        'chapter_number': chapter_number,
-                        'title': chapter_title,
-                        'content': ''
-                    }
-                    current_content = []
-                    chapter_number += 1
-                    is_chapter_header = True
-                    break
-            
-            # Add content to current chapter
-            if not is_chapter_header:
-                current_content.append(line_stripped)
-        
-        # Don't forget the last chapter
-        if current_chapter is not None:
-            current_chapter['content'] = '\n\n'.join(current_content).strip()
-            chapters.append(current_chapter)
-        
-        # If no chapters detected, treat entire text as single chapter
-        if not chapters:
-            chapters.append({
-                'chapter_number': 1,
-                'title': 'Chapter 1',
-                'content': text.strip()
-            })
-        
-        return chapters
+        return ChapterDetector().detect_text(text)
     
     @staticmethod
     def extract_title_and_author(text: str, filename: str) -> Tuple[str, str]:
@@ -261,46 +258,168 @@ class DocumentParser:
 class ImportAnalyzer:
     """Analyze imported content to extract metadata using AI"""
     
-    def __init__(self, agent_config: Dict):
+    # Seconds to wait for each AI extraction; all three run at the same time
+    EXTRACTION_TIMEOUTS = {'characters': 600, 'world': 600, 'outline': 600}
+    
+    def __init__(self, agent_config: Dict, agents=None, timeouts: Optional[Dict[str, float]] = None,
+                 progress: Optional[Callable[..., None]] = None):
+        """agents: anything with BookAgents.generate_content; one is created on first use if omitted
+        
+        progress(event, **fields) is told when each extraction starts and finishes.
+        """
         self.agent_config = agent_config
+        self.progress = progress or (lambda event, **fields: None)
+        self.timeouts = {**self.EXTRACTION_TIMEOUTS, **(timeouts or {})}
+        self._agents = agents
+        self._agents_lock = threading.Lock()
+    
+    def _get_agents(self):
+        """One BookAgents (and Gemini client) shared by every extraction"""
+        with self._agents_lock:
+            if self._agents is None:
+                from .agents import BookAgents
+                book_agents = BookAgents(self.agent_config)
+                # Initialize agents (required for BookAgents to work)
+                book_agents.create_agents("Import analysis", 1)
+                self._agents = book_agents
+            return self._agents
+    
+    def _run_ai_extractions(self, chapters: List[Dict], full_text: str, title: str,
+                            chapter_count: int) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Run the character, world and outline extractions concurrently
+        
+        Returns (results, errors). An extraction that times out falls back to
+        the basic analysis, so the others' results are still used.
+        """
+        # Create the shared client up front so a bad config fails once, not three times
+        self._get_agents()
+        
+        jobs = {
+            'characters': lambda: self._extract_ai_characters(full_text, title),
+            'world': lambda: self._extract_ai_world(full_text, title),
+            'outline': lambda: self._extract_ai_outline(chapters, title, chapter_count),
+        }
+        return self._run_concurrently(jobs, self._basic_fallbacks(full_text, chapter_count))
+    
+    def _basic_fallbacks(self, text: str, chapter_count: int) -> Dict[str, Callable[[], str]]:
+        return {
+            'characters': lambda: self._extract_basic_characters(text),
+            'world': lambda: self._extract_basic_world(text),
+            'outline': lambda: f"Basic outline: {chapter_count} chapters.",
+        }
+    
+    def _run_concurrently(self, jobs: Dict[str, Callable[[], str]],
+                          fallbacks: Dict[str, Callable[[], str]]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        def run(name, job):
+            self.progress('extraction_started', name=name)
+            return job()
+        
+        executor = ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="import-analysis")
+        start = time.monotonic()
+        futures = {name: executor.submit(run, name, job) for name, job in jobs.items()}
+        results, errors = {}, {}
+        try:
+            for name, future in futures.items():
+                remaining = max(0.0, start + self.timeouts[name] - time.monotonic())
+                try:
+                    results[name] = future.result(timeout=remaining)
+                except FutureTimeoutError:
+                    errors[name] = f"timed out after {self.timeouts[name]}s"
+                except Exception as e:
+                    errors[name] = str(e)
+                if name in errors:
+                    print(f"AI {name} extraction failed ({errors[name]}), using basic analysis")
+                    results[name] = fallbacks[name]()
+                self.progress('extraction_finished', name=name, ok=name not in errors, error=errors.get(name))
+        finally:
+            # Don't wait for timed-out calls; their threads finish in the background
+            executor.shutdown(wait=False)
+        return results, errors
+    
+    @property
+    def ai_enabled(self) -> bool:
+        return self._agents is not None or bool(self.agent_config and self.agent_config.get('config_list'))
     
-    def analyze_for_import(self, chapters: List[Dict], title: str) -> Dict:
-        """Analyze chapters and return suggested metadata using AI"""
+    def analyze_full_book(self, chapters: Iterable[Dict], title: str, chapter_count: int, total_words: int,
+                          summary_cache=None, max_workers: int = 4) -> Dict:
+        """Analyze every chapter: summarize in parallel batches, then extract from the summaries
+        
+        chapters is read lazily (e.g. from the chapter files of an imported project).
+        Raises if the model is unavailable; callers fall back to analyze_for_import.
+        """
+        from datetime import datetime
+        from .import_summaries import BookSummarizer
+        
+        summarizer = BookSummarizer(self._get_agents(), summary_cache, max_workers=max_workers)
+        self.progress('summarizing_started', chapter_count=chapter_count)
+        book_digest, summaries = summarizer.summarize_book(chapters, title)
+        self.progress('summarizing_finished', summarized_chapters=len(summaries))
+        
+        jobs = {
+            'characters': lambda: self._extract_ai_characters(book_digest, title),
+            'world': lambda: self._extract_ai_world(book_digest, title),
+            'outline': lambda: self._extract_ai_outline_from_summaries(book_digest, title, chapter_count),
+        }
+        results, errors = self._run_concurrently(jobs, self._basic_fallbacks(book_digest, chapter_count))
+        analysis = {
+            'title': title,
+            'chapter_count': chapter_count,
+            'total_words': total_words,
+            'analysis_mode': 'full',
+            'summarized_chapters': len(summaries),
+            'suggested_characters': results['characters'],
+            'suggested_world': results['world'],
+            'suggested_outline': results['outline'],
+            'generated_date': datetime.now().isoformat()
+        }
+        if errors:
+            analysis['extraction_errors'] = errors
+        return analysis
+    
+    def analyze_for_import(self, chapters: List[Dict], title: str,
+                           chapter_count: Optional[int] = None, total_words: Optional[int] = None) -> Dict:
+        """Analyze chapters and return suggested metadata using AI
+        
+        chapters may be a bounded sample of the book (see import_pipeline.AnalysisSample),
+        in which case chapter_count and total_words describe the whole book.
+        """
         full_text = '\n\n'.join([ch['content'] for ch in chapters])
+        chapter_count = chapter_count if chapter_count is not None else len(chapters)
+        total_words = total_words if total_words is not None else len(full_text.split())
         
         # Use AI analysis if agent_config is available
         if self.agent_config and self.agent_config.get('config_list'):
             try:
                 from datetime import datetime
+                results, errors = self._run_ai_extractions(chapters, full_text, title, chapter_count)
                 analysis = {
                     'title': title,
-                    'chapter_count': len(chapters),
-                    'total_words': len(full_text.split()),
-                    'suggested_characters': self._extract_ai_characters(full_text, title),
-                    'suggested_world': self._extract_ai_world(full_text, title),
-                    'suggested_outline': self._extract_ai_outline(chapters, title),
-                    'generated_date': datetime.now().isoformat(),
-                    'chapters': chapters
+                    'chapter_count': chapter_count,
+                    'total_words': total_words,
+                    'suggested_characters': results['characters'],
+                    'suggested_world': results['world'],
+                    'suggested_outline': results['outline'],
+                    'generated_date': datetime.now().isoformat()
                 }
+                if errors:
+                    analysis['extraction_errors'] = errors
             except Exception as e:
                 print(f"AI analysis failed, falling back to basic analysis: {e}")
                 analysis = {
                     'title': title,
-                    'chapter_count': len(chapters),
-                    'total_words': len(full_text.split()),
+                    'chapter_count': chapter_count,
+                    'total_words': total_words,
                     'suggested_characters': self._extract_basic_characters(full_text),
-                    'suggested_world': self._extract_basic_world(full_text),
-                    'chapters': chapters
+                    'suggested_world': self._extract_basic_world(full_text)
                 }
         else:
             # Fallback to basic analysis if no AI config
             analysis = {
                 'title': title,
-                'chapter_count': len(chapters),
-                'total_words': len(full_text.split()),
+                'chapter_count': chapter_count,
+                'total_words': total_words,
                 'suggested_characters': self._extract_basic_characters(full_text),
-                'suggested_world': self._extract_basic_world(full_text),
-                'chapters': chapters
+                'suggested_world': self._extract_basic_world(full_text)
             }
         
         return analysis
@@ -335,13 +454,7 @@ class ImportAnalyzer:
     
     def _extract_ai_characters(self, text: str, title: str) -> str:
         """AI-powered character extraction"""
-        from .agents import BookAgents
-        
-        # Create BookAgents instance for AI analysis
-        book_agents = BookAgents(self.agent_config)
-        
-        # Initialize agents (required for BookAgents to work)
-        book_agents.create_agents("Character analysis", 1)
+        book_agents = self._get_agents()
         
         # Truncate text if too long for AI processing
         max_chars = 50000  # Adjust based on AI model limits
@@ -373,21 +486,11 @@ Format your response as a detailed character document that would help a writer c
 Focus on characters who have dialogue, actions, or significant story impact.
 """
         
-        try:
-            character_analysis = book_agents.generate_content("world_builder", character_prompt)
-            return character_analysis
-        except Exception as e:
-            return f"AI character analysis failed: {e}\n\nFalling back to basic analysis:\n{self._extract_basic_characters(text)}"
+        return book_agents.generate_content("world_builder", character_prompt)
     
     def _extract_ai_world(self, text: str, title: str) -> str:
         """AI-powered world-building extraction"""
-        from .agents import BookAgents
-        
-        # Create BookAgents instance for AI analysis
-        book_agents = BookAgents(self.agent_config)
-        
-        # Initialize agents (required for BookAgents to work)
-        book_agents.create_agents("World analysis", 1)
+        book_agents = self._get_agents()
         
         # Truncate text if too long for AI processing
         max_chars = 50000
@@ -428,21 +531,12 @@ Please provide a comprehensive world analysis including:
 Format your response as a detailed world-building document that would help a writer maintain consistency when continuing this story.
 """
         
-        try:
-            world_analysis = book_agents.generate_content("world_builder", world_prompt)
-            return world_analysis
-        except Exception as e:
-            return f"AI world analysis failed: {e}\n\nFalling back to basic analysis:\n{self._extract_basic_world(text)}"
+        return book_agents.generate_content("world_builder", world_prompt)
     
-    def _extract_ai_outline(self, chapters: List[Dict], title: str) -> str:
+    def _extract_ai_outline(self, chapters: List[Dict], title: str, chapter_count: Optional[int] = None) -> str:
         """AI-powered outline generation from existing chapters"""
-        from .agents import BookAgents
-        
-        # Create BookAgents instance for AI analysis
-        book_agents = BookAgents(self.agent_config)
-        
-        # Initialize agents (required for BookAgents to work)
-        book_agents.create_agents("Outline analysis", len(chapters))
+        book_agents = self._get_agents()
+        chapter_count = chapter_count or len(chapters)
         
         # Create chapter summaries for analysis
         chapter_summaries = []
@@ -457,7 +551,7 @@ Format your response as a detailed world-building document that would help a wri
         outline_prompt = f"""Analyze the following story chapters and create a structured outline:
 
 STORY: {title}
-TOTAL CHAPTERS: {len(chapters)}
+TOTAL CHAPTERS: {chapter_count}
 
 CHAPTERS:
 {chapters_text}
@@ -487,8 +581,43 @@ Please create a detailed outline including:
 Format this as a comprehensive outline that shows the story's structure and would help a writer understand the narrative flow.
 """
         
-        try:
-            outline_analysis = book_agents.generate_content("story_planner", outline_prompt)
-            return outline_analysis
-        except Exception as e:
-            return f"AI outline analysis failed: {e}\n\nBasic outline: {len(chapters)} chapters with {sum(len(ch['content'].split()) for ch in chapters):,} total words."
\ No newline at end of file
+        return book_agents.generate_content("story_planner", outline_prompt)
+    
+    def _extract_ai_outline_from_summaries(self, book_digest: str, title: str, chapter_count: int) -> str:
+        """AI-powered outline generation from whole-book chapter summaries"""
+        book_agents = self._get_agents()
+        
+        outline_prompt = f"""Analyze the following chapter summaries, which cover the whole story, and create a structured outline:
+
+STORY: {title}
+TOTAL CHAPTERS: {chapter_count}
+
+CHAPTER SUMMARIES:
+{book_digest}
+
+Please create a detailed outline including:
+
+1. STORY STRUCTURE:
+   - Beginning, middle, end overview
+   - Major plot points and turning points
+   - Climax and resolution
+
+2. CHAPTER-BY-CHAPTER BREAKDOWN:
+   - What happens in each chapter
+   - How chapters connect to overall plot
+   - Character development in each section
+
+3. THEMES & PLOT THREADS:
+   - Main themes explored
+   - Ongoing plot threads
+   - Character arcs and development
+
+4. STORY ANALYSIS:
+   - Genre and style
+   - Pacing and structure
+   - Key conflicts and resolutions
+
+Format this as a comprehensive outline that shows the story's structure and would help a writer understand the narrative flow.
+"""
+        
+        return book_agents.generate_content("story_planner", outline_prompt)
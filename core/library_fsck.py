@@ -0,0 +1,210 @@
+"""
+Library reconciliation for hypeWriter
+Cross-checks projects.json against the project folders on disk in linear time.
+
+Usage:
+    python -m core.library_fsck [--repair] [--library PATH] [--workers N]
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from .chapter_store import ChapterStore
+from .project_manager import ProjectManager, scan_chapters
+from .pydantic_models import ProjectMetadata
+from .search_index import RESERVED_FOLDERS
+
+
+class FolderScan(NamedTuple):
+    folder: Path
+    stats_mtime_ns: int         # newest mtime among the chapters folder and chapter files
+    chapter_numbers: List[int]
+    metadata: Optional[Dict]
+
+
+def _scan_folder(folder: Path) -> FolderScan:
+    """Stat one project folder (run in a worker thread)"""
+    newest, numbers = scan_chapters(folder)
+
+    metadata = None
+    try:
+        with open(folder / "metadata.json", 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    except (FileNotFoundError, ValueError):
+        pass
+
+    return FolderScan(folder, newest, numbers, metadata)
+
+
+def _count_words(folder: Path, chapter_numbers: List[int]) -> int:
+    store = ChapterStore(folder / "chapters")
+    return sum(len(store.read(n).split()) for n in chapter_numbers)
+
+
+def reconcile_library(pm: ProjectManager, repair: bool = False, workers: int = 8) -> Dict:
+    """Report (and optionally repair) drift between projects.json and the library folders.
+
+    Dry-run by default. With repair=True, index entries whose folder is gone are
+    dropped, folders carrying a valid metadata.json are re-registered, and stale
+    chapter/word counts are refreshed, all in a single index write.
+    """
+    if not repair:
+        return _reconcile(pm, False, workers)
+    # The index must not change between reading it and writing the repairs
+    with pm.index_lock:
+        return _reconcile(pm, True, workers)
+
+
+def _reconcile(pm: ProjectManager, repair: bool, workers: int) -> Dict:
+    projects = pm.load_projects_index()
+
+    # One pass over the index: short folder suffix -> project ids
+    by_short_id: Dict[str, List[str]] = {}
+    for project_id in projects:
+        by_short_id.setdefault(project_id[:8], []).append(project_id)
+
+    folders = [
+        Path(entry.path) for entry in os.scandir(pm.base_path)
+        if entry.is_dir() and not entry.name.startswith('.') and entry.name not in RESERVED_FOLDERS
+    ]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        scans = list(executor.map(_scan_folder, folders))
+
+    scan_by_name = {scan.folder.name: scan for scan in scans}
+    folder_for_id: Dict[str, FolderScan] = {}
+    duplicate_folders: List[Dict] = []
+    folders_without_entry: List[Dict] = []
+
+    for scan in scans:
+        name = scan.folder.name
+        if name in projects:
+            # Legacy folders are named after the full UUID
+            candidates = [name]
+        else:
+            candidates = by_short_id.get(name.rsplit('-', 1)[-1], []) if '-' in name else []
+
+        if len(candidates) != 1:
+            entry = {"folder": name, "ambiguous_ids": candidates} if candidates else {"folder": name}
+            meta = scan.metadata or {}
+            if meta.get("id") and meta["id"] not in projects:
+                entry["metadata_id"] = meta["id"]
+            folders_without_entry.append(entry)
+            continue
+
+        project_id = candidates[0]
+        if project_id in folder_for_id:
+            duplicate_folders.append({"project_id": project_id, "folder": name,
+                                      "kept": folder_for_id[project_id].folder.name})
+            continue
+        folder_for_id[project_id] = scan
+
+    # Archived projects have no folder; they only need their archive file
+    index_without_folder = []
+    archived_missing = []
+    for project_id, data in projects.items():
+        if project_id in folder_for_id:
+            continue
+        entry = {"project_id": project_id, "title": data.get("title", "")}
+        if not data.get("archived"):
+            index_without_folder.append(entry)
+        elif not (pm.archive_path / data.get("archive_name", "")).is_file():
+            archived_missing.append(entry)
+
+    # Only folders whose chapters changed since the counts were cached get re-read
+    stale = [
+        (project_id, scan) for project_id, scan in folder_for_id.items()
+        if projects[project_id].get("stats_mtime_ns") != scan.stats_mtime_ns
+    ]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        word_counts = list(executor.map(lambda item: _count_words(item[1].folder, item[1].chapter_numbers), stale))
+    stale_stats = [
+        {
+            "project_id": project_id,
+            "folder": scan.folder.name,
+            "chapter_count": len(scan.chapter_numbers),
+            "word_count": word_count,
+            "stats_mtime_ns": scan.stats_mtime_ns,
+        }
+        for (project_id, scan), word_count in zip(stale, word_counts)
+    ]
+
+    adopted = []
+    if repair:
+        for entry in index_without_folder:
+            print(f"Removing orphaned project: {entry['title'] or entry['project_id']}")
+            del projects[entry["project_id"]]
+
+        for entry in folders_without_entry:
+            meta = None
+            scan = scan_by_name[entry["folder"]]
+            if scan.metadata and entry.get("metadata_id"):
+                try:
+                    meta = ProjectMetadata(**scan.metadata)
+                except Exception as e:
+                    print(f"Warning: Invalid metadata.json in {entry['folder']}: {e}")
+            if meta is not None:
+                projects[meta.id] = meta.dict()
+                adopted.append(meta.id)
+                if meta.id[:8] != entry["folder"].rsplit('-', 1)[-1] and entry["folder"] != meta.id:
+                    print(f"Warning: Adopted {entry['folder']} but its name does not end with the project's short ID")
+
+        for entry in stale_stats:
+            if entry["project_id"] in projects:
+                projects[entry["project_id"]] = {
+                    **projects[entry["project_id"]],
+                    "chapter_count": entry["chapter_count"],
+                    "word_count": entry["word_count"],
+                    "stats_mtime_ns": entry["stats_mtime_ns"],
+                }
+
+        if index_without_folder or adopted or stale_stats:
+            pm.save_projects_index(projects)
+
+    return {
+        "success": True,
+        "repair": repair,
+        "folders_scanned": len(scans),
+        "index_without_folder": index_without_folder,
+        "folders_without_entry": folders_without_entry,
+        "duplicate_folders": duplicate_folders,
+        "stale_stats": stale_stats,
+        "archived_missing": archived_missing,
+        "adopted": adopted,
+        "removed_count": len(index_without_folder) if repair else 0,
+        "remaining_count": len(projects),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconcile projects.json with the library folders")
+    parser.add_argument("--library", default="library", help="Library folder (default: library)")
+    parser.add_argument("--repair", action="store_true", help="Apply fixes instead of only reporting")
+    parser.add_argument("--workers", type=int, default=8, help="Parallel folder scans")
+    args = parser.parse_args(argv)
+
+    report = reconcile_library(ProjectManager(args.library), repair=args.repair, workers=args.workers)
+
+    print(f"Scanned {report['folders_scanned']} folders")
+    for entry in report["index_without_folder"]:
+        print(f"  index entry without folder: {entry['project_id']} ({entry['title']})")
+    for entry in report["folders_without_entry"]:
+        print(f"  folder without index entry: {entry['folder']}")
+    for entry in report["duplicate_folders"]:
+        print(f"  duplicate folder for {entry['project_id']}: {entry['folder']} (kept {entry['kept']})")
+    for entry in report["archived_missing"]:
+        print(f"  archived project without archive file: {entry['project_id']} ({entry['title']})")
+    for entry in report["stale_stats"]:
+        print(f"  stale stats: {entry['folder']} -> {entry['chapter_count']} chapters, {entry['word_count']} words")
+    if args.repair:
+        print(f"Repaired: removed {report['removed_count']}, adopted {len(report['adopted'])}, "
+              f"refreshed {len(report['stale_stats'])}")
+    else:
+        print("Dry run; pass --repair to apply")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Parse cache for hypeWriter imports
+Keeps detected chapters and metadata per file content hash, so analyze and
+import of the same manuscript only parse it once
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from .import_utils import DocumentParser, DocumentStream, ParsedDocument
+
+
+# Bump whenever parsing or chapter detection changes output, so stale entries are ignored
+PARSER_VERSION = 4
+
+CACHE_DIR_NAME = "cache"
+MAX_ENTRIES = 200
+# Temporary files older than this were left by a crashed writer
+STALE_TMP_SECONDS = 3600
+
+# Damage found when reading an entry: gzip raises EOFError on a truncated file
+_DAMAGED_ENTRY = (OSError, EOFError, ValueError, KeyError, IndexError, TypeError)
+
+_digest_memo: Dict[str, Tuple[int, int, str]] = {}
+_digest_lock = threading.Lock()
+
+
+def file_digest(file_path: str) -> str:
+    """SHA-256 of a file's content, memoized by path, size and mtime"""
+    stat = os.stat(file_path)
+    key = os.path.abspath(file_path)
+    with _digest_lock:
+        memo = _digest_memo.get(key)
+    if memo and memo[0] == stat.st_size and memo[1] == stat.st_mtime_ns:
+        return memo[2]
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    value = digest.hexdigest()
+
+    with _digest_lock:
+        _digest_memo[key] = (stat.st_size, stat.st_mtime_ns, value)
+    return value
+
+
+def remember_digest(file_path: str, digest: str):
+    """Record a digest computed elsewhere (e.g. while a file was uploaded) so it is not re-read"""
+    stat = os.stat(file_path)
+    with _digest_lock:
+        _digest_memo[os.path.abspath(file_path)] = (stat.st_size, stat.st_mtime_ns, digest)
+
+
+class ParseCache:
+    """gzip-compressed JSON-lines parse results under library/imports/cache"""
+
+    def __init__(self, base_path: str = "library", max_entries: int = MAX_ENTRIES):
+        self.cache_dir = Path(base_path) / "imports" / CACHE_DIR_NAME
+        self.max_entries = max_entries
+
+    def entry_path(self, digest: str, file_path: str) -> Path:
+        # The format decides how bytes are parsed, so it is part of the key
+        suffix = Path(file_path).suffix.lower().lstrip('.') or 'bin'
+        return self.cache_dir / f"{digest}.{suffix}.v{PARSER_VERSION}.jsonl.gz"
+
+    def parse(self, file_path: str) -> ParsedDocument:
+        """Parse a document, reusing an earlier result for identical content"""
+        document = self.open(file_path)
+        return ParsedDocument(list(document.chapters), document.head, document.title, document.author)
+
+    def open(self, file_path: str) -> DocumentStream:
+        """Stream a document's chapters from the cache, or from the parser while recording them"""
+        path = self.entry_path(file_digest(file_path), file_path)
+        try:
+            cached = self._open_entry(path, file_path)
+        except FileNotFoundError:
+            cached = None
+        except _DAMAGED_ENTRY as e:
+            print(f"Warning: Ignoring unreadable parse cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            cached = None
+        if cached is not None:
+            return cached
+
+        document = DocumentParser.stream_document(file_path)
+        return document._replace(chapters=self._record(path, file_path, document))
+
+    def _open_entry(self, path: Path, file_path: str) -> Optional[DocumentStream]:
+        f = gzip.open(path, 'rt', encoding='utf-8')
+        try:
+            header = json.loads(f.readline())
+        except Exception:
+            f.close()
+            raise
+        if header.get('version') != PARSER_VERSION:
+            f.close()
+            return None
+
+        # Refresh mtime so pruning keeps recently used entries
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return DocumentStream(self._read_chapters(f, path, file_path), header['head'], header['title'],
+                              header['author'])
+
+    def _read_chapters(self, f, path: Path, file_path: str) -> Iterator[Dict]:
+        # One [title, content] line per chapter; numbers are their positions
+        number = 0
+        try:
+            with f:
+                for line in f:
+                    entry = json.loads(line)
+                    if isinstance(entry, dict):
+                        return
+                    chapter = {'chapter_number': number + 1, 'title': entry[0], 'content': entry[1]}
+                    number += 1
+                    yield chapter
+            # Entries are renamed into place only when complete, so this means damage
+            error = "no end marker"
+        except _DAMAGED_ENTRY as e:
+            error = e
+        # A damaged entry is a cache miss: parse the file and carry on after the chapters already read
+        print(f"Warning: Parse cache entry {path.name} is damaged ({error}), parsing the file again")
+        path.unlink(missing_ok=True)
+        document = DocumentParser.stream_document(file_path)
+        yield from islice(self._record(path, file_path, document), number, None)
+
+    def _record(self, path: Path, file_path: str, document: DocumentStream) -> Iterator[Dict]:
+        """Pass chapters through while writing them to a new cache entry"""
+        # Two parses of the same file may record at once; each writes its own file
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            out = gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6)
+        except OSError as e:
+            # The cache is only an accelerator; imports still work without it
+            print(f"Warning: Could not write parse cache entry {path.name}: {e}")
+            yield from document.chapters
+            return
+
+        complete = False
+        count = 0
+        try:
+            with out:
+                header = {
+                    'version': PARSER_VERSION,
+                    'source': Path(file_path).name,
+                    'head': document.head,
+                    'title': document.title,
+                    'author': document.author,
+                }
+                out.write(json.dumps(header, ensure_ascii=False) + '\n')
+                for chapter in document.chapters:
+                    out.write(json.dumps([chapter['title'], chapter['content']], ensure_ascii=False) + '\n')
+                    count += 1
+                    yield chapter
+                out.write(json.dumps({'chapters': count}) + '\n')
+            os.replace(tmp_path, path)
+            complete = True
+        finally:
+            if not complete:
+                # Abandoned or failed parse; never leave a partial entry behind
+                try:
+                    os.unlink(tmp_path)
+                except FileNotFoundError:
+                    pass
+        self.prune()
+
+    def prune(self):
+        """Keep the most recently used entries, dropping the rest and outdated versions"""
+        try:
+            scanned = list(os.scandir(self.cache_dir))
+        except FileNotFoundError:
+            return
+
+        mtimes = {}
+        for entry in scanned:
+            try:
+                mtimes[entry.path] = entry.stat().st_mtime
+            except FileNotFoundError:
+                pass
+        entries = [entry for entry in scanned
+                   if entry.path in mtimes and entry.name.endswith(('.json.gz', '.jsonl.gz'))]
+        current = f".v{PARSER_VERSION}.jsonl.gz"
+        stale = [entry for entry in entries if not entry.name.endswith(current)]
+        stale += [entry for entry in scanned if entry.name.endswith('.tmp') and entry.path in mtimes
+                  and mtimes[entry.path] < time.time() - STALE_TMP_SECONDS]
+        live = sorted((entry for entry in entries if entry.name.endswith(current)),
+                      key=lambda entry: mtimes[entry.path], reverse=True)
+        for entry in stale + live[self.max_entries:]:
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
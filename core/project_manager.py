@@ -3,15 +3,90 @@ Project management utilities for hypeWriter multi-book support
 """
 
 import os
-import json
 import uuid
 import re
+import shutil
+import tarfile
+import threading
+import time
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Any, Callable, Iterable, List, Dict, Optional, Tuple
 from pathlib import Path
 
 from .pydantic_models import ProjectMetadata
+from .chapter_store import ChapterStore
+from .search_index import CHAPTER_FILE_RE, get_search_index
 from .import_utils import DocumentParser, ImportAnalyzer
+from .import_pipeline import ImportedChapter, AnalysisSample, run_import
+from .parse_cache import ParseCache
+from .import_summaries import SummaryCache
+from .serialization import read_file, write_atomic, write_file
+
+
+# Parsed JSON files shared by every ProjectManager: resolved path -> (mtime_ns, size, data)
+_json_cache: Dict[str, Tuple[int, int, Any]] = {}
+# Project listing built from the parsed index it came from: (index data, listing)
+_listing_cache: Tuple[Any, List[Dict]] = (None, [])
+# Project folder lookups: resolved library path -> {short project id: folder}
+_folder_cache: Dict[str, Dict[str, Path]] = {}
+_cache_lock = threading.Lock()
+# Held from loading projects.json to saving it by every index update
+_index_lock = threading.RLock()
+
+
+def invalidate_cached_path(path, is_dir: bool = False):
+    """Forget cached data for a file or directory under the library"""
+    key = str(Path(path).resolve())
+    with _cache_lock:
+        _json_cache.pop(key, None)
+        if is_dir:
+            prefix = key + os.sep
+            for cached in [k for k in _json_cache if k.startswith(prefix)]:
+                del _json_cache[cached]
+            # A project folder appeared, vanished or was renamed
+            parent = str(Path(key).parent)
+            _folder_cache.pop(parent, None)
+            _folder_cache.pop(key, None)
+
+
+def scan_chapters(project_dir: Path) -> Tuple[int, List[int]]:
+    """(stats_mtime_ns, chapter numbers) of a project folder
+    
+    stats_mtime_ns is the newest mtime among the chapters folder and its chapter
+    files; the index records it with the counts, so fsck can tell when they are stale.
+    """
+    chapters_dir = Path(project_dir) / "chapters"
+    newest = 0
+    numbers = []
+    try:
+        newest = chapters_dir.stat().st_mtime_ns
+        for entry in os.scandir(chapters_dir):
+            match = CHAPTER_FILE_RE.match(entry.name)
+            if match and entry.is_file():
+                numbers.append(int(match.group(1)))
+                newest = max(newest, entry.stat().st_mtime_ns)
+    except FileNotFoundError:
+        pass
+    return newest, sorted(numbers)
+
+
+def _no_progress(event: str, **fields):
+    pass
+
+
+def clear_caches():
+    """Forget everything cached from the library"""
+    global _listing_cache
+    with _cache_lock:
+        _json_cache.clear()
+        _folder_cache.clear()
+        _listing_cache = (None, [])
+
+
+def _cache_is_trusted(path: Path) -> bool:
+    """Cached entries may skip the stat check while a watcher covers the path"""
+    from .watcher import is_watched
+    return is_watched(path)
 
 
 class ProjectManager:
@@ -20,29 +95,141 @@ class ProjectManager:
     def __init__(self, base_path: str = "library"):
         self.base_path = Path(base_path)
         self.projects_file = self.base_path / "projects.json"
+        self.archive_path = self.base_path / "archive"
         self.ensure_directory_structure()
     
     def ensure_directory_structure(self):
         """Ensure the project directory structure exists"""
         self.base_path.mkdir(exist_ok=True)
         (self.base_path / "imports").mkdir(exist_ok=True)
+        self.archive_path.mkdir(exist_ok=True)
         
         # Create projects.json if it doesn't exist
         if not self.projects_file.exists():
             self._save_projects_index({})
     
+    @property
+    def index_lock(self) -> threading.RLock:
+        """Hold from load_projects_index() to save_projects_index() when changing the index"""
+        return _index_lock
+    
+    def load_projects_index(self) -> Dict:
+        """The projects index, project ID -> metadata dict; a copy the caller may change"""
+        return self._load_projects_index()
+    
+    def save_projects_index(self, projects: Dict):
+        """Replace the projects index"""
+        self._save_projects_index(projects)
+    
     def _load_projects_index(self) -> Dict:
         """Load the projects index from JSON"""
-        try:
-            with open(self.projects_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+        # Callers mutate the top level before saving, so hand out a copy
+        return dict(self.read_json(self.projects_file) or {})
     
     def _save_projects_index(self, projects: Dict):
         """Save the projects index to JSON"""
-        with open(self.projects_file, 'w', encoding='utf-8') as f:
-            json.dump(projects, f, indent=2, ensure_ascii=False)
+        self.write_json(self.projects_file, projects)
+    
+    def read_json(self, path: Path) -> Optional[Any]:
+        """Read a JSON file under the library through the shared cache.
+        
+        Returns None if the file is missing or invalid. The returned data is
+        shared between callers and must be treated as read-only.
+        """
+        key = str(Path(path).resolve())
+        with _cache_lock:
+            cached = _json_cache.get(key)
+        
+        if cached is not None and _cache_is_trusted(path):
+            return cached[2]
+        
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            invalidate_cached_path(path)
+            return None
+        
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        
+        try:
+            data = read_file(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        
+        with _cache_lock:
+            _json_cache[key] = (stat.st_mtime_ns, stat.st_size, data)
+        return data
+    
+    def write_json(self, path: Path, data: Any, pretty: bool = False):
+        """Write a JSON file under the library and refresh the shared cache
+        
+        Files are compact unless pretty is set, which is meant for exports.
+        """
+        write_file(path, data, pretty)
+        
+        stat = os.stat(path)
+        with _cache_lock:
+            _json_cache[str(Path(path).resolve())] = (stat.st_mtime_ns, stat.st_size, data)
+    
+    def read_project_json(self, project_id: str, filename: str) -> Optional[Any]:
+        """Read one of a project's JSON files (world.json, outline.json, ...)"""
+        return self.read_json(self.get_project_path(project_id) / filename)
+    
+    def write_document(self, project_dir: Path, name: str, document: Any):
+        """Save a world, characters or outline document as <name>.json and <name>.txt
+        
+        The AI text (raw_content) goes to the .txt file only, so it is not
+        stored twice; read_document_text() returns it.
+        """
+        data = document.model_dump(exclude={'raw_content'})
+        write_atomic(project_dir / f"{name}.txt", document.raw_content.encode('utf-8'))
+        self.write_json(project_dir / f"{name}.json", data)
+    
+    def read_document_text(self, project_dir: Path, name: str) -> str:
+        """AI text of a document saved by write_document (or inside an older <name>.json)"""
+        try:
+            with open(project_dir / f"{name}.txt", 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            data = self.read_json(project_dir / f"{name}.json")
+            return data.get("raw_content", "") if isinstance(data, dict) else ""
+    
+    def list_project_dicts(self) -> List[Dict]:
+        """list_projects() as plain dicts, for API responses
+        
+        Entries are validated once per change of projects.json, not per request.
+        The returned list is shared and must be treated as read-only.
+        """
+        global _listing_cache
+        index = self.read_json(self.projects_file) or {}
+        cached_index, listing = _listing_cache
+        if cached_index is index:
+            return listing
+        
+        listing = []
+        for project_id, data in index.items():
+            try:
+                listing.append(ProjectMetadata(**data).model_dump())
+            except Exception as e:
+                print(f"Warning: Invalid project data for {project_id}: {e}")
+        listing.sort(key=lambda p: p['last_modified'], reverse=True)
+        _listing_cache = (index, listing)
+        return listing
+    
+    def export_project(self, project_id: str) -> Optional[Dict]:
+        """Metadata, world, characters, outline and chapter list of a project in one document"""
+        project = self.get_project(project_id)
+        if project is None:
+            return None
+        project_dir = self.get_project_path(project_id)
+        export = {'project': project.model_dump()}
+        for name in ('world', 'characters', 'outline'):
+            data = self.read_json(project_dir / f"{name}.json")
+            if data is not None:
+                export[name] = {**data, 'raw_content': self.read_document_text(project_dir, name)}
+        export['chapters'] = self.read_json(project_dir / "chapters.json") or []
+        return export
     
     def list_projects(self) -> List[ProjectMetadata]:
         """List all projects"""
@@ -73,6 +260,18 @@ class ProjectManager:
     
     def create_project(self, title: str, author: str = "", genre: str = "", description: str = "") -> ProjectMetadata:
         """Create a new project"""
+        project = self._create_project_folder(title, author, genre, description)
+        
+        # Update projects index
+        with _index_lock:
+            projects_data = self._load_projects_index()
+            projects_data[project.id] = project.dict()
+            self._save_projects_index(projects_data)
+        
+        return project
+    
+    def _create_project_folder(self, title: str, author: str = "", genre: str = "", description: str = "") -> ProjectMetadata:
+        """Create a project's folder and metadata.json without adding it to the index"""
         project_id = str(uuid.uuid4())
         now = datetime.now().isoformat()
         
@@ -91,59 +290,175 @@ class ProjectManager:
         project_dir = self.base_path / folder_name
         project_dir.mkdir(exist_ok=True)
         (project_dir / "chapters").mkdir(exist_ok=True)
+        invalidate_cached_path(project_dir, is_dir=True)
+        project.stats_mtime_ns = scan_chapters(project_dir)[0]
         
         # Save project metadata
         self._save_project_metadata(project)
         
-        # Update projects index
-        projects_data = self._load_projects_index()
-        projects_data[project_id] = project.dict()
-        self._save_projects_index(projects_data)
-        
         return project
     
+    def register_projects(self, projects: List[ProjectMetadata]):
+        """Add projects created with import_document(register=False) to the index in one write"""
+        if not projects:
+            return
+        with _index_lock:
+            projects_data = self._load_projects_index()
+            now = datetime.now().isoformat()
+            for project in projects:
+                project.last_modified = now
+                projects_data[project.id] = project.dict()
+                self._save_project_metadata(project)
+            self._save_projects_index(projects_data)
+    
     def delete_project(self, project_id: str) -> bool:
         """Delete a project and all its files"""
-        projects_data = self._load_projects_index()
-        if project_id not in projects_data:
-            return False
-        
-        # Remove project directory
-        project_dir = self.base_path / project_id
-        if project_dir.exists():
-            import shutil
-            shutil.rmtree(project_dir)
-        
-        # Remove from index
-        del projects_data[project_id]
-        self._save_projects_index(projects_data)
-        
-        return True
+        with _index_lock:
+            projects_data = self._load_projects_index()
+            if project_id not in projects_data:
+                return False
+            
+            # Remove project directory
+            project_dir = self.get_project_path(project_id)
+            if project_dir.exists():
+                shutil.rmtree(project_dir)
+                invalidate_cached_path(project_dir, is_dir=True)
+            
+            archive_name = projects_data[project_id].get('archive_name')
+            if archive_name and (self.archive_path / archive_name).exists():
+                (self.archive_path / archive_name).unlink()
+            
+            # Remove from index
+            del projects_data[project_id]
+            self._save_projects_index(projects_data)
+            
+            return True
     
     def update_project(self, project: ProjectMetadata) -> bool:
         """Update an existing project"""
-        projects_data = self._load_projects_index()
-        if project.id not in projects_data:
-            return False
-        
-        project.last_modified = datetime.now().isoformat()
-        
-        # Update index
-        projects_data[project.id] = project.dict()
-        self._save_projects_index(projects_data)
-        
-        # Save project metadata
-        self._save_project_metadata(project)
-        
-        return True
+        with _index_lock:
+            projects_data = self._load_projects_index()
+            if project.id not in projects_data:
+                return False
+            
+            project.last_modified = datetime.now().isoformat()
+            
+            # Update index
+            projects_data[project.id] = project.dict()
+            self._save_projects_index(projects_data)
+            
+            # Save project metadata
+            self._save_project_metadata(project)
+            
+            return True
     
     def _save_project_metadata(self, project: ProjectMetadata):
         """Save project metadata to its directory"""
         project_dir = self.get_project_path(project.id)
-        metadata_file = project_dir / "metadata.json"
-        
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(project.dict(), f, indent=2, ensure_ascii=False)
+        self.write_json(project_dir / "metadata.json", project.dict())
+    
+    def last_activity(self, project_id: str) -> float:
+        """Newest modification time (epoch seconds) of any file in a project folder"""
+        project_dir = self.get_project_path(project_id)
+        newest = 0.0
+        for dirpath, dirnames, filenames in os.walk(project_dir):
+            # Search and chapter indexes are rewritten by the app itself
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            newest = max(newest, os.stat(dirpath).st_mtime)
+            for name in filenames:
+                try:
+                    newest = max(newest, os.stat(os.path.join(dirpath, name)).st_mtime)
+                except FileNotFoundError:
+                    continue
+        return newest
+    
+    def archive_project(self, project_id: str) -> bool:
+        """Pack a project folder into library/archive/<folder>.tar.gz and remove the folder"""
+        with _index_lock:
+            projects_data = self._load_projects_index()
+            if project_id not in projects_data:
+                return False
+            if projects_data[project_id].get('archived'):
+                return True
+            
+            projects_data[project_id] = self._archive_folder(project_id, projects_data[project_id])
+            self._save_projects_index(projects_data)
+            return True
+    
+    def archive_inactive_projects(self, days: int, exclude: Optional[List[str]] = None) -> List[str]:
+        """Archive every project untouched for the given number of days"""
+        with _index_lock:
+            cutoff = time.time() - days * 86400
+            projects_data = self._load_projects_index()
+            archived = []
+            
+            for project_id, data in list(projects_data.items()):
+                if data.get('archived') or (exclude and project_id in exclude):
+                    continue
+                if not self.get_project_path(project_id).is_dir():
+                    continue
+                if self.last_activity(project_id) >= cutoff:
+                    continue
+                try:
+                    projects_data[project_id] = self._archive_folder(project_id, data)
+                    archived.append(project_id)
+                except Exception as e:
+                    print(f"Warning: Failed to archive project {data.get('title', project_id)}: {e}")
+            
+            if archived:
+                self._save_projects_index(projects_data)
+            return archived
+    
+    def _archive_folder(self, project_id: str, data: Dict) -> Dict:
+        """Compress one project folder; returns the updated index entry"""
+        project_dir = self.get_project_path(project_id)
+        if not project_dir.is_dir():
+            raise FileNotFoundError(f"Project folder not found: {project_dir}")
+        
+        archive_name = f"{project_dir.name}.tar.gz"
+        archive_file = self.archive_path / archive_name
+        tmp_file = archive_file.with_name(archive_name + '.tmp')
+        with tarfile.open(tmp_file, 'w:gz') as tar:
+            tar.add(project_dir, arcname=project_dir.name)
+        os.replace(tmp_file, archive_file)
+        
+        shutil.rmtree(project_dir)
+        invalidate_cached_path(project_dir, is_dir=True)
+        print(f"Archived project {data.get('title', project_id)} to {archive_file}")
+        return {**data, 'archived': True, 'archive_name': archive_name}
+    
+    def rehydrate_project(self, project_id: str) -> bool:
+        """Restore an archived project folder so it can be worked on again"""
+        with _index_lock:
+            projects_data = self._load_projects_index()
+            data = projects_data.get(project_id)
+            if data is None:
+                return False
+            if not data.get('archived'):
+                return True
+            
+            archive_file = self.archive_path / data.get('archive_name', '')
+            if not archive_file.is_file():
+                raise FileNotFoundError(f"Archive for project {data.get('title', project_id)} is missing: {archive_file}")
+            
+            base = self.base_path.resolve()
+            with tarfile.open(archive_file, 'r:gz') as tar:
+                members = tar.getmembers()
+                for member in members:
+                    target = (base / member.name).resolve()
+                    if base not in target.parents or member.issym() or member.islnk():
+                        raise ValueError(f"Unsafe path in project archive: {member.name}")
+                tar.extractall(base, members=members)
+            
+            folder = base / members[0].name.split('/')[0] if members else None
+            if folder is not None:
+                invalidate_cached_path(folder, is_dir=True)
+            archive_file.unlink()
+            
+            projects_data[project_id] = {**data, 'archived': False, 'archive_name': ''}
+            self._save_projects_index(projects_data)
+            print(f"Rehydrated project {data.get('title', project_id)}")
+            return True
     
     def _sanitize_folder_name(self, title: str, project_id: str) -> str:
         """Convert title to filesystem-safe folder name"""
@@ -159,124 +474,190 @@ class ProjectManager:
     def get_project_path(self, project_id: str) -> Path:
         """Get the path to a project directory by finding its folder"""
         # Look for folder that contains this project_id
-        for folder in self.base_path.iterdir():
-            if folder.is_dir() and folder.name.endswith(f"-{project_id[:8]}"):
-                return folder
+        folder = self._project_folders().get(project_id[:8])
+        if folder is not None:
+            return folder
         
         # Fallback to old UUID-based path if not found
         return self.base_path / project_id
     
-    def import_novel(self, file_path: str, title: str = "", author: str = "", 
-                    genre: str = "", auto_generate_metadata: bool = True, agent_config: Dict = None) -> ProjectMetadata:
-        """Import a novel from a file and create a new project"""
+    def _project_folders(self) -> Dict[str, Path]:
+        """Map short project IDs to folders, scanning the library only on a cache miss"""
+        key = str(self.base_path.resolve())
+        with _cache_lock:
+            folders = _folder_cache.get(key)
+        if folders is not None and _cache_is_trusted(self.base_path):
+            return folders
+        
+        folders = {}
+        for folder in self.base_path.iterdir():
+            if folder.is_dir() and '-' in folder.name:
+                folders.setdefault(folder.name.rsplit('-', 1)[-1], folder)
         
-        # Parse the document
+        with _cache_lock:
+            _folder_cache[key] = folders
+        return folders
+    
+    def import_novel(self, file_path: str, title: str = "", author: str = "", 
+                    genre: str = "", auto_generate_metadata: bool = True, agent_config: Dict = None,
+                    analysis_mode: str = "sample", progress: Optional[Callable[..., None]] = None,
+                    chapter_total: Optional[int] = None) -> ProjectMetadata:
+        """Import a novel from a file and create a new project
+        
+        analysis_mode "sample" analyzes the opening of the book; "full" summarizes
+        every chapter first (map-reduce), which costs more model calls.
+        progress(event, **fields) is called at each milestone (see core.import_jobs);
+        chapter_total, when known in advance, is reported with each written chapter.
+        """
+        progress = progress or _no_progress
+        
+        # Open the document; chapters stream from the parser (or from the cache
+        # entry written by an earlier analyze of the same file)
         parser = DocumentParser()
-        
-        if file_path.endswith('.docx'):
-            text = parser.parse_docx(file_path)
-        elif file_path.endswith('.odt'):
-            text = parser.parse_odt(file_path)
-        elif file_path.endswith('.epub'):
-            text = parser.parse_epub(file_path)
-        elif file_path.endswith('.mobi'):
-            text = parser.parse_mobi(file_path)
-        else:
-            raise ValueError(f"Unsupported file format: {file_path}. Supported formats: .docx, .odt, .epub")
+        document = ParseCache(str(self.base_path)).open(file_path)
         
         # Extract title and author if not provided
         if not title or not author:
-            # For EPUB files, try metadata extraction first
-            if file_path.endswith('.epub'):
-                epub_title, epub_author = parser.extract_epub_metadata(file_path)
-                title = title or epub_title
-                author = author or epub_author
-            
-            # Fallback to content-based extraction if needed
-            if not title or not author:
-                extracted_title, extracted_author = parser.extract_title_and_author(text, file_path)
-                title = title or extracted_title
-                author = author or extracted_author
+            extracted_title, extracted_author = parser.document_title_and_author(document, file_path)
+            title = title or extracted_title
+            author = author or extracted_author
         
-        # Detect chapters
-        chapters = parser.detect_chapters(text)
+        return self.import_document(document, title, author, genre, auto_generate_metadata, agent_config,
+                                    analysis_mode, progress=progress, chapter_total=chapter_total)
+    
+    def import_document(self, document, title: str, author: str = "", genre: str = "",
+                        auto_generate_metadata: bool = True, agent_config: Optional[Dict] = None,
+                        analysis_mode: str = "sample", register: bool = True,
+                        progress: Optional[Callable[..., None]] = None,
+                        chapter_total: Optional[int] = None) -> ProjectMetadata:
+        """Create a project from an opened document (DocumentStream, e.g. from ParseCache.open)
+        
+        With register=False the project folder is written but not added to the
+        index; pass the projects to register_projects() to add many in one write.
+        A project that fails part-way is removed.
+        """
+        progress = progress or _no_progress
+        if register:
+            project = self.create_project(title, author, genre)
+        else:
+            project = self._create_project_folder(title, author, genre)
+        progress('project_created', project_id=project.id, title=title, author=author)
+        try:
+            self._fill_imported_project(project, document, auto_generate_metadata, agent_config, analysis_mode,
+                                        progress, chapter_total)
+        except Exception:
+            if register:
+                self.delete_project(project.id)
+            else:
+                project_dir = self.get_project_path(project.id)
+                if project_dir.exists():
+                    shutil.rmtree(project_dir)
+                    invalidate_cached_path(project_dir, is_dir=True)
+            raise
         
-        # Create the project
-        project = self.create_project(title, author, genre)
+        # Update project metadata
+        if register:
+            self.update_project(project)
+        
+        return project
+    
+    def _fill_imported_project(self, project: ProjectMetadata, document, auto_generate_metadata: bool,
+                               agent_config: Optional[Dict], analysis_mode: str,
+                               progress: Optional[Callable[..., None]] = None, chapter_total: Optional[int] = None):
+        """Write an opened document's chapters (and analysis) into a new project folder; sets its stats"""
+        progress = progress or _no_progress
+        title, author = project.title, project.author
         project_dir = self.get_project_path(project.id)
         
-        # Save chapters
-        self._save_chapters_to_project(project.id, chapters)
+        # Save chapters as they are detected, keeping only what the analysis needs
+        sample = AnalysisSample()
+        imported = self._save_chapters_to_project(
+            project.id, sample.collect(document.chapters),
+            on_chapter=lambda ch: progress('chapter_written', chapter_number=ch.chapter_number,
+                                           title=ch.title, word_count=ch.word_count, total=chapter_total)
+        )
         
         # Update project stats
-        total_words = sum(len(ch['content'].split()) for ch in chapters)
-        project.chapter_count = len(chapters)
+        total_words = sum(ch.word_count for ch in imported)
+        project.chapter_count = len(imported)
         project.word_count = total_words
+        project.stats_mtime_ns = scan_chapters(project_dir)[0]
+        progress('chapters_written', chapter_count=len(imported), word_count=total_words)
         
         # Generate metadata if requested
         if auto_generate_metadata:
-            analyzer = ImportAnalyzer(agent_config or {})
-            analysis = analyzer.analyze_for_import(chapters, title)
+            analyzer = ImportAnalyzer(agent_config or {}, progress=progress)
+            progress('analysis_started', mode=analysis_mode if analyzer.ai_enabled else 'basic')
+            analysis = None
+            if analysis_mode == "full" and analyzer.ai_enabled:
+                # Chapters are read back from disk one at a time as the summarizer asks for them
+                chapter_store = ChapterStore(project_dir / "chapters")
+                chapters = ({'chapter_number': ch.chapter_number, 'title': ch.title,
+                             'content': chapter_store.read(ch.chapter_number)} for ch in imported)
+                try:
+                    analysis = analyzer.analyze_full_book(chapters, title, len(imported), total_words,
+                                                          SummaryCache(str(self.base_path)))
+                except Exception as e:
+                    print(f"Full-book analysis failed, analyzing the opening chapters instead: {e}")
+            if analysis is None:
+                analysis = analyzer.analyze_for_import(sample.chapters, title, len(imported), total_words)
             
             # Save AI analysis results as structured JSON files
             from .text_to_json import parse_characters_text_to_json, parse_world_text_to_json, parse_outline_text_to_json
-            import json
             
             # Save characters as JSON
             if 'suggested_characters' in analysis:
                 characters_data = parse_characters_text_to_json(analysis['suggested_characters'])
-                with open(project_dir / "characters.json", 'w', encoding='utf-8') as f:
-                    json.dump(characters_data.dict(), f, indent=2, ensure_ascii=False)
+                self.write_document(project_dir, "characters", characters_data)
+                progress('json_written', file="characters.json")
             
             # Save world as JSON  
             if 'suggested_world' in analysis:
                 world_data = parse_world_text_to_json(title, analysis['suggested_world'])
-                with open(project_dir / "world.json", 'w', encoding='utf-8') as f:
-                    json.dump(world_data.dict(), f, indent=2, ensure_ascii=False)
+                self.write_document(project_dir, "world", world_data)
+                progress('json_written', file="world.json")
             
             # Save outline as JSON if available
             if 'suggested_outline' in analysis:
                 outline_data = parse_outline_text_to_json(title, analysis['suggested_outline'])
-                with open(project_dir / "outline.json", 'w', encoding='utf-8') as f:
-                    json.dump(outline_data.dict(), f, indent=2, ensure_ascii=False)
+                self.write_document(project_dir, "outline", outline_data)
+                progress('json_written', file="outline.json")
             
             # Also save traditional import_analysis.txt for reference
             with open(project_dir / "import_analysis.txt", 'w', encoding='utf-8') as f:
                 f.write(f"Import Analysis for: {title}\n")
                 f.write(f"Author: {author}\n")
-                f.write(f"Chapters: {len(chapters)}\n")
-                f.write(f"Words: {total_words}\n\n")
+                f.write(f"Chapters: {len(imported)}\n")
+                f.write(f"Words: {total_words}\n")
+                if analysis.get('analysis_mode') == 'full':
+                    f.write(f"Analysis: full book ({analysis['summarized_chapters']} chapter summaries)\n")
+                f.write("\n")
                 f.write("AI-Generated Analysis:\n")
                 f.write("- characters.json: Structured character data\n")
                 f.write("- world.json: Structured world-building data\n")
                 if 'suggested_outline' in analysis:
                     f.write("- outline.json: Structured story outline\n")
                 f.write(f"\nGenerated: {analysis.get('generated_date', 'Unknown')}\n")
-        
-        # Update project metadata
-        self.update_project(project)
-        
-        return project
     
-    def _save_chapters_to_project(self, project_id: str, chapters: List[Dict]):
-        """Save chapters to a project"""
+    def _save_chapters_to_project(self, project_id: str, chapters: Iterable[Dict],
+                                  on_chapter: Optional[Callable[[ImportedChapter], None]] = None) -> List[ImportedChapter]:
+        """Save chapters to a project, writing each file as soon as it arrives"""
         project_dir = self.get_project_path(project_id)
-        chapters_dir = project_dir / "chapters"
+        chapter_store = ChapterStore(project_dir / "chapters")
         
         # Save individual chapter files
-        for chapter in chapters:
-            chapter_file = chapters_dir / f"chapter_{chapter['chapter_number']}.txt"
-            with open(chapter_file, 'w', encoding='utf-8') as f:
-                f.write(chapter['content'])
+        search_index = get_search_index(str(self.base_path))
+        imported = run_import(chapters, chapter_store, search_index, on_chapter=on_chapter)
         
         # Save chapters.json structure
         chapters_json = []
-        for chapter in chapters:
+        for chapter in imported:
             chapters_json.append({
-                'chapter_number': chapter['chapter_number'],
-                'title': chapter['title'],
-                'prompt': f"Content for {chapter['title']}"  # Basic prompt
+                'chapter_number': chapter.chapter_number,
+                'title': chapter.title,
+                'prompt': f"Content for {chapter.title}"  # Basic prompt
             })
         
-        with open(project_dir / "chapters.json", 'w', encoding='utf-8') as f:
-            json.dump(chapters_json, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+        self.write_json(project_dir / "chapters.json", chapters_json)
+        
+        return imported
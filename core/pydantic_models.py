@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 
 # --- Pydantic Models for Request Bodies ---
@@ -20,6 +20,7 @@ class FinalizeRequestData(BaseModel):
     topic: Optional[str] = None
     num_characters: Optional[int] = 3
     num_chapters: Optional[int] = 10
+    structured: bool = False  # Ask for JSON matching json_schemas instead of free text
 
 class SaveOutlineRequest(BaseModel):
     outline: str
@@ -47,6 +48,7 @@ class ChapterTTSRequest(BaseModel):
     chapter_number: int
     voice: str = "bf_emma"
     response_format: str = "mp3"
+    workers: Optional[int] = Field(None, ge=1, le=16)  # segments synthesized at once (default: tts_pipeline.TTS_WORKERS)
 
 # Project Management Models
 class ProjectMetadata(BaseModel):
@@ -59,6 +61,9 @@ class ProjectMetadata(BaseModel):
     description: str = ""
     chapter_count: int = 0
     word_count: int = 0
+    stats_mtime_ns: int = 0  # newest chapter mtime when the counts were computed
+    archived: bool = False
+    archive_name: str = ""   # file in library/archive/ while archived
 
 class CreateProjectRequest(BaseModel):
     title: str
@@ -67,11 +72,24 @@ class CreateProjectRequest(BaseModel):
     description: str = ""
 
 class ImportAnalysisRequest(BaseModel):
-    file_path: str
+    file_path: str = ""
+    upload: str = ""  # handle from /api/uploads/{upload_id}/complete, instead of file_path
 
 class ImportNovelRequest(BaseModel):
     title: str
     author: str = ""
     genre: str = ""
-    file_path: str
+    file_path: str = ""
+    upload: str = ""
     auto_generate_metadata: bool = True
+    analysis_mode: str = "sample"  # "sample" (opening chapters) or "full" (map-reduce over every chapter)
+
+class UploadStartRequest(BaseModel):
+    filename: str
+    size: Optional[int] = None  # total bytes, checked when the upload completes
+
+class BatchImportRequest(BaseModel):
+    paths: List[str]  # manuscript files and/or directories to scan
+    genre: str = ""
+    workers: Optional[int] = None
+    auto_generate_metadata: bool = False
@@ -0,0 +1,608 @@
+"""
+Library-wide full-text search for hypeWriter
+Inverted index over chapters/*.txt and scene files with phrase and prefix queries
+"""
+
+import html
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .chapter_store import ChapterStore, split_paragraphs
+
+
+TOKEN_RE = re.compile(r"\w+")
+QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+CHAPTER_FILE_RE = re.compile(r'^chapter_(\d+)\.txt$')
+SCENE_DIR_RE = re.compile(r'^chapter_(\d+)_scenes$')
+SCENE_FILE_RE = re.compile(r'^scene_(\d+)\.txt$')
+
+SEARCH_DIR_NAME = ".search"
+MANIFEST_NAME = "terms.json.z"
+INDEX_VERSION = 1
+
+# Folders in the library root that never hold a project
+RESERVED_FOLDERS = {"chapters", "imports", "archive"}
+
+MAX_PREFIX_EXPANSIONS = 50
+SNIPPET_CHARS = 240
+POSITION_CACHE_DOCS = 256
+# How often to re-stat the library when no watcher reports changes
+VERIFY_INTERVAL = 1.0
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return [m.group(0).lower() for m in TOKEN_RE.finditer(text)]
+
+
+class _Doc(NamedTuple):
+    folder: str
+    key: str            # "chapter_3" or "chapter_3/scene_2"
+    path: Path
+    length: int
+    mtime_ns: int
+    size: int
+    terms: Tuple[str, ...]
+    counts: array
+
+
+class _Group(NamedTuple):
+    terms: List[str]    # several terms for a prefix query
+    phrase: bool
+    prefix: bool
+
+
+def doc_key_for_path(path: Path, base_path: Path) -> Optional[Tuple[str, str]]:
+    """Map a chapter or scene file path to (project folder, doc key)
+
+    Only files under base_path/<project>/chapters/ are indexed; anything else
+    (such as the legacy book_output/chapters) gives None.
+    """
+    try:
+        parts = Path(os.path.abspath(path)).relative_to(os.path.abspath(base_path)).parts
+    except ValueError:
+        return None
+    if len(parts) < 3 or parts[1] != "chapters" or parts[0] in RESERVED_FOLDERS or parts[0].startswith('.'):
+        return None
+
+    if len(parts) == 3:
+        chapter = CHAPTER_FILE_RE.match(parts[2])
+        if chapter:
+            return parts[0], f"chapter_{chapter.group(1)}"
+    elif len(parts) == 4:
+        scene_dir = SCENE_DIR_RE.match(parts[2])
+        scene = SCENE_FILE_RE.match(parts[3])
+        if scene and scene_dir:
+            return parts[0], f"chapter_{scene_dir.group(1)}/scene_{scene.group(1)}"
+    return None
+
+
+class SearchIndex:
+    """In-memory term dictionary backed by per-project segments on disk"""
+
+    def __init__(self, base_path: str = "library"):
+        self.base_path = Path(base_path)
+        self._lock = threading.RLock()
+        self._docs: Dict[int, _Doc] = {}
+        self._doc_ids: Dict[Tuple[str, str], int] = {}
+        self._next_doc_id = 0
+        # term -> (doc ids, term frequencies)
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._sorted_terms: Optional[List[str]] = None
+        self._total_length = 0
+        # doc id -> delta-encoded positions as stored on disk, decoded per term on demand
+        self._positions: "OrderedDict[int, Dict[str, List[int]]]" = OrderedDict()
+        self._dirty_paths: Set[Path] = set()
+        self._dirty_folders: Set[str] = set()
+        self._manifests_dirty: Set[str] = set()
+        self._loaded = False
+        self._last_verify = 0.0
+        # Set once subscribed to the library watcher; until then changes are found by stat
+        self.watched = False
+
+    # --- Change tracking ---
+
+    def mark_changed(self, path):
+        """Queue a chapter/scene file (or a whole project folder) for reindexing"""
+        path = Path(path)
+        with self._lock:
+            if doc_key_for_path(path, self.base_path) is not None:
+                self._dirty_paths.add(path)
+            elif path.parent.resolve() == self.base_path.resolve():
+                self._dirty_folders.add(path.name)
+            else:
+                # Chapters or scene folders: rescan the owning project
+                try:
+                    folder = path.resolve().relative_to(self.base_path.resolve()).parts[0]
+                except (ValueError, IndexError):
+                    return
+                self._dirty_folders.add(folder)
+
+    def mark_all_changed(self):
+        with self._lock:
+            self._loaded = False
+
+    def on_file_events(self, events):
+        """Library watcher subscriber"""
+        for event in events:
+            if event.kind == "rescan":
+                self.mark_all_changed()
+                return
+            parts = event.path.parts
+            if SEARCH_DIR_NAME in parts or any(p == ".index" for p in parts):
+                continue
+            if event.is_dir or event.path.suffix == ".txt":
+                self.mark_changed(event.path)
+
+    # --- Index maintenance ---
+
+    def _project_folders(self) -> List[str]:
+        if not self.base_path.is_dir():
+            return []
+        return [
+            entry.name for entry in os.scandir(self.base_path)
+            if entry.is_dir() and not entry.name.startswith('.') and entry.name not in RESERVED_FOLDERS
+        ]
+
+    def _scan_folder(self, folder: str) -> Dict[str, Path]:
+        """List indexable documents of a project folder"""
+        chapters_dir = self.base_path / folder / "chapters"
+        docs = {}
+        if not chapters_dir.is_dir():
+            return docs
+        for entry in os.scandir(chapters_dir):
+            if entry.is_file() and CHAPTER_FILE_RE.match(entry.name):
+                docs[entry.name[:-4]] = Path(entry.path)
+            elif entry.is_dir() and SCENE_DIR_RE.match(entry.name):
+                for scene in os.scandir(entry.path):
+                    if scene.is_file() and SCENE_FILE_RE.match(scene.name):
+                        docs[f"{entry.name[:-7]}/{scene.name[:-4]}"] = Path(scene.path)
+        return docs
+
+    def _sync(self):
+        """Bring the in-memory index up to date with the library"""
+        from .watcher import is_watched
+
+        with self._lock:
+            now = time.monotonic()
+            if not self._loaded:
+                self._reset()
+                folders = self._project_folders()
+                for folder in folders:
+                    self._load_manifest(folder)
+                self._dirty_folders.update(folders)
+                self._loaded = True
+                self._last_verify = now
+            elif not (self.watched and is_watched(self.base_path)) and now - self._last_verify >= VERIFY_INTERVAL:
+                # Without a watcher, external edits are only found by stat
+                self._dirty_folders.update(self._project_folders())
+                self._dirty_folders.update(doc.folder for doc in self._docs.values())
+                self._last_verify = now
+
+            for folder in list(self._dirty_folders):
+                self._sync_folder(folder)
+            self._dirty_folders.clear()
+
+            for path in list(self._dirty_paths):
+                self._sync_path(path)
+            self._dirty_paths.clear()
+
+            for folder in list(self._manifests_dirty):
+                self._save_manifest(folder)
+            self._manifests_dirty.clear()
+
+    def _sync_folder(self, folder: str):
+        current = self._scan_folder(folder) if (self.base_path / folder).is_dir() else {}
+        for (doc_folder, key), doc_id in list(self._doc_ids.items()):
+            if doc_folder == folder and key not in current:
+                self._remove_doc(doc_id)
+        for key, path in current.items():
+            self._sync_path(path)
+
+    def _sync_path(self, path: Path):
+        ident = doc_key_for_path(path, self.base_path)
+        if ident is None:
+            return
+        doc_id = self._doc_ids.get(ident)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            if doc_id is not None:
+                self._remove_doc(doc_id)
+            return
+
+        if doc_id is not None:
+            doc = self._docs[doc_id]
+            if doc.mtime_ns == stat.st_mtime_ns and doc.size == stat.st_size:
+                return
+            self._remove_doc(doc_id)
+        self._index_file(ident, path, stat)
+
+    def _read_text(self, ident: Tuple[str, str], path: Path) -> str:
+        if '/' not in ident[1]:
+            chapter_number = int(ident[1].split('_')[1])
+            return ChapterStore(path.parent).read(chapter_number)
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+
+    def _index_file(self, ident: Tuple[str, str], path: Path, stat: os.stat_result):
+        folder, key = ident
+        text = self._read_text(ident, path)
+
+        positions: Dict[str, List[int]] = {}
+        length = 0
+        for para_no, paragraph in enumerate(split_paragraphs(text)):
+            for pos, token in enumerate(tokenize(paragraph)):
+                positions.setdefault(token, []).extend((para_no, pos))
+                length += 1
+
+        tf = {term: len(flat) // 2 for term, flat in positions.items()}
+        self._write_positions(folder, key, positions)
+        self._add_doc(folder, key, path, length, stat.st_mtime_ns, stat.st_size, tf)
+        self._manifests_dirty.add(folder)
+
+    def _add_doc(self, folder: str, key: str, path: Path, length: int,
+                 mtime_ns: int, size: int, tf: Dict[str, int]):
+        doc_id = self._next_doc_id
+        self._next_doc_id += 1
+        # Interned terms are shared between the doc record and the postings dict
+        terms = tuple(sys.intern(term) for term in tf)
+        self._docs[doc_id] = _Doc(folder, key, path, length, mtime_ns, size, terms, array('I', tf.values()))
+        self._doc_ids[(folder, key)] = doc_id
+        self._total_length += length
+
+        for term, count in zip(terms, tf.values()):
+            entry = self._postings.get(term)
+            if entry is None:
+                entry = self._postings[term] = (array('I'), array('I'))
+                self._sorted_terms = None
+            entry[0].append(doc_id)
+            entry[1].append(count)
+
+    def _remove_doc(self, doc_id: int):
+        doc = self._docs.pop(doc_id)
+        del self._doc_ids[(doc.folder, doc.key)]
+        self._total_length -= doc.length
+        self._positions.pop(doc_id, None)
+        self._manifests_dirty.add(doc.folder)
+
+        for term in doc.terms:
+            doc_ids, counts = self._postings[term]
+            # Doc ids are handed out in increasing order and appended, so postings stay sorted
+            i = bisect_left(doc_ids, doc_id)
+            del doc_ids[i]
+            del counts[i]
+            if not doc_ids:
+                del self._postings[term]
+                self._sorted_terms = None
+
+        try:
+            self._positions_path(doc.folder, doc.key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _reset(self):
+        self._docs.clear()
+        self._doc_ids.clear()
+        self._postings.clear()
+        self._positions.clear()
+        self._sorted_terms = None
+        self._total_length = 0
+
+    # --- On-disk segments ---
+
+    def _search_dir(self, folder: str) -> Path:
+        return self.base_path / folder / SEARCH_DIR_NAME
+
+    def _doc_path(self, folder: str, key: str) -> Path:
+        chapter_part, _, scene_part = key.partition('/')
+        chapters_dir = self.base_path / folder / "chapters"
+        if scene_part:
+            return chapters_dir / f"{chapter_part}_scenes" / f"{scene_part}.txt"
+        return chapters_dir / f"{chapter_part}.txt"
+
+    def _positions_path(self, folder: str, key: str) -> Path:
+        return self._search_dir(folder) / (key.replace('/', '__') + ".pos.z")
+
+    def _write_positions(self, folder: str, key: str, positions: Dict[str, List[int]]):
+        # Delta-encode paragraph numbers and in-paragraph positions so zlib packs them tightly
+        encoded = {}
+        for term, flat in positions.items():
+            out = []
+            last_para, last_pos = 0, 0
+            for i in range(0, len(flat), 2):
+                para, pos = flat[i], flat[i + 1]
+                if para != last_para:
+                    last_pos = 0
+                out.append(para - last_para)
+                out.append(pos - last_pos)
+                last_para, last_pos = para, pos
+            encoded[term] = out
+        _write_compressed(self._positions_path(folder, key), encoded)
+
+    def _read_positions(self, doc_id: int) -> Dict[str, List[int]]:
+        encoded = self._positions.get(doc_id)
+        if encoded is not None:
+            self._positions.move_to_end(doc_id)
+            return encoded
+
+        doc = self._docs[doc_id]
+        encoded = _read_compressed(self._positions_path(doc.folder, doc.key)) or {}
+        self._positions[doc_id] = encoded
+        while len(self._positions) > POSITION_CACHE_DOCS:
+            self._positions.popitem(last=False)
+        return encoded
+
+    def _term_positions(self, doc_id: int, term: str) -> List[Tuple[int, int]]:
+        """Decode (paragraph, position) pairs of one term in one doc"""
+        flat = self._read_positions(doc_id).get(term, ())
+        pairs = []
+        para, pos = 0, 0
+        for i in range(0, len(flat), 2):
+            if flat[i]:
+                para += flat[i]
+                pos = 0
+            pos += flat[i + 1]
+            pairs.append((para, pos))
+        return pairs
+
+    def _load_manifest(self, folder: str):
+        manifest = _read_compressed(self._search_dir(folder) / MANIFEST_NAME)
+        if not manifest or manifest.get('version') != INDEX_VERSION:
+            return
+        for key, entry in manifest.get('docs', {}).items():
+            path = self._doc_path(folder, key)
+            self._add_doc(folder, key, path, entry['length'], entry['mtime_ns'], entry['size'], entry['tf'])
+
+    def _save_manifest(self, folder: str):
+        if not (self.base_path / folder).is_dir():
+            return
+        docs = {}
+        for doc_id, doc in self._docs.items():
+            if doc.folder != folder:
+                continue
+            tf = dict(zip(doc.terms, doc.counts))
+            docs[doc.key] = {'length': doc.length, 'mtime_ns': doc.mtime_ns, 'size': doc.size, 'tf': tf}
+        _write_compressed(self._search_dir(folder) / MANIFEST_NAME, {'version': INDEX_VERSION, 'docs': docs})
+
+    # --- Queries ---
+
+    def _parse_query(self, query: str) -> List[_Group]:
+        groups = []
+        for match in QUERY_RE.finditer(query):
+            phrase, word = match.groups()
+            if phrase is not None:
+                terms = tokenize(phrase)
+                if len(terms) == 1:
+                    groups.append(_Group(terms, False, False))
+                elif terms:
+                    groups.append(_Group(terms, True, False))
+                continue
+
+            terms = tokenize(word)
+            prefix = word.endswith('*')
+            for i, term in enumerate(terms):
+                groups.append(_Group([term], False, prefix and i == len(terms) - 1))
+        return groups
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        terms = []
+        i = bisect_left(self._sorted_terms, prefix)
+        while i < len(self._sorted_terms) and self._sorted_terms[i].startswith(prefix):
+            terms.append(self._sorted_terms[i])
+            if len(terms) >= MAX_PREFIX_EXPANSIONS:
+                break
+            i += 1
+        return terms
+
+    def _group_postings(self, group: _Group) -> Dict[int, int]:
+        """Combined term frequencies per doc for a group of alternatives"""
+        terms = self._expand_prefix(group.terms[0]) if group.prefix else group.terms
+        combined: Dict[int, int] = {}
+        for term in terms:
+            entry = self._postings.get(term)
+            if entry is None:
+                continue
+            for doc_id, count in zip(*entry):
+                combined[doc_id] = combined.get(doc_id, 0) + count
+        return combined
+
+    def search(self, query: str, project_folders: Optional[Iterable[str]] = None, limit: int = 20) -> Dict:
+        """Run a query; every word, phrase and prefix in it must match"""
+        started = time.perf_counter()
+        self._sync()
+
+        with self._lock:
+            groups = self._parse_query(query)
+            if not groups:
+                return {'query': query, 'total': 0, 'results': [], 'took_ms': 0.0}
+
+            allowed = set(project_folders) if project_folders is not None else None
+            n_docs = max(len(self._docs), 1)
+            avg_length = self._total_length / n_docs if self._docs else 1.0
+
+            # Each phrase word and each plain word contributes its own postings
+            scored_groups: List[Tuple[_Group, Dict[int, int]]] = []
+            for group in groups:
+                if group.phrase:
+                    for term in group.terms:
+                        scored_groups.append((_Group([term], False, False), self._group_postings(_Group([term], False, False))))
+                else:
+                    scored_groups.append((group, self._group_postings(group)))
+
+            scored_groups.sort(key=lambda item: len(item[1]))
+            candidates = set(scored_groups[0][1])
+            for _, postings in scored_groups[1:]:
+                candidates.intersection_update(postings)
+                if not candidates:
+                    break
+            if allowed is not None:
+                candidates = {d for d in candidates if self._docs[d].folder in allowed}
+
+            scores = {}
+            for doc_id in candidates:
+                doc_length = self._docs[doc_id].length
+                score = 0.0
+                for _, postings in scored_groups:
+                    df = len(postings)
+                    tf = postings[doc_id]
+                    idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                    score += idf * tf * (BM25_K1 + 1) / (
+                        tf + BM25_K1 * (1 - BM25_B + BM25_B * doc_length / avg_length))
+                scores[doc_id] = score
+
+            phrases = [g for g in groups if g.phrase]
+            results = []
+            total = 0
+            for doc_id in sorted(scores, key=scores.get, reverse=True):
+                if phrases and not self._phrase_paragraphs(doc_id, phrases):
+                    continue
+                total += 1
+                if len(results) < limit:
+                    # Positions are only decoded for the documents that are shown
+                    paragraph = self._best_paragraph(doc_id, groups, phrases)
+                    results.append(self._result(doc_id, scores[doc_id], paragraph, groups))
+
+            return {
+                'query': query,
+                'total': total,
+                'results': results,
+                'took_ms': round((time.perf_counter() - started) * 1000, 2),
+            }
+
+    def _phrase_paragraphs(self, doc_id: int, phrases: List[_Group]) -> Set[int]:
+        """Paragraphs in which every phrase occurs word for word"""
+        paragraphs: Optional[Set[int]] = None
+        for phrase in phrases:
+            found = set()
+            term_sets = [set(self._term_positions(doc_id, term)) for term in phrase.terms]
+            for para, pos in term_sets[0]:
+                if all((para, pos + i) in term_sets[i] for i in range(1, len(phrase.terms))):
+                    found.add(para)
+            if not found:
+                return set()
+            # Different phrases may sit in different paragraphs of the same chapter
+            paragraphs = found if paragraphs is None else (paragraphs & found or paragraphs)
+        return paragraphs or set()
+
+    def _best_paragraph(self, doc_id: int, groups: List[_Group], phrases: List[_Group]) -> int:
+        """Pick the paragraph with the most query hits to show as a snippet"""
+        phrase_paragraphs = self._phrase_paragraphs(doc_id, phrases) if phrases else None
+
+        hits: Dict[int, int] = {}
+        for group in groups:
+            if group.prefix:
+                terms = [t for t in self._read_positions(doc_id) if t.startswith(group.terms[0])]
+            else:
+                terms = group.terms
+            for term in terms:
+                for para, _ in self._term_positions(doc_id, term):
+                    if phrase_paragraphs is None or para in phrase_paragraphs:
+                        hits[para] = hits.get(para, 0) + 1
+        if not hits:
+            return min(phrase_paragraphs) if phrase_paragraphs else 0
+        return max(hits, key=lambda para: (hits[para], -para))
+
+    def _result(self, doc_id: int, score: float, paragraph_no: int, groups: List[_Group]) -> Dict:
+        doc = self._docs[doc_id]
+        chapter_part, _, scene_part = doc.key.partition('/')
+        chapter_number = int(chapter_part.split('_')[1])
+
+        if scene_part:
+            with open(doc.path, 'r', encoding='utf-8', errors='replace') as f:
+                paragraphs = split_paragraphs(f.read())
+            paragraph = paragraphs[paragraph_no] if paragraph_no < len(paragraphs) else ""
+        else:
+            found = ChapterStore(doc.path.parent).paragraphs(chapter_number, paragraph_no, paragraph_no + 1)
+            paragraph = found[0] if found else ""
+
+        return {
+            'folder': doc.folder,
+            'doc': doc.key,
+            'chapter_number': chapter_number,
+            'scene_number': int(scene_part.split('_')[1]) if scene_part else None,
+            'paragraph': paragraph_no,
+            'score': round(score, 4),
+            'snippet': highlight(paragraph, groups),
+        }
+
+
+def highlight(paragraph: str, groups: List[_Group], width: int = SNIPPET_CHARS) -> str:
+    """HTML snippet of a paragraph with query terms wrapped in <mark>"""
+    exact = {term for g in groups if not g.prefix for term in g.terms}
+    prefixes = tuple(g.terms[0] for g in groups if g.prefix)
+
+    spans = []
+    for match in TOKEN_RE.finditer(paragraph):
+        token = match.group(0).lower()
+        if token in exact or (prefixes and token.startswith(prefixes)):
+            spans.append(match.span())
+
+    start = 0
+    if spans and len(paragraph) > width:
+        start = max(0, spans[0][0] - width // 3)
+    end = min(len(paragraph), start + width)
+
+    out = ['…' if start > 0 else '']
+    cursor = start
+    for s, e in spans:
+        if s < start or e > end:
+            continue
+        out.append(html.escape(paragraph[cursor:s]))
+        out.append(f"<mark>{html.escape(paragraph[s:e])}</mark>")
+        cursor = e
+    out.append(html.escape(paragraph[cursor:end]))
+    if end < len(paragraph):
+        out.append('…')
+    return ''.join(out)
+
+
+def _write_compressed(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(zlib.compress(json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8'), 6))
+    os.replace(tmp_path, path)
+
+
+def _read_compressed(path: Path):
+    try:
+        with open(path, 'rb') as f:
+            return json.loads(zlib.decompress(f.read()).decode('utf-8'))
+    except (FileNotFoundError, zlib.error, ValueError):
+        return None
+
+
+# Keyed by resolved base path, so each library gets its own index
+_indexes: Dict[str, SearchIndex] = {}
+_index_lock = threading.Lock()
+
+
+def get_search_index(base_path: str = "library") -> SearchIndex:
+    """Process-wide search index for a library, subscribed to its watcher when one runs"""
+    key = str(Path(base_path).resolve())
+    with _index_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = SearchIndex(base_path)
+            from .watcher import get_library_watcher
+            watcher = get_library_watcher()
+            if watcher is not None and str(watcher.base_path) == key:
+                watcher.subscribe(index.on_file_events)
+                index.watched = True
+        return index
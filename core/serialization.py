@@ -0,0 +1,72 @@
+"""
+JSON serialization for hypeWriter
+Project files and API responses go through here. orjson is used when it is
+installed and the standard library otherwise; library files are written
+compact, and pretty printing is only for exports.
+"""
+
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # Models may be passed straight in; they are dumped during encoding
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, Path):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data: Any, pretty: bool = False) -> bytes:
+    """UTF-8 JSON; non-ASCII text is kept as is"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, default=_default, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data) -> Any:
+    """Parse JSON from bytes or str; raises ValueError if it is invalid"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_file(path) -> Any:
+    """Parse a JSON file; raises FileNotFoundError or ValueError"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def write_atomic(path, data: bytes):
+    """Write a file through a temporary file of its own, so readers never see half of it
+
+    Each writer gets a uniquely named temporary file; concurrent writes to the
+    same path all succeed and the last one replaced wins.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_file(path, data: Any, pretty: bool = False):
+    """Write a JSON file through a temporary file, so readers never see half of it"""
+    write_atomic(path, dumps(data, pretty))
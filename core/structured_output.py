@@ -0,0 +1,283 @@
+"""
+Structured (JSON) output for world, character and outline finalization
+The json_schemas models are turned into Gemini response schemas, and the
+streamed JSON is parsed as it arrives, so each finished character or chapter
+can be validated and saved before the rest of the document is generated.
+"""
+
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from .json_schemas import CharactersData, ChapterOutline, Character, OutlineData, WorldData
+
+
+# Filled in by us after generation, never asked of the model
+GENERATED_FIELDS = ('generated_date', 'raw_content')
+
+# kind -> (document model, list field streamed item by item, item model)
+DOCUMENT_KINDS: Dict[str, Tuple[Type[BaseModel], Optional[str], Optional[Type[BaseModel]]]] = {
+    'world': (WorldData, None, None),
+    'characters': (CharactersData, 'characters', Character),
+    'outline': (OutlineData, 'chapters', ChapterOutline),
+}
+
+_SCHEMA_KEYS = ('type', 'description', 'enum', 'format')
+
+
+def response_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Gemini response_schema for a json_schemas model
+
+    Gemini accepts an OpenAPI subset: $refs are inlined, Optional[X] becomes
+    nullable X, free-form Dict fields and GENERATED_FIELDS are left out, and every
+    remaining property is required so the model fills it rather than skipping it.
+    """
+    schema = model.model_json_schema()
+    definitions = schema.get('$defs', {})
+
+    def convert(node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if '$ref' in node:
+            node = definitions[node['$ref'].rsplit('/', 1)[-1]]
+        nullable = False
+        if 'anyOf' in node:
+            options = [option for option in node['anyOf'] if option.get('type') != 'null']
+            if len(options) != 1:
+                return None
+            nullable = len(options) < len(node['anyOf'])
+            node = options[0] if '$ref' not in options[0] else definitions[options[0]['$ref'].rsplit('/', 1)[-1]]
+
+        converted = {key: node[key] for key in _SCHEMA_KEYS if key in node}
+        if nullable:
+            converted['nullable'] = True
+        if node.get('type') == 'object':
+            properties = {}
+            for name, child in node.get('properties', {}).items():
+                if name in GENERATED_FIELDS:
+                    continue
+                child = convert(child)
+                if child is not None:
+                    properties[name] = child
+            if not properties:
+                # Dict[str, Any] and other free-form objects cannot be described
+                return None
+            converted['properties'] = properties
+            converted['required'] = list(properties)
+        elif node.get('type') == 'array':
+            items = convert(node.get('items', {}))
+            if items is None:
+                return None
+            converted['items'] = items
+        elif 'type' not in node:
+            return None
+        return converted
+
+    return convert(schema)
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING_BODY = re.compile(r'(?:[^"\\]|\\.)*', re.DOTALL)
+_SCALAR = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null')
+_SCALAR_RUN = re.compile(r'[-+.\w]*')
+
+
+class _Frame:
+    __slots__ = ('container', 'path', 'key')
+
+    def __init__(self, container, path: Tuple):
+        self.container = container
+        self.path = path
+        self.key = None
+
+
+class IncrementalJSONParser:
+    """Parses one JSON document fed in arbitrary chunks
+
+    feed() returns the items completed by that chunk of every array whose path is
+    in item_paths, as (path, value) pairs; a path is a tuple of object keys and
+    list indexes from the root, e.g. ('characters',). Text before the opening
+    brace or bracket (such as a ```json fence) and after the document is ignored.
+    A string cut by a chunk boundary is resumed where scanning stopped, so long
+    strings are not rescanned for every chunk.
+    """
+
+    def __init__(self, item_paths: Iterable[Tuple] = ()):
+        self.item_paths = {tuple(path) for path in item_paths}
+        self.done = False
+        self._buffer = ''
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._started = False
+        self._value = None
+        # Offset from _pos where scanning of an unfinished string stopped
+        self._string_scanned = 1
+
+    def feed(self, chunk: str) -> List[Tuple[Tuple, Any]]:
+        if self.done:
+            return []
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        completed: List[Tuple[Tuple, Any]] = []
+        self._parse(completed, final=False)
+        return completed
+
+    def close(self) -> Any:
+        """The parsed document; raises ValueError if it is incomplete"""
+        if not self.done:
+            self._parse([], final=True)
+        if not self.done:
+            raise ValueError("Incomplete JSON document")
+        return self._value
+
+    def _parse(self, completed: List, final: bool):
+        buffer = self._buffer
+        end = len(buffer)
+        pos = self._pos
+        while not self.done:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos >= end:
+                break
+            char = buffer[pos]
+            if not self._started:
+                if char in '{[':
+                    self._started = True
+                else:
+                    pos += 1
+                    continue
+
+            if char in '{[':
+                self._stack.append(_Frame({} if char == '{' else [], self._child_path()))
+                pos += 1
+            elif char in '}]':
+                if not self._stack:
+                    raise ValueError(f"Unexpected '{char}' in JSON")
+                frame = self._stack.pop()
+                pos += 1
+                self._complete(frame.container, completed)
+            elif char in ',:':
+                pos += 1
+            elif char == '"':
+                match = _STRING_BODY.match(buffer, pos + self._string_scanned)
+                if match.end() >= end or buffer[match.end()] != '"':
+                    # Unterminated so far (possibly ending in half an escape)
+                    self._string_scanned = match.end() - pos
+                    break
+                value = json.loads(buffer[pos:match.end() + 1], strict=False)
+                pos = match.end() + 1
+                self._string_scanned = 1
+                frame = self._stack[-1] if self._stack else None
+                if frame is not None and isinstance(frame.container, dict) and frame.key is None:
+                    frame.key = value
+                else:
+                    self._complete(value, completed)
+            else:
+                run = _SCALAR_RUN.match(buffer, pos)
+                if run.end() >= end and not final:
+                    # The number or literal may continue in the next chunk
+                    break
+                if not _SCALAR.fullmatch(run.group(0)):
+                    raise ValueError(f"Invalid JSON near {buffer[pos:pos + 20]!r}")
+                self._complete(json.loads(run.group(0)), completed)
+                pos = run.end()
+        self._pos = pos
+
+    def _child_path(self) -> Tuple:
+        if not self._stack:
+            return ()
+        parent = self._stack[-1]
+        if isinstance(parent.container, dict):
+            return parent.path + (parent.key,)
+        return parent.path + (len(parent.container),)
+
+    def _complete(self, value, completed: List):
+        if not self._stack:
+            self._value = value
+            self.done = True
+            return
+        parent = self._stack[-1]
+        if isinstance(parent.container, dict):
+            if parent.key is None:
+                raise ValueError("JSON object member without a key")
+            parent.container[parent.key] = value
+            parent.key = None
+        else:
+            parent.container.append(value)
+            if parent.path in self.item_paths:
+                completed.append((parent.path, value))
+
+
+class StructuredDocument:
+    """A world, characters or outline document arriving as streamed JSON
+
+    feed() returns the characters or chapters completed by each chunk, already
+    validated; partial() is the document so far, finish() the whole document.
+    """
+
+    def __init__(self, kind: str, title: str = ""):
+        if kind not in DOCUMENT_KINDS:
+            raise ValueError(f"Unknown document kind: {kind}")
+        self.kind = kind
+        self.title = title
+        self.model, self.items_field, self.item_model = DOCUMENT_KINDS[kind]
+        self.items: List[BaseModel] = []
+        self._chunks: List[str] = []
+        self._parser = IncrementalJSONParser([(self.items_field,)] if self.items_field else [])
+
+    @property
+    def text(self) -> str:
+        return ''.join(self._chunks)
+
+    def feed(self, chunk: str) -> List[BaseModel]:
+        self._chunks.append(chunk)
+        added = []
+        for _, value in self._parser.feed(chunk):
+            try:
+                item = self.item_model.model_validate(value)
+            except ValidationError as e:
+                print(f"Skipping invalid {self.items_field[:-1]} in structured output: {e}")
+                continue
+            self.items.append(item)
+            added.append(item)
+        return added
+
+    def partial(self) -> BaseModel:
+        """The validated items so far in an otherwise empty document"""
+        if self.kind == 'world':
+            document = WorldData.from_ai_text(self.title, self.text)
+        elif self.kind == 'characters':
+            document = CharactersData.from_ai_text(self.text)
+        else:
+            document = OutlineData.from_ai_text(self.title, self.text)
+        if self.items_field:
+            setattr(document, self.items_field, list(self.items))
+        return document
+
+    def finish(self) -> BaseModel:
+        """The complete document; raises ValueError if the JSON is incomplete or invalid"""
+        data = self._parser.close()
+        if not isinstance(data, dict):
+            raise ValueError("Structured output is not a JSON object")
+        if self.items_field:
+            # Items were validated as they arrived; invalid ones are already dropped
+            data[self.items_field] = list(self.items)
+        if self.kind == 'world' and self.title and not data.get('title'):
+            data['title'] = self.title
+        data['generated_date'] = datetime.now().isoformat()
+        data['raw_content'] = self.text
+        try:
+            return self.model.model_validate(data)
+        except ValidationError as e:
+            raise ValueError(f"Structured output does not match {self.model.__name__}: {e}")
+
+
+def outline_chapters(outline: OutlineData) -> List[Dict]:
+    """Chapter list in the chapters.json format, from a structured outline"""
+    chapters = []
+    for chapter in sorted(outline.chapters, key=lambda c: c.chapter_number):
+        prompt = chapter.summary
+        if chapter.plot_points:
+            prompt += "\n" + "\n".join(f"* {point}" for point in chapter.plot_points)
+        chapters.append({"chapter_number": chapter.chapter_number, "title": chapter.title, "prompt": prompt})
+    return chapters
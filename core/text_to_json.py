@@ -2,62 +2,145 @@
 Convert AI-generated text content to structured JSON
 """
 
+import json
 import re
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Type
+from pydantic import BaseModel, ValidationError
 from .json_schemas import WorldData, CharactersData, OutlineData, Character, CharacterRelationship
 
+# Keyword rules: (label, keywords) pairs, checked in order. Keywords match as
+# case-insensitive substrings, so 'magic' also counts 'magical'.
+Rules = Sequence[Tuple[str, Tuple[str, ...]]]
+
+WORLD_GENRE_RULES: Rules = (
+    ("Dystopian/Post-Apocalyptic", ('dystopian', 'post-apocalyptic', 'wasteland')),
+    ("Fantasy", ('fantasy', 'magic', 'wizard', 'spell')),
+    ("Science Fiction", ('sci-fi', 'science fiction', 'space', 'future', 'technology')),
+    ("Horror", ('horror', 'terror', 'nightmare', 'fear')),
+)
+
+WORLD_PERIOD_RULES: Rules = (
+    ("Medieval", ('medieval', 'middle ages', 'knights', 'castles')),
+    ("Modern", ('modern', 'contemporary', 'present day')),
+    ("Future", ('future', 'futuristic', 'advanced', 'space age')),
+    ("Post-Apocalyptic", ('post-apocalyptic', 'after the', 'ruins', 'wasteland')),
+)
+
+WORLD_MAGIC_RULES: Rules = (
+    ("Unknown magic system", ('magic', 'spell', 'wizard', 'mage', 'enchant', 'arcane')),
+)
+
+WORLD_THEME_RULES: Rules = (
+    ("Survival", ('survival',)),
+    ("Power and Corruption", ('power', 'corruption', 'authority')),
+    ("Good vs Evil", ('good', 'evil', 'moral', 'ethics')),
+    ("Sacrifice and Loss", ('sacrifice', 'loss', 'death')),
+    ("Technology and Progress", ('technology', 'progress', 'advancement')),
+)
+
+CHARACTER_ROLE_RULES: Rules = (
+    ("protagonist", ('protagonist', 'main character', 'hero')),
+    ("antagonist", ('antagonist', 'villain', 'enemy')),
+)
+
+CHARACTER_IMPORTANCE_RULES: Rules = (
+    ("main", ('main character', 'protagonist')),
+    ("minor", ('minor', 'background', 'brief')),
+)
+
+OUTLINE_GENRE_RULES: Rules = (
+    ("Science Fiction", ('sci-fi', 'science fiction', 'space', 'future')),
+    ("Fantasy", ('fantasy', 'magic', 'wizard')),
+    ("Mystery", ('mystery', 'detective', 'crime')),
+    ("Romance", ('romance', 'love', 'relationship')),
+)
+
+OUTLINE_THEME_RULES: Rules = (
+    ("Identity", ('identity',)),
+    ("Friendship", ('friendship',)),
+    ("Survival", ('survival',)),
+    ("Power and Corruption", ('power', 'corruption')),
+)
+
+
+class KeywordMatcher:
+    """Rule tables evaluated against one text
+
+    The text is lowercased once and each distinct keyword is searched for at
+    most once, however many rules share it. A combined regex over all keywords
+    was measured slower than str's own substring search at this table size.
+    """
+
+    def __init__(self, text: str):
+        self._text = text.lower()
+        self._found: Dict[str, bool] = {}
+
+    def __contains__(self, keyword: str) -> bool:
+        found = self._found.get(keyword)
+        if found is None:
+            found = self._found[keyword] = keyword in self._text
+        return found
+
+    def first_match(self, rules: Rules) -> Optional[str]:
+        """Label of the first rule with a keyword in the text"""
+        for label, keywords in rules:
+            if any(keyword in self for keyword in keywords):
+                return label
+        return None
+
+    def all_matches(self, rules: Rules) -> List[str]:
+        """Labels of every rule with a keyword in the text, in rule order"""
+        return [label for label, keywords in rules if any(keyword in self for keyword in keywords)]
+
+
+# "- **Trait**" / "* **Trait:** description"
+_BULLET_TERM = re.compile(r'[*-]\s*\*\*([^*]+)\*\*')
+
+
+def _from_json(model: Type[BaseModel], ai_content: str) -> Optional[BaseModel]:
+    """The document itself if ai_content is already JSON for model (structured finalization)"""
+    if not ai_content.lstrip().startswith('{'):
+        return None
+    try:
+        data = json.loads(ai_content)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    data.setdefault('generated_date', datetime.now().isoformat())
+    data['raw_content'] = ai_content
+    try:
+        return model.model_validate(data)
+    except ValidationError:
+        return None
+
 def parse_world_text_to_json(title: str, ai_content: str) -> WorldData:
     """Parse AI-generated world text into structured JSON"""
     
+    structured = _from_json(WorldData, ai_content)
+    if structured:
+        return structured
+    
     # Initialize with basic structure
     world_data = WorldData.from_ai_text(title, ai_content)
     
     # Try to extract structured information from the text
-    content_lower = ai_content.lower()
+    keywords = KeywordMatcher(ai_content)
     
-    # Extract genre
-    if any(word in content_lower for word in ['dystopian', 'post-apocalyptic', 'wasteland']):
-        world_data.genre = "Dystopian/Post-Apocalyptic"
-    elif any(word in content_lower for word in ['fantasy', 'magic', 'wizard', 'spell']):
-        world_data.genre = "Fantasy"
-    elif any(word in content_lower for word in ['sci-fi', 'science fiction', 'space', 'future', 'technology']):
-        world_data.genre = "Science Fiction"
-    elif any(word in content_lower for word in ['horror', 'terror', 'nightmare', 'fear']):
-        world_data.genre = "Horror"
-    
-    # Extract time period
-    if any(word in content_lower for word in ['medieval', 'middle ages', 'knights', 'castles']):
-        world_data.time_period = "Medieval"
-    elif any(word in content_lower for word in ['modern', 'contemporary', 'present day']):
-        world_data.time_period = "Modern"
-    elif any(word in content_lower for word in ['future', 'futuristic', 'advanced', 'space age']):
-        world_data.time_period = "Future"
-    elif any(word in content_lower for word in ['post-apocalyptic', 'after the', 'ruins', 'wasteland']):
-        world_data.time_period = "Post-Apocalyptic"
+    world_data.genre = keywords.first_match(WORLD_GENRE_RULES) or world_data.genre
+    world_data.time_period = keywords.first_match(WORLD_PERIOD_RULES) or world_data.time_period
     
     # Extract magic system information
-    if any(word in content_lower for word in ['magic', 'spell', 'wizard', 'mage', 'enchant', 'arcane']):
+    magic_type = keywords.first_match(WORLD_MAGIC_RULES)
+    if magic_type:
         world_data.magic_system.exists = True
-        world_data.magic_system.type = "Unknown magic system"
-    
-    # Extract themes from content
-    themes = []
-    if 'survival' in content_lower:
-        themes.append("Survival")
-    if any(word in content_lower for word in ['power', 'corruption', 'authority']):
-        themes.append("Power and Corruption")
-    if any(word in content_lower for word in ['good', 'evil', 'moral', 'ethics']):
-        themes.append("Good vs Evil")
-    if any(word in content_lower for word in ['sacrifice', 'loss', 'death']):
-        themes.append("Sacrifice and Loss")
-    if any(word in content_lower for word in ['technology', 'progress', 'advancement']):
-        themes.append("Technology and Progress")
-    
-    world_data.themes = themes
+        world_data.magic_system.type = magic_type
+    
+    world_data.themes = keywords.all_matches(WORLD_THEME_RULES)
     
     # Extract setting summary (first paragraph or up to 200 chars)
-    lines = ai_content.split('\n')
-    for line in lines:
+    for line in ai_content.split('\n'):
         clean_line = line.strip()
         if len(clean_line) > 50 and not clean_line.startswith('*') and not clean_line.startswith('#'):
             world_data.setting_summary = clean_line[:200] + "..." if len(clean_line) > 200 else clean_line
@@ -68,6 +151,10 @@ def parse_world_text_to_json(title: str, ai_content: str) -> WorldData:
 def parse_characters_text_to_json(ai_content: str) -> CharactersData:
     """Parse AI-generated character text into structured JSON"""
     
+    structured = _from_json(CharactersData, ai_content)
+    if structured:
+        return structured
+    
     # Initialize with basic structure  
     characters_data = CharactersData.from_ai_text(ai_content)
     
@@ -109,96 +196,91 @@ def _extract_character_from_section(section: str) -> Character:
             name = line.split('Name:')[-1].replace('*', '').strip()
             break
     
-    # Extract role
-    role = "supporting"
-    role_text = section.lower()
-    if any(word in role_text for word in ['protagonist', 'main character', 'hero']):
-        role = "protagonist"
-    elif any(word in role_text for word in ['antagonist', 'villain', 'enemy']):
-        role = "antagonist"
-    
-    # Extract importance
-    importance = "secondary"
-    if 'main character' in role_text or 'protagonist' in role_text:
-        importance = "main"
-    elif any(word in role_text for word in ['minor', 'background', 'brief']):
-        importance = "minor"
-    
-    # Extract personality traits
-    personality = []
-    if 'personality' in role_text:
-        personality_section = re.search(r'personality.*?(?=\*|$)', section, re.IGNORECASE | re.DOTALL)
-        if personality_section:
-            personality_text = personality_section.group(0)
-            # Look for bullet points or traits
-            traits = re.findall(r'[*-]\s*\*\*([^*]+)\*\*', personality_text)
-            personality = [trait.strip() for trait in traits]
-    
-    # Extract goals
-    goals = []
-    if 'goal' in role_text:
-        goals_section = re.search(r'goal.*?(?=\*|$)', section, re.IGNORECASE | re.DOTALL)
-        if goals_section:
-            goals_text = goals_section.group(0)
-            goal_matches = re.findall(r'[*-]\s*\*\*([^*]+)\*\*', goals_text)
-            goals = [goal.strip() for goal in goal_matches]
+    keywords = KeywordMatcher(section)
+    role = keywords.first_match(CHARACTER_ROLE_RULES) or "supporting"
+    importance = keywords.first_match(CHARACTER_IMPORTANCE_RULES) or "secondary"
+    lists = _bullet_lists(lines, ('personality', 'goal'))
     
     return Character(
         name=name,
         role=role,
         importance=importance,
-        personality=personality,
-        goals=goals,
+        personality=lists['personality'],
+        goals=lists['goal'],
         physical_description="",
         background="",
         character_arc=""
     )
 
+def _bullet_lists(lines: List[str], labels: Tuple[str, ...]) -> Dict[str, List[str]]:
+    """Bold terms of the bullet list under the first line starting with each label
+
+    e.g. "**Personality:**" followed by "- **Stubborn**: ..." lines. A list ends
+    at the first line that is neither blank nor a bullet. One pass over lines.
+    """
+    lists: Dict[str, List[str]] = {label: [] for label in labels}
+    seen = set()
+    current = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if current is not None and (stripped[0] in '-•' or stripped[:2] in ('* ', '*\t')):
+            match = _BULLET_TERM.match(stripped)
+            if match:
+                lists[current].append(match.group(1).strip().rstrip(':').strip())
+            continue
+        heading = stripped.lstrip('*#- ').lower()
+        current = next((label for label in labels if heading.startswith(label) and label not in seen), None)
+        if current is not None:
+            seen.add(current)
+    return lists
+
+def _labelled_text(content: str, content_lower: str, label: str, stops: Iterable[str]) -> Optional[str]:
+    """Text after the first occurrence of label, up to the next stop word or '*'"""
+    start = content_lower.find(label)
+    if start < 0:
+        return None
+    start += len(label)
+    while start < len(content) and (content[start] == ':' or content[start].isspace()):
+        start += 1
+    end = content.find('*', start)
+    if end < 0:
+        end = len(content)
+    for stop in stops:
+        position = content_lower.find(stop, start, end)
+        if position >= 0:
+            end = position
+    text = content[start:end].strip()
+    return text or None
+
 def parse_outline_text_to_json(title: str, ai_content: str) -> OutlineData:
     """Parse AI-generated outline text into structured JSON"""
     
+    structured = _from_json(OutlineData, ai_content)
+    if structured:
+        return structured
+    
     # Initialize with basic structure
     outline_data = OutlineData.from_ai_text(title, ai_content)
     
-    content_lower = ai_content.lower()
+    keywords = KeywordMatcher(ai_content)
     
-    # Extract genre
-    if any(word in content_lower for word in ['sci-fi', 'science fiction', 'space', 'future']):
-        outline_data.story_structure.genre = "Science Fiction"
-    elif any(word in content_lower for word in ['fantasy', 'magic', 'wizard']):
-        outline_data.story_structure.genre = "Fantasy"
-    elif any(word in content_lower for word in ['mystery', 'detective', 'crime']):
-        outline_data.story_structure.genre = "Mystery"
-    elif any(word in content_lower for word in ['romance', 'love', 'relationship']):
-        outline_data.story_structure.genre = "Romance"
-    
-    # Extract themes
-    themes = []
-    if 'identity' in content_lower:
-        themes.append("Identity")
-    if 'friendship' in content_lower:
-        themes.append("Friendship")
-    if 'survival' in content_lower:
-        themes.append("Survival")
-    if any(word in content_lower for word in ['power', 'corruption']):
-        themes.append("Power and Corruption")
-    
-    outline_data.story_structure.themes = themes
+    outline_data.story_structure.genre = keywords.first_match(OUTLINE_GENRE_RULES) or outline_data.story_structure.genre
+    outline_data.story_structure.themes = keywords.all_matches(OUTLINE_THEME_RULES)
     
     # Try to extract plot structure
-    if 'beginning' in content_lower:
-        beginning_match = re.search(r'beginning[:\s]*([^*]+?)(?=middle|end|$)', ai_content, re.IGNORECASE | re.DOTALL)
-        if beginning_match:
-            outline_data.plot_outline.beginning = beginning_match.group(1).strip()
-    
-    if 'middle' in content_lower:
-        middle_match = re.search(r'middle[:\s]*([^*]+?)(?=end|climax|$)', ai_content, re.IGNORECASE | re.DOTALL)
-        if middle_match:
-            outline_data.plot_outline.rising_action = middle_match.group(1).strip()
-    
-    if 'climax' in content_lower:
-        climax_match = re.search(r'climax[:\s]*([^*]+?)(?=resolution|end|$)', ai_content, re.IGNORECASE | re.DOTALL)
-        if climax_match:
-            outline_data.plot_outline.climax = climax_match.group(1).strip()
-    
-    return outline_data
\ No newline at end of file
+    content_lower = ai_content.lower()
+    beginning = _labelled_text(ai_content, content_lower, 'beginning', ('middle', 'end'))
+    if beginning:
+        outline_data.plot_outline.beginning = beginning
+    
+    middle = _labelled_text(ai_content, content_lower, 'middle', ('end', 'climax'))
+    if middle:
+        outline_data.plot_outline.rising_action = middle
+    
+    climax = _labelled_text(ai_content, content_lower, 'climax', ('resolution', 'end'))
+    if climax:
+        outline_data.plot_outline.climax = climax
+    
+    return outline_data
@@ -0,0 +1,136 @@
+"""
+Paragraph audio cache for hypeWriter TTS
+Synthesized segments are stored under library/.tts_cache by a hash of their
+normalized text, voice, format and TTS_ENGINE_VERSION, so a chapter rendered
+again after an edit only synthesizes the paragraphs that changed. Entries are
+evicted least recently used first once the cache grows past its quota.
+"""
+
+import hashlib
+import os
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# Part of every key: bump it (or set the variable) when the Kokoro model or voices change
+TTS_ENGINE_VERSION = os.getenv("TTS_ENGINE_VERSION", "kokoro-1")
+
+CACHE_DIR_NAME = ".tts_cache"
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+# Eviction frees space down to this share of the quota, so it does not run on every write
+EVICT_TO = 0.9
+
+# Bytes under each cache directory, scanned once per process and then kept up to date
+_sizes: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def normalize_text(text: str) -> str:
+    """Text as it is spoken: NFC, with runs of whitespace collapsed"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def cache_key(text: str, voice: str, response_format: str) -> str:
+    data = '\0'.join((TTS_ENGINE_VERSION, voice, response_format, normalize_text(text)))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class AudioCache:
+    """Content-addressed segment audio under library/.tts_cache
+
+    Last use is the file's mtime, refreshed on every hit. hits and misses count
+    the lookups made through this instance.
+    """
+
+    def __init__(self, base_path: str = "library", max_bytes: int = MAX_CACHE_BYTES):
+        self.cache_dir = Path(base_path) / CACHE_DIR_NAME
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, key: str, response_format: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.{response_format}"
+
+    def get(self, text: str, voice: str, response_format: str) -> Optional[bytes]:
+        path = self.entry_path(cache_key(text, voice, response_format), response_format)
+        try:
+            with open(path, 'rb') as f:
+                audio = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return audio
+
+    def put(self, text: str, voice: str, response_format: str, audio: bytes):
+        path = self.entry_path(cache_key(text, voice, response_format), response_format)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        try:
+            previous = path.stat().st_size
+        except FileNotFoundError:
+            previous = 0
+        with open(tmp_path, 'wb') as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+
+        key = str(self.cache_dir)
+        with _lock:
+            if key not in _sizes:
+                _sizes[key] = self._scan_size()
+            else:
+                _sizes[key] += len(audio) - previous
+            over_quota = _sizes[key] > self.max_bytes
+        if over_quota:
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache is under EVICT_TO of its quota"""
+        with _lock:
+            entries = []
+            for entry in self._entries():
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * EVICT_TO
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            _sizes[str(self.cache_dir)] = total
+        if removed:
+            print(f"TTS cache: evicted {removed} entries, {total / 1024 ** 2:.0f} MB kept")
+
+    def _entries(self):
+        try:
+            shards = [entry for entry in os.scandir(self.cache_dir) if entry.is_dir()]
+        except FileNotFoundError:
+            return
+        for shard in shards:
+            try:
+                for entry in os.scandir(shard.path):
+                    if entry.is_file() and not entry.name.endswith('.tmp'):
+                        yield entry
+            except FileNotFoundError:
+                continue
+
+    def _scan_size(self) -> int:
+        total = 0
+        for entry in self._entries():
+            try:
+                total += entry.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
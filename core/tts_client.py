@@ -0,0 +1,133 @@
+"""
+Kokoro TTS client for hypeWriter
+One pooled httpx.AsyncClient for the Kokoro-FastAPI server, opened at startup
+and closed at shutdown. Calls never block the event loop, reuse keep-alive
+connections and carry their own timeouts; connection failures and 502/503/504
+answers are retried with a short backoff.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+
+# Per-call timeouts in seconds; synthesis of a whole chapter can take minutes
+CONNECT_TIMEOUT = 5.0
+STATUS_TIMEOUT = 5.0
+VOICES_TIMEOUT = 15.0
+SPEECH_TIMEOUT = 600.0
+
+MAX_CONNECTIONS = 8
+MAX_KEEPALIVE_CONNECTIONS = 8
+KEEPALIVE_EXPIRY = 30.0
+
+RETRIES = 2
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = {502, 503, 504}
+
+# Failures where the request cannot have reached the synthesizer, so sending it
+# again is safe: refused/timed out connects and keep-alive connections the server
+# closed while idle. Read timeouts are not retried, they would double the wait.
+_RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError, httpx.PoolTimeout)
+
+
+class TTSUnavailable(Exception):
+    """The Kokoro server could not be reached or did not answer in time
+
+    retried is True when the request was already sent again by the client, so
+    repeating it straight away is unlikely to help.
+    """
+
+    def __init__(self, message: str, retried: bool = False):
+        super().__init__(message)
+        self.retried = retried
+
+
+class KokoroClient:
+    """Async client for the Kokoro-FastAPI endpoints used by hypeWriter"""
+
+    def __init__(self, base_url: str, max_connections: int = MAX_CONNECTIONS,
+                 max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+                 retries: int = RETRIES, retry_backoff: float = RETRY_BACKOFF,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url.rstrip('/')
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections,
+                                keepalive_expiry=KEEPALIVE_EXPIRY),
+            timeout=httpx.Timeout(VOICES_TIMEOUT, connect=CONNECT_TIMEOUT),
+            transport=transport,
+        )
+
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
+    async def request(self, method: str, path: str, timeout: float, **kwargs) -> httpx.Response:
+        """Send a request, retrying connection failures and 502/503/504
+
+        Returns the last response whatever its status; raises TTSUnavailable
+        when no response arrived.
+        """
+        timeout = httpx.Timeout(timeout, connect=min(CONNECT_TIMEOUT, timeout))
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self._client.request(method, path, timeout=timeout, **kwargs)
+            except _RETRY_ERRORS as e:
+                if attempt == self.retries:
+                    raise TTSUnavailable(str(e) or type(e).__name__, retried=self.retries > 0) from e
+            except httpx.HTTPError as e:
+                raise TTSUnavailable(str(e) or type(e).__name__) from e
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+
+    async def voices(self) -> httpx.Response:
+        return await self.request("GET", "/voices", VOICES_TIMEOUT)
+
+    async def health(self) -> httpx.Response:
+        # One attempt only: the status check should answer quickly either way
+        timeout = httpx.Timeout(STATUS_TIMEOUT)
+        try:
+            return await self._client.get("/health", timeout=timeout)
+        except httpx.HTTPError as e:
+            raise TTSUnavailable(str(e) or type(e).__name__) from e
+
+    async def speech(self, text: str, voice: str, response_format: str,
+                     timeout: float = SPEECH_TIMEOUT) -> httpx.Response:
+        payload = {"model": "kokoro", "voice": voice, "input": text, "response_format": response_format}
+        return await self.request("POST", "/audio/speech", timeout, json=payload)
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+_client: Optional[KokoroClient] = None
+
+
+def start_tts_client(base_url: str) -> KokoroClient:
+    """Create the process-wide Kokoro client"""
+    global _client
+    if _client is None or _client.is_closed or _client.base_url != base_url.rstrip('/'):
+        _client = KokoroClient(base_url)
+    return _client
+
+
+def get_tts_client(base_url: str) -> KokoroClient:
+    """The process-wide Kokoro client, created on first use if startup did not run"""
+    if _client is None or _client.is_closed:
+        return start_tts_client(base_url)
+    return _client
+
+
+async def close_tts_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,250 @@
+"""
+Chapter TTS pipeline for hypeWriter
+Chapter text is split into segments of at most MAX_SEGMENT_CHARS, one per
+paragraph or, for long paragraphs, at sentence boundaries. Segments missing
+from the audio cache are synthesized concurrently by a bounded number of
+workers, and the audio is appended to the output file in order as soon as each
+segment (and every one before it) is ready, or streamed to a player while being
+written. A failed segment is retried on its own; the others are kept.
+"""
+
+import asyncio
+import os
+import re
+import struct
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from .tts_cache import AudioCache
+from .tts_client import KokoroClient, TTSUnavailable
+
+
+MAX_SEGMENT_CHARS = 1000
+# Opening segment when streaming to a player, about 15 seconds of speech
+FIRST_SEGMENT_CHARS = 250
+TTS_WORKERS = 4
+SEGMENT_RETRIES = 2
+
+# Formats whose streams can simply be appended to each other. WAV is built from
+# PCM segments under one header; anything else is synthesized in one piece. Opus
+# comes in an Ogg container, and players stop at the end of the first stream.
+APPENDABLE_FORMATS = {'mp3', 'aac', 'pcm'}
+KOKORO_SAMPLE_RATE = 24000  # Kokoro PCM output: 16-bit mono
+STREAMING_WAV_SIZE = 0xFFFFFFFF
+
+MEDIA_TYPES = {'mp3': 'audio/mpeg', 'opus': 'audio/ogg', 'aac': 'audio/aac', 'flac': 'audio/flac',
+               'wav': 'audio/wav', 'pcm': 'audio/pcm'}
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_SENTENCE_END = re.compile(r'[.!?…]+["\'”’)\]]*\s+')
+
+
+class TTSSegmentError(Exception):
+    """A segment still failed after its retries; status_code is None when Kokoro was unreachable"""
+
+    def __init__(self, index: int, message: str, status_code: Optional[int] = None):
+        super().__init__(f"Segment {index + 1}: {message}")
+        self.index = index
+        self.status_code = status_code
+
+
+def _sentences(paragraph: str) -> Iterator[str]:
+    start = 0
+    for match in _SENTENCE_END.finditer(paragraph):
+        yield paragraph[start:match.end()].strip()
+        start = match.end()
+    if start < len(paragraph):
+        yield paragraph[start:].strip()
+
+
+def _split_words(sentence: str, max_chars: int) -> Iterator[str]:
+    # A sentence longer than a whole segment is cut at the last space that fits
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(' ', 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        yield sentence[:cut].strip()
+        sentence = sentence[cut:].strip()
+    if sentence:
+        yield sentence
+
+
+def _units(text: str, max_chars: int) -> Iterator[Tuple[str, bool]]:
+    """(piece, starts a paragraph) pieces of at most max_chars, in order"""
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = ' '.join(paragraph.split())
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            yield paragraph, True
+            continue
+        first = True
+        for sentence in _sentences(paragraph):
+            for piece in _split_words(sentence, max_chars):
+                yield piece, first
+                first = False
+
+
+def split_segments(text: str, max_chars: int = MAX_SEGMENT_CHARS) -> List[str]:
+    """Pack paragraphs (or, for long ones, sentences) into segments of at most max_chars
+
+    A segment only ends inside a paragraph when the paragraph does not fit in
+    one segment, and only inside a sentence when the sentence does not.
+    """
+    segments: List[str] = []
+    current = ''
+    for piece, new_paragraph in _units(text, max_chars):
+        separator = '\n\n' if new_paragraph else ' '
+        if current and len(current) + len(separator) + len(piece) > max_chars:
+            segments.append(current)
+            current = ''
+        current = piece if not current else current + separator + piece
+    if current:
+        segments.append(current)
+    return segments
+
+
+def wav_header(data_size: int = STREAMING_WAV_SIZE, sample_rate: int = KOKORO_SAMPLE_RATE) -> bytes:
+    """Header for 16-bit mono PCM; the default size marks a stream of unknown length"""
+    channels, sample_width = 1, 2
+    return struct.pack('<4sI4s4sIHHIIHH4sI', b'RIFF', min(36 + data_size, STREAMING_WAV_SIZE), b'WAVE', b'fmt ',
+                       16, 1, channels, sample_rate, sample_rate * channels * sample_width,
+                       channels * sample_width, sample_width * 8, b'data', data_size)
+
+
+def plan_segments(text: str, response_format: str, max_chars: int = MAX_SEGMENT_CHARS,
+                  first_chars: Optional[int] = None) -> Tuple[List[str], str]:
+    """Segments to synthesize and the format to ask Kokoro for
+
+    Segments never span paragraphs, so an edit only changes the segments of the
+    paragraph it is in and the rest are found in the audio cache. With
+    first_chars the opening segment is cut shorter, so a player gets its first
+    audio sooner.
+    """
+    if response_format not in APPENDABLE_FORMATS and response_format != 'wav':
+        return [text.strip()], response_format
+    segments = [segment for paragraph in _PARAGRAPH_BREAK.split(text)
+                for segment in split_segments(paragraph, max_chars)]
+    if first_chars and segments and len(segments[0]) > first_chars:
+        segments[:1] = split_segments(segments[0], first_chars)
+    return segments, 'pcm' if response_format == 'wav' else response_format
+
+
+async def _synthesize_segment(client: KokoroClient, index: int, text: str, voice: str,
+                              response_format: str, retries: int) -> bytes:
+    for attempt in range(retries + 1):
+        try:
+            response = await client.speech(text, voice, response_format)
+        except TTSUnavailable as e:
+            error = TTSSegmentError(index, str(e))
+            if e.retried:
+                # The client already retried the connection; the server is down
+                break
+        else:
+            if response.status_code == 200:
+                return response.content
+            status_code = response.status_code
+            error = TTSSegmentError(index, f"Kokoro returned {status_code}", status_code)
+            if status_code < 500:
+                # A rejected request (unknown voice, bad format) fails the same way again
+                break
+        if attempt < retries:
+            print(f"TTS segment failed, retrying: {error}")
+    raise error
+
+
+async def synthesize_segments(client: KokoroClient, segments: List[str], voice: str, segment_format: str,
+                              workers: int = TTS_WORKERS, retries: int = SEGMENT_RETRIES,
+                              cache: Optional[AudioCache] = None) -> AsyncIterator[bytes]:
+    """Audio of each segment, in order, as soon as it and every segment before it is ready
+
+    At most `workers` segments are being synthesized at once, and at most twice
+    that many are held in memory waiting for an earlier segment. With a cache,
+    segments found there are not synthesized and new ones are added to it.
+    Raises TTSSegmentError when a segment still fails after its retries;
+    closing the iterator early cancels the segments in flight.
+    """
+    workers = max(1, workers)
+    semaphore = asyncio.Semaphore(workers)
+
+    async def synthesize(index: int) -> bytes:
+        text = segments[index]
+        if cache is not None:
+            audio = await asyncio.to_thread(cache.get, text, voice, segment_format)
+            if audio is not None:
+                return audio
+        async with semaphore:
+            audio = await _synthesize_segment(client, index, text, voice, segment_format, retries)
+        if cache is not None:
+            await asyncio.to_thread(cache.put, text, voice, segment_format, audio)
+        return audio
+
+    tasks: Dict[int, asyncio.Task] = {}
+    started = 0
+    try:
+        for index in range(len(segments)):
+            while started < len(segments) and started < index + workers * 2:
+                tasks[started] = asyncio.ensure_future(synthesize(started))
+                started += 1
+            yield await tasks.pop(index)
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
+class AudioFileWriter:
+    """Writes audio to a temporary file next to path and moves it into place on commit()
+
+    A WAV file gets its header, with the real size, when committed. Anything
+    not committed is removed by close(), so a failed or abandoned synthesis
+    never leaves half a file behind.
+    """
+
+    def __init__(self, path, response_format: str):
+        self.path = Path(path)
+        self.response_format = response_format
+        self.size = 0
+        self._tmp_path = self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        self._file = open(self._tmp_path, 'wb')
+        if response_format == 'wav':
+            self._file.write(wav_header(0))
+
+    def write(self, audio: bytes):
+        self._file.write(audio)
+        self.size += len(audio)
+
+    def commit(self):
+        if self.response_format == 'wav':
+            self._file.seek(0)
+            self._file.write(wav_header(self.size))
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+async def synthesize_to_file(client: KokoroClient, text: str, voice: str, response_format: str, path,
+                             workers: int = TTS_WORKERS, max_chars: int = MAX_SEGMENT_CHARS,
+                             retries: int = SEGMENT_RETRIES, cache: Optional[AudioCache] = None) -> Dict:
+    """Synthesize text into the audio file at path; returns its size and segment counts
+
+    The file only appears once every segment succeeded; raises TTSSegmentError otherwise.
+    """
+    segments, segment_format = plan_segments(text, response_format, max_chars)
+    with AudioFileWriter(path, response_format) as writer:
+        async for audio in synthesize_segments(client, segments, voice, segment_format, workers, retries, cache):
+            await asyncio.to_thread(writer.write, audio)
+        writer.commit()
+    return {'size': Path(path).stat().st_size, 'segments': len(segments),
+            'cached_segments': cache.hits if cache is not None else 0}
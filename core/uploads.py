@@ -0,0 +1,282 @@
+"""
+Resumable manuscript uploads for hypeWriter
+Upload bodies are written to library/imports/uploads/<id>.part in fixed-size
+chunks while a SHA-256 is computed; completing an upload moves the file to
+library/imports/<sha256><ext> and returns that name as the import handle.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from .parse_cache import remember_digest
+
+
+CHUNK_SIZE = 1024 * 1024
+UPLOAD_DIR_NAME = "uploads"
+SUPPORTED_EXTENSIONS = ('.docx', '.odt', '.epub', '.mobi', '.txt', '.md', '.markdown')
+
+# Unfinished uploads older than this are removed by prune()
+MAX_AGE_SECONDS = 24 * 3600
+
+_UPLOAD_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+_HANDLE_RE = re.compile(r'^[0-9a-f]{64}\.(?:docx|odt|epub|mobi|txt|md|markdown)$')
+
+# Running hashes of uploads in progress: upload id -> (bytes hashed, sha256 object)
+_hashers: Dict[str, Tuple[int, "hashlib._Hash"]] = {}
+# Uploads with an open writer; a second concurrent writer would interleave bytes
+_active = set()
+_lock = threading.Lock()
+
+
+class UploadStore:
+    """Create, append to and complete resumable uploads under library/imports"""
+
+    def __init__(self, base_path: str = "library"):
+        self.imports_dir = Path(base_path) / "imports"
+        self.upload_dir = self.imports_dir / UPLOAD_DIR_NAME
+
+    def create(self, filename: str, size: Optional[int] = None) -> Dict:
+        """Start an upload; returns its status with offset 0"""
+        filename = Path(filename).name
+        if not filename.endswith(SUPPORTED_EXTENSIONS):
+            raise ValueError(f"Unsupported file format: {filename}. Supported formats: .docx, .odt, .epub, .txt, .md")
+        upload_id = uuid.uuid4().hex
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self._part_path(upload_id).touch()
+        self._save_state(upload_id, {'filename': filename, 'size': size, 'created': time.time()})
+        return self.status(upload_id)
+
+    def status(self, upload_id: str) -> Dict:
+        """Where an upload stands; offset is where the next chunk must start"""
+        state = self._load_state(upload_id)
+        return {
+            'upload_id': upload_id,
+            'filename': state['filename'],
+            'size': state['size'],
+            'offset': self._part_path(upload_id).stat().st_size,
+            'chunk_size': CHUNK_SIZE,
+        }
+
+    def open_writer(self, upload_id: str, offset: int) -> "UploadWriter":
+        """Writer appending at offset, which must equal the bytes already received"""
+        self._load_state(upload_id)
+        with _lock:
+            if upload_id in _active:
+                raise ValueError("Upload already in progress")
+            _active.add(upload_id)
+        try:
+            current = self._part_path(upload_id).stat().st_size
+            if offset != current:
+                raise ValueError(f"Upload is at offset {current}, not {offset}")
+            return UploadWriter(upload_id, self._part_path(upload_id), self._hasher(upload_id, current))
+        except Exception:
+            with _lock:
+                _active.discard(upload_id)
+            raise
+
+    def complete(self, upload_id: str) -> Dict:
+        """Finish an upload; identical content uploaded twice is stored once"""
+        state = self._load_state(upload_id)
+        part_path = self._part_path(upload_id)
+        with _lock:
+            if upload_id in _active:
+                raise ValueError("Upload still in progress")
+            _active.add(upload_id)
+        try:
+            size = part_path.stat().st_size
+            if state['size'] is not None and size != state['size']:
+                raise ValueError(f"Upload has {size} of {state['size']} bytes")
+            digest = self._hasher(upload_id, size).hexdigest()
+
+            handle = digest + Path(state['filename']).suffix
+            target = self.imports_dir / handle
+            if target.exists():
+                part_path.unlink()
+            else:
+                os.replace(part_path, target)
+            remember_digest(str(target), digest)
+            self._state_path(upload_id).unlink(missing_ok=True)
+        finally:
+            with _lock:
+                _active.discard(upload_id)
+                _hashers.pop(upload_id, None)
+        return {'handle': handle, 'sha256': digest, 'size': size, 'filename': state['filename']}
+
+    def path_for(self, handle: str) -> Path:
+        """File behind an import handle returned by complete()"""
+        if not _HANDLE_RE.match(handle):
+            raise ValueError(f"Invalid upload handle: {handle}")
+        path = self.imports_dir / handle
+        if not path.exists():
+            raise FileNotFoundError(f"Upload not found: {handle}")
+        return path
+
+    def prune(self, max_age: float = MAX_AGE_SECONDS):
+        """Remove unfinished uploads that have not received data for max_age seconds"""
+        cutoff = time.time() - max_age
+        try:
+            entries = list(os.scandir(self.upload_dir))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            upload_id = entry.name.split('.', 1)[0]
+            with _lock:
+                if upload_id in _active:
+                    continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    with _lock:
+                        _hashers.pop(upload_id, None)
+            except FileNotFoundError:
+                pass
+
+    def _hasher(self, upload_id: str, offset: int):
+        with _lock:
+            memo = _hashers.get(upload_id)
+        if memo and memo[0] == offset:
+            return memo[1].copy()
+        # After a restart the hash of the bytes so far is rebuilt from disk, once
+        hasher = hashlib.sha256()
+        with open(self._part_path(upload_id), 'rb') as f:
+            for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+                hasher.update(block)
+        return hasher
+
+    def _part_path(self, upload_id: str) -> Path:
+        return self.upload_dir / f"{upload_id}.part"
+
+    def _state_path(self, upload_id: str) -> Path:
+        return self.upload_dir / f"{upload_id}.json"
+
+    def _load_state(self, upload_id: str) -> Dict:
+        if not _UPLOAD_ID_RE.match(upload_id):
+            raise FileNotFoundError(f"Upload not found: {upload_id}")
+        try:
+            with open(self._state_path(upload_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            raise FileNotFoundError(f"Upload not found: {upload_id}")
+
+    def _save_state(self, upload_id: str, state: Dict):
+        with open(self._state_path(upload_id), 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+
+class UploadWriter:
+    """Appends to an upload in CHUNK_SIZE writes, hashing as it goes
+
+    Use as a context manager: on exit (even after a dropped connection) the
+    bytes received so far are flushed and become the resume offset.
+    """
+
+    def __init__(self, upload_id: str, part_path: Path, hasher):
+        self.upload_id = upload_id
+        self.hasher = hasher
+        self.written = 0
+        self._buffer = bytearray()
+        self._file = open(part_path, 'ab')
+        self._offset = self._file.tell()
+
+    def write(self, data: bytes):
+        self._buffer += data
+        if len(self._buffer) >= CHUNK_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self.hasher.update(self._buffer)
+            self.written += len(self._buffer)
+            self._buffer.clear()
+
+    def close(self):
+        try:
+            self._flush()
+            self._file.close()
+        finally:
+            with _lock:
+                _hashers[self.upload_id] = (self._offset + self.written, self.hasher)
+                _active.discard(self.upload_id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MultipartFileParser:
+    """Feed a multipart/form-data body in pieces; the first file part goes to on_data
+
+    Other form fields are ignored. Uses python-multipart's streaming parser, so
+    nothing is buffered beyond the piece being parsed.
+    """
+
+    def __init__(self, content_type: str, on_data: Callable[[bytes], None]):
+        try:
+            from python_multipart.multipart import MultipartParser, parse_options_header
+        except ImportError:
+            from multipart.multipart import MultipartParser, parse_options_header
+
+        _, params = parse_options_header(content_type)
+        boundary = params.get(b'boundary')
+        if not boundary:
+            raise ValueError("Missing multipart boundary")
+
+        self.on_data = on_data
+        self.found = False
+        self._in_file = False
+        self._header_field = b''
+        self._header_value = b''
+        self._is_file = False
+
+        def on_part_begin():
+            self._is_file = False
+
+        def on_header_field(data, start, end):
+            self._header_field += data[start:end]
+
+        def on_header_value(data, start, end):
+            self._header_value += data[start:end]
+
+        def on_header_end():
+            if self._header_field.lower() == b'content-disposition' and b'filename=' in self._header_value:
+                self._is_file = True
+            self._header_field = self._header_value = b''
+
+        def on_headers_finished():
+            self._in_file = self._is_file and not self.found
+            self.found = self.found or self._in_file
+
+        def on_part_data(data, start, end):
+            if self._in_file:
+                self.on_data(data[start:end])
+
+        def on_part_end():
+            self._in_file = False
+
+        self._parser = MultipartParser(boundary, {
+            'on_part_begin': on_part_begin,
+            'on_header_field': on_header_field,
+            'on_header_value': on_header_value,
+            'on_header_end': on_header_end,
+            'on_headers_finished': on_headers_finished,
+            'on_part_data': on_part_data,
+            'on_part_end': on_part_end,
+        })
+
+    def write(self, data: bytes):
+        self._parser.write(data)
+
+    def finalize(self):
+        self._parser.finalize()
+        if not self.found:
+            raise ValueError("No file in multipart body")
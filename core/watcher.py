@@ -0,0 +1,326 @@
+"""
+File-system watcher for the hypeWriter library
+Turns out-of-band edits (text editors, MCP clients) into cache invalidations
+and change notifications. Uses inotify on Linux and falls back to polling.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+class FileEvent(NamedTuple):
+    kind: str       # "created", "modified", "deleted" or "rescan"
+    path: Path
+    is_dir: bool = False
+
+
+Subscriber = Callable[[List[FileEvent]], None]
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class _InotifyBackend:
+    """Recursive inotify watches over a directory tree"""
+
+    def __init__(self, root: Path):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name or not hasattr(os, 'O_NONBLOCK'):
+            raise OSError("inotify is not available on this platform")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError("inotify is not available on this platform")
+
+        self.root = root
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: Dict[int, Path] = {}
+        self._add_tree(root)
+
+    def _add_watch(self, path: Path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = path
+
+    def _add_tree(self, root: Path, found: Optional[List[FileEvent]] = None):
+        """Watch root and every directory below it
+
+        With found, whatever the walk sees is reported there as created: files
+        written into a new directory before its watch existed raise no event.
+        Each directory is watched before it is listed, so nothing falls between.
+        """
+        self._add_watch(root)
+        for dirpath, dirnames, filenames in os.walk(root):
+            base = Path(dirpath)
+            for name in dirnames:
+                self._add_watch(base / name)
+            if found is not None:
+                found.extend(FileEvent("created", base / name, True) for name in dirnames)
+                found.extend(FileEvent("created", base / name) for name in filenames)
+
+    def read(self, timeout: float) -> List[FileEvent]:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                events.append(FileEvent("rescan", self.root, True))
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+            is_dir = bool(mask & IN_ISDIR)
+
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                events.append(FileEvent("created", path, is_dir))
+                if is_dir:
+                    # A directory moved in (or filled quickly) already has content
+                    self._add_tree(path, events)
+            elif mask & (IN_DELETE | IN_MOVED_FROM | IN_DELETE_SELF | IN_MOVE_SELF):
+                events.append(FileEvent("deleted", path, is_dir or not name))
+            else:
+                events.append(FileEvent("modified", path, is_dir))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _PollingBackend:
+    """Periodic stat snapshots of a directory tree"""
+
+    def __init__(self, root: Path, interval: float):
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[bool, int, int]]:
+        snapshot = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            base = Path(dirpath)
+            for name in dirnames:
+                snapshot[base / name] = (True, 0, 0)
+            for name in filenames:
+                path = base / name
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                snapshot[path] = (False, stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def read(self, timeout: float) -> List[FileEvent]:
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        previous = self._snapshot
+        self._snapshot = current
+
+        events = []
+        for path, entry in current.items():
+            old = previous.get(path)
+            if old is None:
+                events.append(FileEvent("created", path, entry[0]))
+            elif old != entry:
+                events.append(FileEvent("modified", path, entry[0]))
+        for path, entry in previous.items():
+            if path not in current:
+                events.append(FileEvent("deleted", path, entry[0]))
+        return events
+
+    def close(self):
+        pass
+
+
+class LibraryWatcher:
+    """Watch a library folder and fan file events out to subscribers"""
+
+    def __init__(self, base_path: str = "library", poll_interval: float = 0.5, use_inotify: bool = True):
+        self.base_path = Path(base_path).resolve()
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend_name = ""
+        self._backend = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+
+    @property
+    def is_active(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def covers(self, path) -> bool:
+        """Check whether a path lies under the watched library"""
+        resolved = Path(path).resolve()
+        return resolved == self.base_path or self.base_path in resolved.parents
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Register a callback for event batches; returns an unsubscribe function"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def start(self):
+        if self.is_active:
+            return
+        self.base_path.mkdir(exist_ok=True)
+
+        self._backend = None
+        if self.use_inotify:
+            try:
+                self._backend = _InotifyBackend(self.base_path)
+                self.backend_name = "inotify"
+            except OSError as e:
+                print(f"inotify unavailable ({e}), falling back to polling the library")
+        if self._backend is None:
+            self._backend = _PollingBackend(self.base_path, self.poll_interval)
+            self.backend_name = "polling"
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="library-watcher", daemon=True)
+        self._thread.start()
+        print(f"Watching '{self.base_path}' for changes ({self.backend_name})")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                events = self._backend.read(self.poll_interval)
+            except Exception as e:
+                print(f"Error reading library events: {e}")
+                events = [FileEvent("rescan", self.base_path, True)]
+                time.sleep(self.poll_interval)
+            if events:
+                self._dispatch(_coalesce(events))
+
+    def _dispatch(self, events: List[FileEvent]):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(events)
+            except Exception as e:
+                print(f"Error in library watcher subscriber: {e}")
+
+
+def _coalesce(events: List[FileEvent]) -> List[FileEvent]:
+    """Collapse repeated events for the same path, keeping the last kind"""
+    latest: Dict[Path, FileEvent] = {}
+    for event in events:
+        if event.kind == "rescan":
+            return [event]
+        latest.pop(event.path, None)
+        latest[event.path] = event
+    return list(latest.values())
+
+
+def invalidate_caches(events: List[FileEvent]):
+    """Map file events onto the in-process caches that hold their data"""
+    from .chapter_store import invalidate_cached_chapter
+    from . import chapter_store, project_manager
+
+    for event in events:
+        if event.kind == "rescan":
+            chapter_store._text_cache.clear()
+            project_manager.clear_caches()
+            return
+
+        name = event.path.name
+        if not event.is_dir and name.startswith("chapter_") and name.endswith(".txt"):
+            invalidate_cached_chapter(event.path)
+        else:
+            project_manager.invalidate_cached_path(event.path, is_dir=event.is_dir)
+
+
+def is_notifiable(event: FileEvent, base_path: Path) -> bool:
+    """Skip hidden bookkeeping files (indexes, temp files) in change notifications"""
+    try:
+        parts = event.path.relative_to(base_path).parts
+    except ValueError:
+        return False
+    return not any(part.startswith('.') for part in parts) and not event.path.name.endswith('.tmp')
+
+
+_watcher: Optional[LibraryWatcher] = None
+
+
+def start_library_watcher(base_path: str = "library", poll_interval: float = 0.5) -> LibraryWatcher:
+    """Start the process-wide library watcher with cache invalidation attached"""
+    global _watcher
+    if _watcher is None:
+        _watcher = LibraryWatcher(base_path, poll_interval)
+        _watcher.subscribe(invalidate_caches)
+    _watcher.start()
+    return _watcher
+
+
+def stop_library_watcher():
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
+
+
+def get_library_watcher() -> Optional[LibraryWatcher]:
+    return _watcher
+
+
+def is_watched(path) -> bool:
+    """True when a running watcher will report changes to this path"""
+    return _watcher is not None and _watcher.is_active and _watcher.covers(path)
@@ -33,6 +33,79 @@ interface ProjectStore {
   showImportModal: boolean;
 }
 
+interface ImportJobEvent {
+  id: number;
+  type: string;
+  [field: string]: any;
+}
+
+/**
+ * Upload a manuscript through the resumable upload API; returns the handle
+ * that /api/import/analyze and /api/import/jobs take instead of a file path
+ */
+export async function uploadManuscript(file: File): Promise<string> {
+  const startResponse = await fetch('/api/uploads', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ filename: file.name, size: file.size })
+  });
+  if (!startResponse.ok) {
+    throw new Error(`Upload failed: ${await startResponse.text()}`);
+  }
+  const { upload_id } = await startResponse.json();
+
+  const putResponse = await fetch(`/api/uploads/${upload_id}?offset=0`, { method: 'PUT', body: file });
+  if (!putResponse.ok) {
+    throw new Error(`Upload failed: ${await putResponse.text()}`);
+  }
+
+  const completeResponse = await fetch(`/api/uploads/${upload_id}/complete`, { method: 'POST' });
+  if (!completeResponse.ok) {
+    throw new Error(`Upload failed: ${await completeResponse.text()}`);
+  }
+  return (await completeResponse.json()).handle;
+}
+
+/**
+ * Start an import job and follow its event stream until it finishes.
+ * Resolves with the new project; onEvent sees every progress event.
+ */
+export async function runImportJob(
+  importData: Record<string, unknown>,
+  onEvent?: (event: ImportJobEvent) => void
+): Promise<ProjectMetadata> {
+  const response = await fetch('/api/import/jobs', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(importData)
+  });
+  if (!response.ok) {
+    throw new Error(`Failed to import project: ${await response.text()}`);
+  }
+  const { job_id } = await response.json();
+
+  return new Promise((resolve, reject) => {
+    // EventSource reconnects with Last-Event-ID, so a dropped connection resumes where it stopped
+    const source = new EventSource(`/api/import/jobs/${job_id}/events`);
+    source.onmessage = (message) => {
+      const event: ImportJobEvent = JSON.parse(message.data);
+      onEvent?.(event);
+      if (event.type === 'done') {
+        source.close();
+        resolve(event.result.project);
+      } else if (event.type === 'failed') {
+        source.close();
+        reject(new Error(`Failed to import project: ${event.error}`));
+      }
+    };
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) {
+        reject(new Error('Lost connection to the import job'));
+      }
+    };
+  });
+}
+
 class ProjectStoreClass {
   private store: ProjectStore = {
     currentProject: null,
@@ -200,18 +273,7 @@ class ProjectStoreClass {
     this.store.error = null;
 
     try {
-      const response = await fetch('/api/import/novel', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(importData)
-      });
-
-      if (!response.ok) {
-        throw new Error(`Failed to import project: ${response.statusText}`);
-      }
-
-      const result = await response.json();
-      const newProject = result.project;
+      const newProject = await runImportJob(importData);
       
       // Add to projects list
       this.store.projects = [newProject, ...this.store.projects];
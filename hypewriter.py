@@ -4,7 +4,6 @@ FastAPI web application for hypeWriter
 import os
 import json
 import re
-import requests
 from typing import List, Optional, Dict, Any, AsyncGenerator, Iterable
 
 from fastapi import (
@@ -13,12 +12,14 @@ from fastapi import (
     HTTPException,
     Depends,
     BackgroundTasks,
+    Query,
 )
 from fastapi.responses import (
     HTMLResponse,
     JSONResponse,
     StreamingResponse,
     RedirectResponse,
+    Response,
 )
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
@@ -30,6 +31,9 @@ from fastapi_mcp import FastApiMCP
 from core.config import GEMINI_CONFIG_LIST, APP_SECRET_KEY
 from core.agents import BookAgents
 from core import prompts
+from core.search_index import get_search_index
+from core import serialization
+from core.tts_client import TTSUnavailable, get_tts_client
 
 # --- Pydantic Models for Request Bodies ---
 from core.pydantic_models import (
@@ -48,11 +52,21 @@ from core.pydantic_models import (
     CreateProjectRequest,
     ImportAnalysisRequest,
     ImportNovelRequest,
+    BatchImportRequest,
+    UploadStartRequest,
 )
 
 
 # --- FastAPI App Setup ---
-app = FastAPI()
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by core.serialization (orjson when installed).
+    Returning one directly also skips FastAPI's jsonable_encoder pass."""
+
+    def render(self, content: Any) -> bytes:
+        return serialization.dumps(content)
+
+
+app = FastAPI(default_response_class=FastJSONResponse)
 
 # Session Middleware (Using MemoryStore - consider alternatives for production)
 # Note: Requires 'itsdangerous' to be installed implicitly by starlette
@@ -97,6 +111,39 @@ agent_config = {"config_list": GEMINI_CONFIG_LIST, "temperature": 0.7}
 KOKORO_API_BASE_URL = "http://localhost:8880/v1"
 
 
+# --- Library Watcher ---
+# Picks up edits made outside the app so project caches never serve stale data
+@app.on_event("startup")
+async def start_watcher():
+    from core.watcher import start_library_watcher
+    try:
+        start_library_watcher("library")
+    except Exception as e:
+        print(f"ERROR: Failed to start library watcher: {e}")
+    # Created after the watcher so it subscribes to change events
+    get_search_index("library")
+
+
+@app.on_event("shutdown")
+async def stop_watcher():
+    from core.watcher import stop_library_watcher
+    stop_library_watcher()
+
+
+# --- Kokoro TTS Client ---
+# One pooled connection set to the TTS server for the life of the app
+@app.on_event("startup")
+async def start_tts():
+    from core.tts_client import start_tts_client
+    start_tts_client(KOKORO_API_BASE_URL)
+
+
+@app.on_event("shutdown")
+async def stop_tts():
+    from core.tts_client import close_tts_client
+    await close_tts_client()
+
+
 # === Helper Function for Streaming (FastAPI Version) ===
 # Changed stream_iterator type hint to Iterable as it's synchronous
 async def generate_sse_stream(
@@ -162,9 +209,7 @@ async def generate_sse_stream(
                         project_dir = pm.get_project_path(current_project_id)
                         from core.text_to_json import parse_world_text_to_json
                         world_data = parse_world_text_to_json("Current Project", world_theme)
-                        world_file = project_dir / "world.json"
-                        with open(world_file, "w", encoding="utf-8") as f:
-                            json.dump(world_data.model_dump(), f, indent=2, ensure_ascii=False)
+                        pm.write_document(project_dir, "world", world_data)
                     else:
                         # Legacy fallback
                         world_file = "library/world.txt"
@@ -186,8 +231,7 @@ async def generate_sse_stream(
                         pm = ProjectManager()
                         project_dir = pm.get_project_path(current_project_id)
                         characters_data = parse_characters_text_to_json(characters_content)
-                        with open(project_dir / "characters.json", "w", encoding="utf-8") as f:
-                            json.dump(characters_data.model_dump(), f, indent=2, ensure_ascii=False)
+                        pm.write_document(project_dir, "characters", characters_data)
                     else:
                         # Legacy fallback
                         with open("book_output/characters.txt", "w", encoding="utf-8") as f:
@@ -208,8 +252,7 @@ async def generate_sse_stream(
                         pm = ProjectManager()
                         project_dir = pm.get_project_path(current_project_id)
                         outline_data = parse_outline_text_to_json("Current Project", outline_content)
-                        with open(project_dir / "outline.json", "w", encoding="utf-8") as f:
-                            json.dump(outline_data.model_dump(), f, indent=2, ensure_ascii=False)
+                        pm.write_document(project_dir, "outline", outline_data)
                     else:
                         # Legacy fallback
                         with open("book_output/outline.txt", "w", encoding="utf-8") as f:
@@ -232,8 +275,7 @@ async def generate_sse_stream(
                     # For now, assuming it's defined later in this file as per the provided context.
                     chapters = parse_outline_to_chapters(outline_content, num_chapters_from_request)
                     request.session["chapters"] = chapters
-                    with open("book_output/chapters.json", "w", encoding="utf-8") as f:
-                        json.dump(chapters, f, indent=2)
+                    serialization.write_file("book_output/chapters.json", chapters)
                     print(f"Chapters ({len(chapters)}) parsed and saved from streamed outline.")
                 except Exception as parse_error:
                     print(f"Error parsing/saving chapters after streaming outline: {parse_error}")
@@ -243,6 +285,82 @@ async def generate_sse_stream(
         yield f"data: {json.dumps({'content': '[DONE]'})}\n\n"
 
 
+# Structured finalization: document kind -> session key
+STRUCTURED_SESSION_KEYS = {
+    "world": "world_theme",
+    "characters": "characters",
+    "outline": "outline",
+}
+
+
+async def generate_structured_sse_stream(
+    stream_iterator: Iterable, request: Request, kind: str, request_data: Optional[Dict] = None
+) -> AsyncGenerator[str, None]:
+    """
+    Generates SSE from a structured (JSON) finalize stream.
+    Raw JSON text is sent as {"content": ...} like generate_sse_stream; each
+    completed character or chapter is also sent as {"item": ...} and the project's
+    JSON file is rewritten with the items so far, so nothing finished is lost if
+    the stream breaks. The validated document is saved when the stream ends.
+    """
+    from core.structured_output import StructuredDocument, outline_chapters
+
+    yield 'data: {"content": ""}\n\n'
+
+    session_key = STRUCTURED_SESSION_KEYS[kind]
+    document = StructuredDocument(kind, "Current Project")
+    pm = project_dir = None
+    current_project_id = request.session.get("current_project_id")
+    if current_project_id:
+        from core.project_manager import ProjectManager
+        pm = ProjectManager()
+        project_dir = pm.get_project_path(current_project_id)
+
+    try:
+        for chunk in stream_iterator:
+            content = chunk.text if hasattr(chunk, "text") else ""
+            if not content:
+                continue
+            items = document.feed(content)
+            yield f"data: {json.dumps({'content': content})}\n\n"
+            for item in items:
+                yield f"data: {serialization.dumps({'item': item, 'kind': kind}).decode('utf-8')}\n\n"
+            if items and project_dir:
+                pm.write_document(project_dir, kind, document.partial())
+    except Exception as e:
+        print(f"Error during structured streaming generation: {e}")
+        yield f"data: {json.dumps({'content': f'[STREAMING ERROR: {e}]'})}\n\n"
+    finally:
+        try:
+            result = document.finish()
+        except ValueError as e:
+            print(f"Structured {kind} output incomplete, saving what arrived: {e}")
+            result = document.partial()
+
+        request.session[session_key] = document.text.strip()
+        try:
+            if project_dir:
+                pm.write_document(project_dir, kind, result)
+            else:
+                # Legacy fallback
+                serialization.write_file(f"book_output/{kind}.json", result)
+
+            if kind == "outline":
+                num_chapters = int((request_data or {}).get("num_chapters") or 10)
+                chapters = outline_chapters(result) or parse_outline_to_chapters(document.text, num_chapters)
+                request.session["chapters"] = chapters
+                if project_dir:
+                    pm.write_json(project_dir / "chapters.json", chapters)
+                else:
+                    serialization.write_file("book_output/chapters.json", chapters)
+            print(f"Structured {kind} saved from stream.")
+        except Exception as write_error:
+            print(f"Error saving structured {kind}: {write_error}")
+
+        yield f"data: {serialization.dumps({'document': result, 'kind': kind}).decode('utf-8')}\n\n"
+        yield f"data: {json.dumps({'content': '[DONE]'})}\n\n"
+
+
 # --- Helper to Load Session/File Data ---
 def load_context(request: Request) -> Dict[str, Any]:
     """Loads world, characters, outline, chapters from session or JSON files."""
@@ -264,12 +382,12 @@ def load_context(request: Request) -> Dict[str, Any]:
         project_dir = pm.get_project_path(current_project_id)
         
         # Load world from world.json
-        if not context["world_theme"] and (project_dir / "world.json").exists():
+        if not context["world_theme"]:
             try:
-                with open(project_dir / "world.json", "r", encoding="utf-8") as f:
-                    world_data = json.load(f)
+                world_data = pm.read_json(project_dir / "world.json")
+                if world_data is not None:
                     # Convert JSON back to text format for compatibility
-                    world_theme = world_data.get("raw_content", "")
+                    world_theme = pm.read_document_text(project_dir, "world")
                     if not world_theme:
                         # Generate text from structured data as fallback
                         world_theme = f"Genre: {world_data.get('genre', 'Unknown')}\n"
@@ -284,12 +402,12 @@ def load_context(request: Request) -> Dict[str, Any]:
                 print(f"Error reading world.json: {e}")
 
         # Load characters from characters.json
-        if not context["characters"] and (project_dir / "characters.json").exists():
+        if not context["characters"]:
             try:
-                with open(project_dir / "characters.json", "r", encoding="utf-8") as f:
-                    characters_data = json.load(f)
+                characters_data = pm.read_json(project_dir / "characters.json")
+                if characters_data is not None:
                     # Convert JSON back to text format for compatibility
-                    characters_text = characters_data.get("raw_content", "")
+                    characters_text = pm.read_document_text(project_dir, "characters")
                     if not characters_text:
                         # Generate text from structured data as fallback
                         characters = characters_data.get("characters", [])
@@ -307,12 +425,12 @@ def load_context(request: Request) -> Dict[str, Any]:
                 print(f"Error reading characters.json: {e}")
 
         # Load outline from outline.json
-        if not context["outline"] and (project_dir / "outline.json").exists():
+        if not context["outline"]:
             try:
-                with open(project_dir / "outline.json", "r", encoding="utf-8") as f:
-                    outline_data = json.load(f)
+                outline_data = pm.read_json(project_dir / "outline.json")
+                if outline_data is not None:
                     # Convert JSON back to text format for compatibility
-                    outline_text = outline_data.get("raw_content", "")
+                    outline_text = pm.read_document_text(project_dir, "outline")
                     if not outline_text:
                         # Generate text from structured data as fallback
                         story_structure = outline_data.get("story_structure", {})
@@ -333,17 +451,31 @@ def load_context(request: Request) -> Dict[str, Any]:
                 print(f"Error reading outline.json: {e}")
 
         # Load chapters from chapters.json (already JSON, no conversion needed)
-        if not context["chapters"] and (project_dir / "chapters.json").exists():
+        if not context["chapters"]:
             try:
-                with open(project_dir / "chapters.json", "r", encoding="utf-8") as f:
-                    context["chapters"] = json.load(f)
-                request.session["chapters"] = context["chapters"]
+                chapters_data = pm.read_json(project_dir / "chapters.json")
+                if chapters_data is not None:
+                    context["chapters"] = chapters_data
+                    request.session["chapters"] = context["chapters"]
             except Exception as e:
                 print(f"Error reading chapters.json: {e}")
 
     return context
 
 
+def get_chapter_store(request: Request):
+    """Get the ChapterStore for the current project (or the legacy output folder)"""
+    from core.chapter_store import ChapterStore
+
+    current_project_id = request.session.get("current_project_id")
+    if current_project_id:
+        from core.project_manager import ProjectManager
+        pm = ProjectManager()
+        return ChapterStore(pm.get_project_path(current_project_id) / "chapters")
+    # Legacy fallback
+    return ChapterStore("book_output/chapters")
+
+
 # --- FastAPI Routes ---
 
 @app.get("/", response_class=HTMLResponse)
@@ -431,8 +563,7 @@ async def finalize_world(request: Request, data: FinalizeRequestData):
             pm = ProjectManager()
             project_dir = pm.get_project_path(current_project_id)
             world_data = parse_world_text_to_json("Current Project", world_theme)
-            with open(project_dir / "world.json", "w", encoding="utf-8") as f:
-                json.dump(world_data.model_dump(), f, indent=2, ensure_ascii=False)
+            pm.write_document(project_dir, "world", world_data)
         else:
             # Legacy fallback
             with open("book_output/world.txt", "w", encoding="utf-8") as f:
@@ -454,8 +585,14 @@ async def finalize_world_stream(request: Request, data: FinalizeRequestData):
     try:
         book_agents = BookAgents(agent_config)
         _ = book_agents.create_agents(topic, 0)
-        stream = book_agents.generate_final_world_stream(data.chat_history, topic)
-
+        stream = book_agents.generate_final_world_stream(data.chat_history, topic, structured=data.structured)
+
+        if data.structured:
+            return StreamingResponse(
+                generate_structured_sse_stream(stream, request, "world", data.dict()),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
         return StreamingResponse(
             generate_sse_stream(stream, request, data.dict()),
             media_type="text/event-stream",
@@ -483,8 +620,7 @@ async def save_world(request: Request, data: SaveWorldRequest):
             pm = ProjectManager()
             project_dir = pm.get_project_path(current_project_id)
             world_data = parse_world_text_to_json("Current Project", world_theme_cleaned)
-            with open(project_dir / "world.json", "w", encoding="utf-8") as f:
-                json.dump(world_data.model_dump(), f, indent=2, ensure_ascii=False)
+            pm.write_document(project_dir, "world", world_data)
         else:
             # Legacy fallback
             with open("book_output/world.txt", "w", encoding="utf-8") as f:
@@ -540,8 +676,14 @@ async def finalize_characters_stream(request: Request, data: FinalizeRequestData
         book_agents = BookAgents(agent_config)
         _ = book_agents.create_agents(world_theme, 0)
         stream = book_agents.generate_final_characters_stream(
-            data.chat_history, world_theme, num_characters
+            data.chat_history, world_theme, num_characters, structured=data.structured
         )
+        if data.structured:
+            return StreamingResponse(
+                generate_structured_sse_stream(stream, request, "characters", data.dict()),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
         return StreamingResponse(
             generate_sse_stream(stream, request, data.dict()),
             media_type="text/event-stream",
@@ -569,8 +711,7 @@ async def save_characters(request: Request, data: SaveCharactersRequest):
             pm = ProjectManager()
             project_dir = pm.get_project_path(current_project_id)
             characters_data = parse_characters_text_to_json(characters_cleaned)
-            with open(project_dir / "characters.json", "w", encoding="utf-8") as f:
-                json.dump(characters_data.model_dump(), f, indent=2, ensure_ascii=False)
+            pm.write_document(project_dir, "characters", characters_data)
         else:
             # Legacy fallback
             with open("book_output/characters.txt", "w", encoding="utf-8") as f:
@@ -626,8 +767,15 @@ async def finalize_outline_stream(request: Request, data: FinalizeRequestData):
         book_agents = BookAgents(agent_config)
         _ = book_agents.create_agents(context["world_theme"], num_chapters)
         stream = book_agents.generate_final_outline_stream(
-            data.chat_history, context["world_theme"], context["characters"], num_chapters
+            data.chat_history, context["world_theme"], context["characters"], num_chapters,
+            structured=data.structured
         )
+        if data.structured:
+            return StreamingResponse(
+                generate_structured_sse_stream(stream, request, "outline", data.dict()),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
         # Pass request data (as dict) so the generator can access num_chapters for parsing
         return StreamingResponse(
             generate_sse_stream(stream, request, data.dict()),
@@ -659,8 +807,7 @@ async def save_outline(request: Request, data: SaveOutlineRequest):
             pm = ProjectManager()
             project_dir = pm.get_project_path(current_project_id)
             outline_data = parse_outline_text_to_json("Current Project", outline_cleaned)
-            with open(project_dir / "outline.json", "w", encoding="utf-8") as f:
-                json.dump(outline_data.model_dump(), f, indent=2, ensure_ascii=False)
+            pm.write_document(project_dir, "outline", outline_data)
         else:
             # Legacy fallback
             with open("book_output/outline.txt", "w", encoding="utf-8") as f:
@@ -671,7 +818,11 @@ async def save_outline(request: Request, data: SaveOutlineRequest):
         raise HTTPException(status_code=500, detail=f"Failed to save outline file: {e}")
 
     try:
-        chapters = parse_outline_to_chapters(outline_cleaned, num_chapters=data.num_chapters)
+        from core.structured_output import outline_chapters
+        from core.text_to_json import parse_outline_text_to_json
+        # A structured (JSON) outline carries its chapters; text outlines are parsed
+        chapters = outline_chapters(parse_outline_text_to_json("Current Project", outline_cleaned)) \
+            or parse_outline_to_chapters(outline_cleaned, data.num_chapters)
         request.session["chapters"] = chapters
         # Save to current project if available
         current_project_id = request.session.get("current_project_id")
@@ -679,12 +830,10 @@ async def save_outline(request: Request, data: SaveOutlineRequest):
             from core.project_manager import ProjectManager
             pm = ProjectManager()
             project_dir = pm.get_project_path(current_project_id)
-            with open(project_dir / "chapters.json", "w", encoding="utf-8") as f:
-                json.dump(chapters, f, indent=2, ensure_ascii=False)
+            pm.write_json(project_dir / "chapters.json", chapters)
         else:
             # Legacy fallback
-            with open("book_output/chapters.json", "w", encoding="utf-8") as f:
-                json.dump(chapters, f, indent=2)
+            serialization.write_file("book_output/chapters.json", chapters)
         num_parsed = len(chapters)
     except Exception as e:
         print(f"Error parsing/saving chapters after manual outline save: {e}")
@@ -729,12 +878,10 @@ async def generate_chapters(request: Request, data: GenerateChaptersRequest):
             from core.project_manager import ProjectManager
             pm = ProjectManager()
             project_dir = pm.get_project_path(current_project_id)
-            with open(project_dir / "chapters.json", "w", encoding="utf-8") as f:
-                json.dump(chapters, f, indent=2, ensure_ascii=False)
+            pm.write_json(project_dir / "chapters.json", chapters)
         else:
             # Legacy fallback
-            with open("book_output/chapters.json", "w", encoding="utf-8") as f:
-                json.dump(chapters, f, indent=2)
+            serialization.write_file("book_output/chapters.json", chapters)
         return {"success": True, "num_chapters": len(chapters)}
     except Exception as e:
         print(f"Error parsing chapters in /generate_chapters: {e}")
@@ -760,18 +907,15 @@ async def generate_chapter_content(request: Request, chapter_number: int, data:
         raise HTTPException(status_code=400, detail="World theme or characters missing. Cannot generate chapter.")
 
     # Get previous chapter context
+    chapter_store = get_chapter_store(request)
     previous_context_text = ""
-    if chapter_number > 1:
-        prev_chapter_path = f"book_output/chapters/chapter_{chapter_number-1}.txt"
-        if os.path.exists(prev_chapter_path):
-            try:
-                with open(prev_chapter_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    summary_len = 1500
-                    previous_context_text = content[-summary_len:] if len(content) > summary_len else content
-                    previous_context_text = f"Summary of previous chapter:\n{previous_context_text}\n---\n"
-            except Exception as e:
-                print(f"Error reading previous chapter {chapter_number-1}: {e}")
+    if chapter_number > 1 and chapter_store.exists(chapter_number - 1):
+        try:
+            summary_len = 1500
+            previous_context_text = chapter_store.tail(chapter_number - 1, summary_len)
+            previous_context_text = f"Summary of previous chapter:\n{previous_context_text}\n---\n"
+        except Exception as e:
+            print(f"Error reading previous chapter {chapter_number-1}: {e}")
 
     chapter_outline_detail = chapter_data.get("prompt", f"Write Chapter {chapter_number}")
     # Access additional_context from the Pydantic model
@@ -798,10 +942,9 @@ async def generate_chapter_content(request: Request, chapter_number: int, data:
         print(f"Chapter {chapter_number} generated (length: {len(chapter_content)}).")
 
         chapter_content_cleaned = chapter_content.strip()
-        chapter_path = f"book_output/chapters/chapter_{chapter_number}.txt"
-        with open(chapter_path, "w", encoding="utf-8") as f:
-            f.write(chapter_content_cleaned)
-        print(f"Chapter {chapter_number} saved to {chapter_path}.")
+        chapter_store.write(chapter_number, chapter_content_cleaned)
+        get_search_index().mark_changed(chapter_store.chapter_path(chapter_number))
+        print(f"Chapter {chapter_number} saved to {chapter_store.chapter_path(chapter_number)}.")
 
         return JSONResponse({"chapter_content": chapter_content_cleaned})
 
@@ -816,10 +959,10 @@ async def save_chapter(request: Request, chapter_number: int, data: SaveChapterR
     """Save manually edited chapter content"""
     # Access chapter_content from the Pydantic model
     chapter_content_cleaned = data.chapter_content.replace("\r\n", "\n").strip()
-    chapter_path = f"book_output/chapters/chapter_{chapter_number}.txt"
     try:
-        with open(chapter_path, "w", encoding="utf-8") as f:
-            f.write(chapter_content_cleaned)
+        chapter_store = get_chapter_store(request)
+        chapter_store.write(chapter_number, chapter_content_cleaned)
+        get_search_index().mark_changed(chapter_store.chapter_path(chapter_number))
         return JSONResponse({"success": True})
     except Exception as e:
         print(f"Error saving chapter {chapter_number} manually: {e}")
@@ -866,12 +1009,13 @@ async def generate_scene(request: Request, chapter_number: int, data: GenerateSc
         scene_content_cleaned = scene_content.strip()
 
         # Save scene to file
-        scene_dir = f"book_output/chapters/chapter_{chapter_number}_scenes"
+        scene_dir = get_chapter_store(request).chapters_dir / f"chapter_{chapter_number}_scenes"
         os.makedirs(scene_dir, exist_ok=True)
         scene_count = len([f for f in os.listdir(scene_dir) if f.endswith(".txt")])
-        scene_path = f"{scene_dir}/scene_{scene_count + 1}.txt"
+        scene_path = scene_dir / f"scene_{scene_count + 1}.txt"
         with open(scene_path, "w", encoding="utf-8") as f:
             f.write(scene_content_cleaned)
+        get_search_index().mark_changed(scene_path)
         print(f"Scene saved to {scene_path}")
 
         return JSONResponse({"scene_content": scene_content_cleaned, "scene_number": scene_count + 1})
@@ -897,7 +1041,7 @@ async def get_project_status(request: Request):
 async def get_world(request: Request):
     """Get world theme data"""
     context = load_context(request)
-    return JSONResponse({
+    return FastJSONResponse({
         "world_theme": context.get("world_theme", ""),
         "topic": context.get("topic", "") # Include topic here
     })
@@ -907,7 +1051,7 @@ async def get_characters(request: Request):
     """Get characters data"""
     context = load_context(request)
     # Assuming context["characters"] is already the string content
-    return JSONResponse({
+    return FastJSONResponse({
         "characters": context.get("characters", "")
     })
 
@@ -915,7 +1059,7 @@ async def get_characters(request: Request):
 async def get_outline(request: Request):
     """Get outline data"""
     context = load_context(request)
-    return JSONResponse({
+    return FastJSONResponse({
         "outline": context.get("outline", "")
     })
 
@@ -924,7 +1068,7 @@ async def get_chapters(request: Request):
     """Get chapters data"""
     context = load_context(request)
     # Assuming context["chapters"] is already the list of chapter objects
-    return JSONResponse({
+    return FastJSONResponse({
         "chapters": context.get("chapters", [])
     })
 
@@ -936,8 +1080,7 @@ async def get_library():
     try:
         from core.project_manager import ProjectManager
         project_manager = ProjectManager()
-        projects = project_manager.list_projects()
-        return [project.dict() for project in projects]
+        return FastJSONResponse(project_manager.list_project_dicts())
     except Exception as e:
         print(f"Error fetching library: {e}")
         return []
@@ -971,6 +1114,11 @@ async def switch_project(request: Request, project_id: str):
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
+        if project.archived:
+            from fastapi.concurrency import run_in_threadpool
+            await run_in_threadpool(project_manager.rehydrate_project, project_id)
+            project = project_manager.get_project(project_id)
+        
         # Clear existing session data
         for key in ["world_theme", "characters", "outline", "chapters", "topic"]:
             request.session.pop(key, None)
@@ -990,152 +1138,305 @@ async def switch_project(request: Request, project_id: str):
 async def cleanup_library():
     """Clean up orphaned entries in projects.json that don't have corresponding directories"""
     try:
+        from fastapi.concurrency import run_in_threadpool
         from core.project_manager import ProjectManager
-        import os
+        from core.library_fsck import reconcile_library
         project_manager = ProjectManager()
-        
-        # Load current projects index
-        projects_data = project_manager._load_projects_index()
-        library_path = project_manager.base_path
-        
-        # Get list of actual project directories
-        existing_dirs = set()
-        for item in os.listdir(library_path):
-            item_path = library_path / item
-            if item_path.is_dir() and not item.startswith('.') and item not in ['chapters', 'imports']:
-                # Extract project ID from directory name (last part after last dash)
-                if '-' in item:
-                    project_id_part = item.split('-')[-1]
-                    # Find matching project ID in projects.json
-                    for full_id in projects_data.keys():
-                        if full_id.startswith(project_id_part):
-                            existing_dirs.add(full_id)
-                            break
-        
-        # Remove orphaned entries
-        cleaned_projects = {}
-        removed_count = 0
-        for project_id, project_data in projects_data.items():
-            if project_id in existing_dirs:
-                cleaned_projects[project_id] = project_data
-            else:
-                removed_count += 1
-                print(f"Removing orphaned project: {project_data.get('title', project_id)}")
-        
-        # Save cleaned projects index
-        project_manager._save_projects_index(cleaned_projects)
-        
+        report = await run_in_threadpool(reconcile_library, project_manager, True)
         return {
             "success": True, 
-            "removed_count": removed_count,
-            "remaining_count": len(cleaned_projects)
+            "removed_count": report["removed_count"],
+            "remaining_count": report["remaining_count"]
         }
     except Exception as e:
         print(f"Error cleaning up library: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to cleanup library: {e}")
 
 
+@app.post("/api/library/archive")
+async def archive_inactive_projects(request: Request, days: int = 90):
+    """Move projects untouched for `days` days into library/archive"""
+    try:
+        from fastapi.concurrency import run_in_threadpool
+        from core.project_manager import ProjectManager
+        project_manager = ProjectManager()
+        current_project_id = request.session.get("current_project_id")
+        exclude = [current_project_id] if current_project_id else []
+        archived = await run_in_threadpool(project_manager.archive_inactive_projects, days, exclude)
+        return {"success": True, "archived": archived, "archived_count": len(archived)}
+    except Exception as e:
+        print(f"Error archiving projects: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to archive projects: {e}")
+
+
+@app.post("/api/projects/{project_id}/archive")
+async def archive_project(project_id: str, request: Request):
+    """Move a single project into library/archive (not the one open in this session)"""
+    try:
+        from fastapi.concurrency import run_in_threadpool
+        from core.project_manager import ProjectManager
+        project_manager = ProjectManager()
+        if project_id == request.session.get("current_project_id"):
+            raise HTTPException(status_code=409, detail="Cannot archive the project that is currently open")
+        if not await run_in_threadpool(project_manager.archive_project, project_id):
+            raise HTTPException(status_code=404, detail="Project not found")
+        return {"success": True, "project_id": project_id}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error archiving project: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to archive project: {e}")
+
+
+@app.post("/api/library/fsck")
+async def reconcile_library_route(repair: bool = False):
+    """Report drift between projects.json and the library folders; repair=true applies fixes"""
+    try:
+        from fastapi.concurrency import run_in_threadpool
+        from core.project_manager import ProjectManager
+        from core.library_fsck import reconcile_library
+        project_manager = ProjectManager()
+        return await run_in_threadpool(reconcile_library, project_manager, repair)
+    except Exception as e:
+        print(f"Error reconciling library: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to reconcile library: {e}")
+
+
+@app.get("/api/library/events")
+async def library_events(request: Request):
+    """Stream library file changes (including edits made outside the app) as SSE"""
+    import asyncio
+    from core.watcher import get_library_watcher, is_notifiable
+
+    watcher = get_library_watcher()
+    if watcher is None or not watcher.is_active:
+        raise HTTPException(status_code=503, detail="Library watcher is not running")
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+
+    def on_events(events):
+        payload = [
+            {
+                "type": event.kind,
+                "path": event.path.relative_to(watcher.base_path).as_posix(),
+                "is_dir": event.is_dir,
+            }
+            for event in events
+            if event.kind == "rescan" or is_notifiable(event, watcher.base_path)
+        ]
+        if payload:
+            loop.call_soon_threadsafe(_put_nowait_dropping, queue, payload)
+
+    async def event_stream():
+        unsubscribe = watcher.subscribe(on_events)
+        try:
+            yield f"data: {json.dumps({'type': 'ready', 'backend': watcher.backend_name})}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {json.dumps({'type': 'changes', 'changes': payload})}\n\n"
+        finally:
+            unsubscribe()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _put_nowait_dropping(queue, item):
+    """Drop notifications for clients that stopped reading"""
+    try:
+        queue.put_nowait(item)
+    except Exception:
+        pass
+
+
+# Search API Endpoints
+@app.get("/api/search")
+async def search_library(q: str, project_id: Optional[str] = None, limit: int = 20):
+    """Full-text search over chapters and scenes across the library.
+
+    Words must all match; use "quotes" for phrases and a trailing * for prefixes.
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Empty search query")
+
+    try:
+        from fastapi.concurrency import run_in_threadpool
+        from core.project_manager import ProjectManager
+        pm = ProjectManager()
+
+        folders = None
+        if project_id:
+            if not pm.get_project(project_id):
+                raise HTTPException(status_code=404, detail="Project not found")
+            folders = [pm.get_project_path(project_id).name]
+
+        index = get_search_index()
+        # Indexing new or edited chapters can take a moment; keep the event loop free
+        found = await run_in_threadpool(index.search, q, folders, max(1, min(limit, 100)))
+
+        projects_by_short_id = {pid[:8]: data for pid, data in pm.load_projects_index().items()}
+        for result in found["results"]:
+            project = projects_by_short_id.get(result.pop("folder").rsplit("-", 1)[-1], {})
+            result["project_id"] = project.get("id")
+            result["project_title"] = project.get("title", "")
+        return found
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error searching library: {e}")
+        raise HTTPException(status_code=500, detail=f"Search failed: {e}")
+
+
 # TTS API Endpoints
 @app.get("/api/tts/voices")
 async def get_tts_voices():
     """Get available TTS voices from Kokoro-FastAPI"""
     try:
-        response = requests.get(f"{KOKORO_API_BASE_URL}/voices")
+        response = await get_tts_client(KOKORO_API_BASE_URL).voices()
         if response.status_code == 200:
             return response.json()
         else:
             return {"error": "Failed to fetch voices", "status_code": response.status_code}
-    except requests.exceptions.RequestException as e:
+    except TTSUnavailable as e:
         return {"error": f"Kokoro-FastAPI server not available: {str(e)}"}
 
 @app.post("/api/tts/generate")
 async def generate_tts(data: TTSRequest):
-    """Generate TTS audio from text"""
+    """Generate TTS audio from text
+    The file is named after the text, voice and format, so repeated requests reuse it."""
+    from core.tts_cache import AudioCache, cache_key
+    from core.tts_pipeline import TTS_WORKERS, TTSSegmentError, synthesize_to_file
+    if not data.text.strip():
+        raise HTTPException(status_code=400, detail="No text to synthesize")
+    filename = f"book_output/tts/tts_{cache_key(data.text, data.voice, data.response_format)[:16]}.{data.response_format}"
+    if os.path.exists(filename):
+        return {"success": True, "filename": filename, "size": os.path.getsize(filename), "cached": True}
     try:
-        tts_data = {
-            "model": "kokoro",
-            "voice": data.voice,
-            "input": data.text,
-            "response_format": data.response_format
-        }
-        
-        response = requests.post(
-            f"{KOKORO_API_BASE_URL}/audio/speech",
-            json=tts_data,
-            headers={"Content-Type": "application/json"}
+        os.makedirs("book_output/tts", exist_ok=True)
+        result = await synthesize_to_file(
+            get_tts_client(KOKORO_API_BASE_URL), data.text, data.voice, data.response_format,
+            filename, workers=TTS_WORKERS, cache=AudioCache()
         )
-        
-        if response.status_code == 200:
-            # Save the audio file
-            filename = f"book_output/tts_output.{data.response_format}"
-            with open(filename, "wb") as f:
-                f.write(response.content)
-            
-            return {"success": True, "filename": filename, "size": len(response.content)}
-        else:
-            return {"error": "Failed to generate TTS", "status_code": response.status_code}
-            
-    except requests.exceptions.RequestException as e:
-        return {"error": f"Kokoro-FastAPI server not available: {str(e)}"}
+        return {"success": True, "filename": filename, "size": result["size"], "cached": False}
+    except TTSSegmentError as e:
+        if e.status_code is None:
+            return {"error": f"Kokoro-FastAPI server not available: {str(e)}"}
+        return {"error": "Failed to generate TTS", "status_code": e.status_code}
 
 @app.post("/api/tts/chapter/{chapter_number}")
-async def generate_chapter_tts(chapter_number: int, data: ChapterTTSRequest):
+async def generate_chapter_tts(chapter_number: int, data: ChapterTTSRequest, request: Request):
     """Generate TTS audio for a specific chapter"""
-    chapter_path = f"book_output/chapters/chapter_{chapter_number}.txt"
+    from fastapi.concurrency import run_in_threadpool
+    from core.tts_cache import AudioCache
+    from core.tts_pipeline import TTS_WORKERS, TTSSegmentError, synthesize_to_file
+    chapter_store = get_chapter_store(request)
     
-    if not os.path.exists(chapter_path):
+    if not chapter_store.exists(chapter_number):
         raise HTTPException(status_code=404, detail=f"Chapter {chapter_number} not found")
     
     try:
         # Read chapter content
-        with open(chapter_path, "r", encoding="utf-8") as f:
-            chapter_content = f.read()
+        chapter_content = await run_in_threadpool(chapter_store.read, chapter_number)
         
         if not chapter_content.strip():
             raise HTTPException(status_code=400, detail=f"Chapter {chapter_number} is empty")
         
-        # Generate TTS
-        tts_data = {
-            "model": "kokoro",
-            "voice": data.voice,
-            "input": chapter_content,
-            "response_format": data.response_format
-        }
-        
-        response = requests.post(
-            f"{KOKORO_API_BASE_URL}/audio/speech",
-            json=tts_data,
-            headers={"Content-Type": "application/json"}
+        # Generate TTS segment by segment, appending to the audio file in order;
+        # paragraphs unchanged since the last run come from the audio cache
+        audio_filename = str(chapter_store.chapters_dir / f"chapter_{chapter_number}.{data.response_format}")
+        result = await synthesize_to_file(
+            get_tts_client(KOKORO_API_BASE_URL), chapter_content, data.voice, data.response_format,
+            audio_filename, workers=data.workers or TTS_WORKERS, cache=AudioCache()
         )
         
-        if response.status_code == 200:
-            # Save the audio file
-            audio_filename = f"book_output/chapters/chapter_{chapter_number}.{data.response_format}"
-            with open(audio_filename, "wb") as f:
-                f.write(response.content)
-            
-            return {
-                "success": True, 
-                "filename": audio_filename, 
-                "size": len(response.content),
-                "chapter_number": chapter_number,
-                "voice": data.voice
-            }
-        else:
-            return {"error": "Failed to generate chapter TTS", "status_code": response.status_code}
+        return {
+            "success": True, 
+            "filename": audio_filename, 
+            "size": result["size"],
+            "segments": result["segments"],
+            "cached_segments": result["cached_segments"],
+            "chapter_number": chapter_number,
+            "voice": data.voice
+        }
             
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Chapter {chapter_number} file not found")
-    except requests.exceptions.RequestException as e:
-        return {"error": f"Kokoro-FastAPI server not available: {str(e)}"}
+    except TTSSegmentError as e:
+        if e.status_code is None:
+            return {"error": f"Kokoro-FastAPI server not available: {str(e)}"}
+        return {"error": "Failed to generate chapter TTS", "status_code": e.status_code, "segment": e.index + 1}
+
+@app.get("/api/tts/chapter/{chapter_number}/stream")
+async def stream_chapter_tts(chapter_number: int, request: Request, voice: str = "bf_emma",
+                             response_format: str = "mp3",
+                             workers: Optional[int] = Query(None, ge=1, le=16)):
+    """Stream a chapter's audio to the player while it is synthesized
+    The same bytes are written to chapter_<n>.<format>, which appears once the stream completes."""
+    from fastapi.concurrency import run_in_threadpool
+    from core.tts_cache import AudioCache
+    from core.tts_pipeline import (
+        FIRST_SEGMENT_CHARS, MEDIA_TYPES, TTS_WORKERS, AudioFileWriter, TTSSegmentError,
+        plan_segments, synthesize_segments, wav_header,
+    )
+    if response_format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported audio format: {response_format}")
+    chapter_store = get_chapter_store(request)
+    try:
+        chapter_content = await run_in_threadpool(chapter_store.read, chapter_number)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Chapter {chapter_number} not found")
+    if not chapter_content.strip():
+        raise HTTPException(status_code=400, detail=f"Chapter {chapter_number} is empty")
+
+    segments, segment_format = plan_segments(chapter_content, response_format, first_chars=FIRST_SEGMENT_CHARS)
+    audio = synthesize_segments(get_tts_client(KOKORO_API_BASE_URL), segments, voice, segment_format,
+                                workers=workers or TTS_WORKERS, cache=AudioCache())
+    # Wait for the first segment here, so a Kokoro failure is still an HTTP error
+    try:
+        first = await audio.__anext__()
+    except TTSSegmentError as e:
+        await audio.aclose()
+        if e.status_code is None:
+            raise HTTPException(status_code=503, detail=f"Kokoro-FastAPI server not available: {str(e)}")
+        raise HTTPException(status_code=502, detail=f"Failed to generate chapter TTS: {str(e)}")
+
+    audio_filename = str(chapter_store.chapters_dir / f"chapter_{chapter_number}.{response_format}")
+
+    async def tee() -> AsyncGenerator[bytes, None]:
+        writer = AudioFileWriter(audio_filename, response_format)
+        try:
+            if response_format == 'wav':
+                yield wav_header()
+            await run_in_threadpool(writer.write, first)
+            yield first
+            async for chunk in audio:
+                await run_in_threadpool(writer.write, chunk)
+                yield chunk
+            writer.commit()
+        except TTSSegmentError as e:
+            # Headers are already sent; the player sees the stream end early
+            print(f"Error streaming chapter {chapter_number} TTS: {e}")
+        finally:
+            await audio.aclose()
+            writer.close()
+
+    return StreamingResponse(tee(), media_type=MEDIA_TYPES[response_format])
 
 @app.get("/api/tts/status")
 async def get_tts_status():
     """Check Kokoro-FastAPI server status"""
     try:
-        response = requests.get(f"{KOKORO_API_BASE_URL}/health", timeout=5)
+        response = await get_tts_client(KOKORO_API_BASE_URL).health()
         return {"status": "available", "server_status": response.status_code}
-    except requests.exceptions.RequestException:
+    except TTSUnavailable:
         return {"status": "unavailable", "error": "Kokoro-FastAPI server not responding"}
 
 
@@ -1146,8 +1447,7 @@ async def list_projects():
     try:
         from core.project_manager import ProjectManager
         pm = ProjectManager()
-        projects = pm.list_projects()
-        return [project.dict() for project in projects]
+        return FastJSONResponse(pm.list_project_dicts())
     except Exception as e:
         print(f"Error listing projects: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to list projects: {e}")
@@ -1195,6 +1495,11 @@ async def activate_project(project_id: str, request: Request):
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
+        if project.archived:
+            from fastapi.concurrency import run_in_threadpool
+            await run_in_threadpool(pm.rehydrate_project, project_id)
+            project = pm.get_project(project_id)
+        
         # Set current project in session
         request.session["current_project_id"] = project_id
         
@@ -1209,6 +1514,22 @@ async def activate_project(project_id: str, request: Request):
         print(f"Error activating project: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to activate project: {e}")
 
+@app.get("/api/projects/{project_id}/export")
+async def export_project(project_id: str):
+    """Download a project's metadata, world, characters, outline and chapter list as readable JSON"""
+    from core.project_manager import ProjectManager
+    from fastapi.concurrency import run_in_threadpool
+    pm = ProjectManager()
+    export = await run_in_threadpool(pm.export_project, project_id)
+    if export is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    filename = re.sub(r'[^\w\-]+', '_', export["project"]["title"]).strip('_') or "project"
+    return Response(
+        serialization.dumps(export, pretty=True),
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.json"'},
+    )
+
 @app.get("/api/projects/current")
 async def get_current_project(request: Request):
     """Get the currently active project"""
@@ -1231,60 +1552,68 @@ async def get_current_project(request: Request):
         return {"current_project": None}
 
 # Import API Endpoints  
+def resolve_import_path(file_path: str, upload: str) -> str:
+    """Server-side path of the file to import: an upload handle, or a path on the server's disk"""
+    if upload:
+        from core.uploads import UploadStore
+        try:
+            return str(UploadStore().path_for(upload))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Upload not found")
+    if not file_path:
+        raise HTTPException(status_code=400, detail="Provide file_path or upload")
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="File not found")
+    return file_path
+
+def analyze_import(file_path: str) -> Dict:
+    """Parse a manuscript for the import preview; blocking, run it off the event loop"""
+    from core.import_utils import DocumentParser
+    from core.parse_cache import ParseCache
+    
+    # Parse the document (cached by content hash for the import that follows)
+    parser = DocumentParser()
+    try:
+        document = ParseCache().open(file_path)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Unsupported file format. Supported formats: .docx, .odt, .epub, .txt, .md")
+    
+    # Extract metadata (EPUB metadata first, then the opening text)
+    title, author = parser.document_title_and_author(document, file_path)
+    
+    # Basic analysis, streamed so only the previews are kept
+    chapter_count = 0
+    total_words = 0
+    chapters_preview = []
+    for ch in document.chapters:
+        word_count = len(ch["content"].split())
+        chapter_count += 1
+        total_words += word_count
+        if len(chapters_preview) < 3:  # Show first 3 chapters only
+            chapters_preview.append({
+                "chapter_number": ch["chapter_number"],
+                "title": ch["title"],
+                "word_count": word_count,
+                "preview": ch["content"][:200] + "..." if len(ch["content"]) > 200 else ch["content"]
+            })
+    
+    return {
+        "title": title,
+        "author": author,
+        "chapter_count": chapter_count,
+        "total_words": total_words,
+        "chapters_preview": chapters_preview
+    }
+
 @app.post("/api/import/analyze")
 async def analyze_import_file(data: ImportAnalysisRequest):
     """Analyze an uploaded file for import preview"""
     try:
-        from core.import_utils import DocumentParser
-        
-        file_path = data.file_path
-        if not os.path.exists(file_path):
-            raise HTTPException(status_code=404, detail="File not found")
-        
-        # Parse the document
-        parser = DocumentParser()
-        if file_path.endswith('.docx'):
-            text = parser.parse_docx(file_path)
-        elif file_path.endswith('.odt'):
-            text = parser.parse_odt(file_path)
-        elif file_path.endswith('.epub'):
-            text = parser.parse_epub(file_path)
-        elif file_path.endswith('.mobi'):
-            text = parser.parse_mobi(file_path)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format. Supported formats: .docx, .odt, .epub")
-        
-        # Extract metadata
-        # For EPUB files, try metadata extraction first
-        if file_path.endswith('.epub'):
-            title, author = parser.extract_epub_metadata(file_path)
-            # Fallback to content-based extraction if needed
-            if not title or not author:
-                content_title, content_author = parser.extract_title_and_author(text, file_path)
-                title = title or content_title
-                author = author or content_author
-        else:
-            title, author = parser.extract_title_and_author(text, file_path)
-        chapters = parser.detect_chapters(text)
-        
-        # Basic analysis
-        total_words = sum(len(ch['content'].split()) for ch in chapters)
-        
-        return {
-            "title": title,
-            "author": author,
-            "chapter_count": len(chapters),
-            "total_words": total_words,
-            "chapters_preview": [
-                {
-                    "chapter_number": ch["chapter_number"],
-                    "title": ch["title"],
-                    "word_count": len(ch["content"].split()),
-                    "preview": ch["content"][:200] + "..." if len(ch["content"]) > 200 else ch["content"]
-                }
-                for ch in chapters[:3]  # Show first 3 chapters only
-            ]
-        }
+        from fastapi.concurrency import run_in_threadpool
+        file_path = resolve_import_path(data.file_path, data.upload)
+        return await run_in_threadpool(analyze_import, file_path)
     except HTTPException:
         raise
     except Exception as e:
@@ -1293,21 +1622,28 @@ async def analyze_import_file(data: ImportAnalysisRequest):
 
 @app.post("/api/import/novel")
 async def import_novel(data: ImportNovelRequest, request: Request):
-    """Import a novel and create a new project"""
+    """Import a novel and create a new project
+    
+    The request lasts for the whole import; /api/import/jobs reports progress instead.
+    """
     try:
+        from fastapi.concurrency import run_in_threadpool
         from core.project_manager import ProjectManager
         
-        if not os.path.exists(data.file_path):
-            raise HTTPException(status_code=404, detail="File not found")
+        file_path = resolve_import_path(data.file_path, data.upload)
+        if data.analysis_mode not in ("sample", "full"):
+            raise HTTPException(status_code=400, detail="analysis_mode must be 'sample' or 'full'")
         
         pm = ProjectManager()
-        project = pm.import_novel(
-            file_path=data.file_path,
+        project = await run_in_threadpool(
+            pm.import_novel,
+            file_path=file_path,
             title=data.title,
             author=data.author,
             genre=data.genre,
             auto_generate_metadata=data.auto_generate_metadata,
-            agent_config=agent_config
+            agent_config=agent_config,
+            analysis_mode=data.analysis_mode
         )
         
         # Automatically activate the new project
@@ -1325,6 +1661,172 @@ async def import_novel(data: ImportNovelRequest, request: Request):
         raise HTTPException(status_code=500, detail=f"Failed to import novel: {e}")
 
 
+@app.post("/api/import/jobs")
+async def start_import_job(data: ImportNovelRequest):
+    """Start an import in the background; follow it at /api/import/jobs/{job_id}/events
+    
+    The 'done' event carries the new project. Unlike /api/import/novel the project is
+    not activated automatically; call /api/library/switch/{project_id} for that.
+    """
+    from core.import_jobs import start_novel_import
+    from core.project_manager import ProjectManager
+    
+    file_path = resolve_import_path(data.file_path, data.upload)
+    if data.analysis_mode not in ("sample", "full"):
+        raise HTTPException(status_code=400, detail="analysis_mode must be 'sample' or 'full'")
+    
+    job = start_novel_import(
+        ProjectManager(),
+        file_path,
+        title=data.title,
+        author=data.author,
+        genre=data.genre,
+        auto_generate_metadata=data.auto_generate_metadata,
+        agent_config=agent_config,
+        analysis_mode=data.analysis_mode
+    )
+    return {"job_id": job.id, "status": job.status}
+
+
+@app.get("/api/import/jobs/{job_id}")
+async def get_import_job(job_id: str):
+    """Current status of an import job"""
+    from core.import_jobs import get_job
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.snapshot()
+
+
+@app.get("/api/import/jobs/{job_id}/events")
+async def import_job_events(job_id: str, request: Request):
+    """Server-Sent Events for an import job, from the start or after Last-Event-ID"""
+    import asyncio
+    from core.import_jobs import TERMINAL_EVENTS, get_job
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    
+    try:
+        after = int(request.headers.get("last-event-id") or 0)
+    except ValueError:
+        after = 0
+    
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    def on_event(event):
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+    
+    async def event_stream():
+        unsubscribe = job.subscribe(on_event, after)
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {event['id']}\ndata: {json.dumps(event)}\n\n"
+                if event["type"] in TERMINAL_EVENTS:
+                    break
+        finally:
+            unsubscribe()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/uploads")
+async def start_upload(data: UploadStartRequest):
+    """Start a resumable manuscript upload"""
+    from core.uploads import UploadStore
+    store = UploadStore()
+    # Abandoned uploads are cleaned up whenever a new one starts
+    store.prune()
+    try:
+        return store.create(data.filename, data.size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/uploads/{upload_id}")
+async def get_upload(upload_id: str):
+    """Upload status; offset is where an interrupted upload resumes"""
+    from core.uploads import UploadStore
+    try:
+        return UploadStore().status(upload_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Upload not found")
+
+
+@app.put("/api/uploads/{upload_id}")
+async def append_upload(upload_id: str, request: Request, offset: int = 0):
+    """Append bytes at `offset`, from a raw body or the file part of a multipart/form-data body"""
+    from core.uploads import MultipartFileParser, UploadStore
+    store = UploadStore()
+    try:
+        writer = store.open_writer(upload_id, offset)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    content_type = request.headers.get("content-type", "")
+    try:
+        with writer:
+            if content_type.startswith("multipart/form-data"):
+                parser = MultipartFileParser(content_type, writer.write)
+                async for chunk in request.stream():
+                    parser.write(chunk)
+                parser.finalize()
+            else:
+                async for chunk in request.stream():
+                    writer.write(chunk)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return store.status(upload_id)
+
+
+@app.post("/api/uploads/{upload_id}/complete")
+async def complete_upload(upload_id: str):
+    """Finish an upload; the returned handle goes in the analyze and import requests"""
+    from fastapi.concurrency import run_in_threadpool
+    from core.uploads import UploadStore
+    try:
+        return await run_in_threadpool(UploadStore().complete, upload_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@app.post("/api/import/batch")
+async def import_batch(data: BatchImportRequest):
+    """Import many manuscripts at once; parsing runs in a process pool"""
+    try:
+        from fastapi.concurrency import run_in_threadpool
+        from core.batch_import import import_batch as run_batch_import
+        from core.project_manager import ProjectManager
+        
+        missing = [path for path in data.paths if not os.path.exists(path)]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Not found: {', '.join(missing)}")
+        
+        result = await run_in_threadpool(
+            run_batch_import, ProjectManager(), data.paths, data.workers, data.genre,
+            data.auto_generate_metadata, agent_config
+        )
+        return {"success": not result["failed"], **result}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error importing batch: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to import batch: {e}")
+
 # --- Outline Parsing Helper ---
 # (Remains the same)
 def parse_outline_to_chapters(outline_content, num_chapters_fallback):
@@ -0,0 +1,94 @@
+"""
+Stand-in Kokoro-FastAPI server for tests and benchmarks
+Serves /health, /voices and /audio/speech on a free localhost port from a
+background thread. Each speech call sleeps delay seconds (plus delay_per_kchar
+per 1000 characters of input) and answers about 1 KB of silence per 100
+characters; the first fail_first calls answer fail_status instead.
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandInKokoro(ThreadingHTTPServer):
+    """Answers /health, /voices and /audio/speech like Kokoro-FastAPI"""
+
+    daemon_threads = True
+
+    def __init__(self, delay: float, fail_first: int = 0, fail_status: int = 503, delay_per_kchar: float = 0.0):
+        self.delay = delay
+        self.delay_per_kchar = delay_per_kchar
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.connections = 0
+        self.speech_calls = 0
+        self.active_calls = 0
+        self.max_active_calls = 0
+        self.lock = threading.Lock()
+        super().__init__(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def handle_error(self, request, client_address):
+        # A client that timed out closes the connection before the answer is written
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this keep-alive calls wait on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/v1/health":
+            self._send(200, b'{"status":"healthy"}')
+        elif self.path == "/v1/voices":
+            self._send(200, json.dumps({"voices": ["bf_emma", "am_adam"]}).encode())
+        else:
+            self._send(404, b'{}')
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.speech_calls += 1
+            failing = server.fail_first > 0
+            server.fail_first -= 1
+            server.active_calls += 1
+            server.max_active_calls = max(server.max_active_calls, server.active_calls)
+        try:
+            if failing:
+                self._send(server.fail_status, b'{"detail":"busy"}')
+                return
+            time.sleep(server.delay + server.delay_per_kchar * len(payload["input"]) / 1000)
+            # About 1 KB of "audio" per 100 characters of text
+            self._send(200, b'\0' * (len(payload["input"]) * 10), "audio/mpeg")
+        finally:
+            with server.lock:
+                server.active_calls -= 1
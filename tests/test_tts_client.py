@@ -0,0 +1,128 @@
+"""KokoroClient against the stand-in Kokoro server: pooling, timeouts, retries and TTSUnavailable"""
+
+import asyncio
+import socket
+
+import pytest
+
+from core import tts_client
+from core.tts_client import KokoroClient, TTSUnavailable
+from tests.kokoro_stand_in import StandInKokoro
+
+
+@pytest.fixture
+def server():
+    server = StandInKokoro(delay=0)
+    yield server
+    server.stop()
+
+
+def run_with_client(base_url, calls, **client_options):
+    """Run calls(client) on a fresh client and close it afterwards"""
+    async def main():
+        client = KokoroClient(base_url, retry_backoff=0.01, **client_options)
+        try:
+            return await calls(client)
+        finally:
+            await client.aclose()
+    return asyncio.run(main())
+
+
+def unused_url():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/v1"
+
+
+def test_speech_returns_audio(server):
+    response = run_with_client(server.base_url, lambda client: client.speech("Hello there.", "bf_emma", "mp3"))
+    assert response.status_code == 200
+    assert len(response.content) == len("Hello there.") * 10
+
+
+def test_voices_and_health(server):
+    async def calls(client):
+        return await client.voices(), await client.health()
+
+    voices, health = run_with_client(server.base_url, calls)
+    assert voices.json()["voices"] == ["bf_emma", "am_adam"]
+    assert health.status_code == 200
+
+
+def test_sequential_calls_reuse_one_connection(server):
+    async def calls(client):
+        for _ in range(5):
+            assert (await client.speech("Hello.", "bf_emma", "mp3")).status_code == 200
+
+    run_with_client(server.base_url, calls)
+    assert server.speech_calls == 5
+    assert server.connections == 1
+
+
+def test_concurrent_calls_are_limited_by_the_pool(server):
+    server.delay = 0.05
+
+    async def calls(client):
+        return await asyncio.gather(*(client.speech("Hello.", "bf_emma", "mp3") for _ in range(8)))
+
+    responses = run_with_client(server.base_url, calls, max_connections=2, max_keepalive_connections=2)
+    assert all(response.status_code == 200 for response in responses)
+    assert server.max_active_calls <= 2
+    assert server.connections <= 2
+
+
+def test_retries_503_then_succeeds(server):
+    server.fail_first = 1
+    response = run_with_client(server.base_url, lambda client: client.speech("Hello.", "bf_emma", "mp3"))
+    assert response.status_code == 200
+    assert server.speech_calls == 2
+
+
+def test_returns_last_503_once_retries_are_used_up(server):
+    server.fail_first = 10
+    response = run_with_client(server.base_url, lambda client: client.speech("Hello.", "bf_emma", "mp3"),
+                               retries=2)
+    assert response.status_code == 503
+    assert server.speech_calls == 3
+
+
+def test_client_errors_are_not_retried(server):
+    server.fail_first, server.fail_status = 1, 400
+    response = run_with_client(server.base_url, lambda client: client.speech("Hello.", "bf_emma", "mp3"))
+    assert response.status_code == 400
+    assert server.speech_calls == 1
+
+
+def test_read_timeout_raises_without_retrying(server):
+    server.delay = 0.5
+    with pytest.raises(TTSUnavailable) as error:
+        run_with_client(server.base_url, lambda client: client.speech("Hello.", "bf_emma", "mp3", timeout=0.1))
+    assert not error.value.retried
+    assert server.speech_calls == 1
+
+
+def test_unreachable_server_raises_after_retrying():
+    with pytest.raises(TTSUnavailable) as error:
+        run_with_client(unused_url(), lambda client: client.speech("Hello.", "bf_emma", "mp3"))
+    assert error.value.retried
+
+
+def test_health_is_not_retried():
+    with pytest.raises(TTSUnavailable) as error:
+        run_with_client(unused_url(), lambda client: client.health())
+    assert not error.value.retried
+
+
+def test_process_client_is_reused_until_closed(server):
+    async def main():
+        first = tts_client.start_tts_client(server.base_url)
+        try:
+            assert tts_client.get_tts_client(server.base_url) is first
+            await tts_client.close_tts_client()
+            second = tts_client.get_tts_client(server.base_url)
+            assert second is not first and not second.is_closed
+        finally:
+            await tts_client.close_tts_client()
+
+    asyncio.run(main())